@@ -15,7 +15,40 @@ class Settings(BaseSettings):
     database_name: str = os.getenv("DATABASE_NAME", "contract_intelligence")
     upload_dir: str = os.getenv("UPLOAD_DIR", "uploads")
     max_file_size: int = int(os.getenv("MAX_FILE_SIZE", "52428800"))  # 50MB
+    dedup_enabled: bool = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+    upload_chunk_size: int = int(os.getenv("UPLOAD_CHUNK_SIZE", "1048576"))  # 1MB
+    max_page_offset: int = int(os.getenv("MAX_PAGE_OFFSET", "10000"))
+    batch_max_files: int = int(os.getenv("BATCH_MAX_FILES", "1000"))
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    extraction_workers: int = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 1)))
+    parallel_extraction: bool = os.getenv("PARALLEL_EXTRACTION", "true").lower() == "true"
+    extraction_pages_per_task: int = int(os.getenv("EXTRACTION_PAGES_PER_TASK", "16"))
+    embedded_worker: bool = os.getenv("EMBEDDED_WORKER", "true").lower() == "true"
+    worker_concurrency: int = int(os.getenv("WORKER_CONCURRENCY", "2"))
+    job_lease_seconds: int = int(os.getenv("JOB_LEASE_SECONDS", "60"))
+    job_heartbeat_seconds: int = int(os.getenv("JOB_HEARTBEAT_SECONDS", "15"))
+    job_max_attempts: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    job_retry_delay_seconds: int = int(os.getenv("JOB_RETRY_DELAY_SECONDS", "10"))
+    job_reclaim_interval: float = float(os.getenv("JOB_RECLAIM_INTERVAL", "30"))
+    worker_metrics_port: int = int(os.getenv("WORKER_METRICS_PORT", "0"))  # 0 disables
+    job_poll_interval: float = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+    events_keepalive_seconds: int = int(os.getenv("EVENTS_KEEPALIVE_SECONDS", "15"))
+    cache_backend: str = os.getenv("CACHE_BACKEND", "memory")
+    cache_max_entries: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    status_cache_ttl: float = float(os.getenv("STATUS_CACHE_TTL", "2.0"))
+    data_cache_max_age: int = int(os.getenv("DATA_CACHE_MAX_AGE", "300"))
+    events_poll_seconds: float = float(os.getenv("EVENTS_POLL_SECONDS", "2.0"))
+    storage_backend: str = os.getenv("STORAGE_BACKEND", "local")
+    storage_mmap_threshold: int = int(os.getenv("STORAGE_MMAP_THRESHOLD", "4194304"))  # 4MB
+    storage_s3_bucket: str = os.getenv("STORAGE_S3_BUCKET", "contracts")
+    storage_s3_endpoint_url: Optional[str] = os.getenv("STORAGE_S3_ENDPOINT_URL")
+    storage_reconcile_interval: float = float(os.getenv("STORAGE_RECONCILE_INTERVAL", "3600"))  # 0 disables
+    storage_reconcile_grace_seconds: int = int(os.getenv("STORAGE_RECONCILE_GRACE_SECONDS", "3600"))
+    profiling_allowlist: str = os.getenv("PROFILING_ALLOWLIST", "")  # comma-separated tokens
+    profiling_summary_lines: int = int(os.getenv("PROFILING_SUMMARY_LINES", "40"))
+    profile_retention_seconds: int = int(os.getenv("PROFILE_RETENTION_SECONDS", "604800"))  # 7 days
+    extractor_time_budget_seconds: float = float(os.getenv("EXTRACTOR_TIME_BUDGET_SECONDS", "2.0"))  # 0 disables
+    extractor_time_budget_per_mb: float = float(os.getenv("EXTRACTOR_TIME_BUDGET_PER_MB", "2.0"))  # per MB of text
     
     class Config:
         env_file = ".env"
@@ -4,6 +4,7 @@ import logging
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from pymongo.errors import ConnectionFailure
 from app.config import settings
+from app.indexes import reconcile_indexes
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +19,7 @@ class Database:
 db = Database()
 
 
-async def connect_to_mongo():
+async def connect_to_mongo(ensure_indexes: bool = True):
     """Create database connection."""
     try:
         db.client = AsyncIOMotorClient(settings.mongodb_url)
@@ -29,7 +30,8 @@ async def connect_to_mongo():
         logger.info("Successfully connected to MongoDB")
         
         # Create indexes for better performance
-        await create_indexes()
+        if ensure_indexes:
+            await create_indexes()
         
     except ConnectionFailure as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
@@ -44,21 +46,20 @@ async def close_mongo_connection():
 
 
 async def create_indexes():
-    """Create database indexes for optimal performance."""
+    """Reconcile database indexes with the manifest, creating missing ones."""
     try:
-        # Index for contracts collection
-        contracts_collection = db.database.contracts
-        await contracts_collection.create_index("upload_date")
-        await contracts_collection.create_index("status")
-        await contracts_collection.create_index("content_hash")
+        report = await reconcile_indexes(db.database, apply=True)
         
-        # Index for contract_data collection
-        contract_data_collection = db.database.contract_data
-        await contracts_collection.create_index("contract_id")
-        await contract_data_collection.create_index("processing_date")
-        await contract_data_collection.create_index("confidence_score")
+        if report["created"]:
+            logger.info(f"Created missing indexes: {', '.join(report['created'])}")
+        if report["failed"]:
+            logger.error(f"Indexes that could not be created: {', '.join(report['failed'])}")
+        if report["conflicting"]:
+            logger.warning(f"Indexes with unexpected options: {', '.join(report['conflicting'])}")
+        if report["extra"]:
+            logger.info(f"Indexes not in manifest: {', '.join(report['extra'])}")
         
-        logger.info("Database indexes created successfully")
+        logger.info("Database indexes reconciled successfully")
         
     except Exception as e:
         logger.error(f"Failed to create indexes: {e}")
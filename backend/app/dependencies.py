@@ -0,0 +1,55 @@
+"""Application-scoped services injected into endpoints with ``Depends``.
+
+Services are created once in the application lifespan and stored on
+``app.state``. They hold no per-request state: ``ContractService`` and
+``JobQueue`` only keep Motor collection handles, and the PDF parser runs in
+the extraction pool, where each worker process owns a single parser over the
+shared, import-time compiled pattern registry.
+"""
+
+from fastapi import HTTPException
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from starlette.requests import HTTPConnection
+from app.services.contract_service import ContractService
+from app.services.job_queue import JobQueue
+from app.services.profiles import ProfileStore
+from app.utils.profiling import profiling_requested
+
+
+class Services:
+    """Container for the services shared by all requests of the application."""
+
+    def __init__(self, database: AsyncIOMotorDatabase):
+        """Create the application services over a database connection."""
+        self.contract_service = ContractService(database)
+        self.job_queue = JobQueue(database)
+        self.profile_store = ProfileStore(database)
+
+
+def get_services(connection: HTTPConnection) -> Services:
+    """Services of the application handling this request or WebSocket."""
+    return connection.app.state.services
+
+
+def get_contract_service(connection: HTTPConnection) -> ContractService:
+    """Application-scoped contract service."""
+    return get_services(connection).contract_service
+
+
+def get_job_queue(connection: HTTPConnection) -> JobQueue:
+    """Application-scoped job queue."""
+    return get_services(connection).job_queue
+
+
+def get_profile_store(connection: HTTPConnection) -> ProfileStore:
+    """Application-scoped store of profiles."""
+    return get_services(connection).profile_store
+
+
+def require_profiling_token(connection: HTTPConnection):
+    """Reject requests without an allowlisted profiling token."""
+    if not profiling_requested(connection):
+        raise HTTPException(
+            status_code=403,
+            detail="A profiling token from the allowlist is required"
+        )
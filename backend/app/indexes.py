@@ -0,0 +1,242 @@
+"""Declarative MongoDB index manifest with reconciliation and query plan checks.
+
+Run ``python -m app.indexes`` to report missing indexes, ``--apply`` to create
+them, and ``--explain`` to verify that the hot queries in ``ContractService``
+and the job queue are served by an index.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """A single index the application relies on."""
+
+    collection: str
+    keys: Tuple[Tuple[str, int], ...]
+    unique: bool = False
+    sparse: bool = False
+    partial_filter: Optional[Dict[str, Any]] = None
+    expire_after_seconds: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        """Index name, following MongoDB's default naming."""
+        return "_".join(f"{field}_{direction}" for field, direction in self.keys)
+
+    def options(self) -> Dict[str, Any]:
+        """Keyword options for ``create_index``."""
+        options = {"name": self.name}
+        if self.unique:
+            options["unique"] = True
+        if self.sparse:
+            options["sparse"] = True
+        if self.partial_filter:
+            options["partialFilterExpression"] = self.partial_filter
+        if self.expire_after_seconds is not None:
+            options["expireAfterSeconds"] = self.expire_after_seconds
+        return options
+
+    def matches(self, index_info: Dict[str, Any]) -> bool:
+        """Whether an existing index has the same options as this spec."""
+        return (
+            bool(index_info.get("unique")) == self.unique
+            and bool(index_info.get("sparse")) == self.sparse
+            and index_info.get("partialFilterExpression") == self.partial_filter
+            and index_info.get("expireAfterSeconds") == self.expire_after_seconds
+        )
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    """A query on a request path that must be answered from an index."""
+
+    name: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: Optional[List[Tuple[str, int]]] = None
+    projection: Optional[Dict[str, Any]] = None
+    hint: Optional[List[Tuple[str, int]]] = None
+
+
+def build_manifest() -> List[IndexSpec]:
+    """Return the indexes the current configuration requires."""
+    manifest = [
+        # contracts: listing (unfiltered and by status), keyset cursors, dedup, batches
+        IndexSpec("contracts", (("upload_date", -1), ("_id", -1))),
+        IndexSpec("contracts", (("status", 1), ("upload_date", -1), ("_id", -1))),
+        IndexSpec("contracts", (("content_hash", 1), ("status", 1))),
+        IndexSpec("contracts", (("batch_id", 1),), sparse=True),
+        # contracts: covered status checks
+        IndexSpec("contracts", (("_id", 1), ("status", 1))),
+
+        # contract_data: one extraction per contract
+        IndexSpec("contract_data", (("contract_id", 1),), unique=True),
+        IndexSpec("contract_data", (("processing_date", 1),)),
+        IndexSpec("contract_data", (("confidence_score", 1),)),
+
+        # jobs: claiming, lease reclamation, and at most one active job per contract
+        IndexSpec("jobs", (("status", 1), ("available_at", 1))),
+        IndexSpec("jobs", (("status", 1), ("lease_expires_at", 1))),
+        IndexSpec("jobs", (("contract_id", 1),), unique=True,
+                  partial_filter={"status": {"$in": ["queued", "running"]}}),
+
+        # profiles: per-contract listing, removed after the retention period
+        IndexSpec("profiles", (("contract_id", 1), ("created_at", -1))),
+        IndexSpec("profiles", (("created_at", 1),), expire_after_seconds=settings.profile_retention_seconds),
+    ]
+
+    if settings.dedup_enabled:
+        # One stored extraction per distinct file content
+        manifest.append(IndexSpec(
+            "contract_data", (("content_hash", 1),), unique=True,
+            partial_filter={"content_hash": {"$type": "string"}}
+        ))
+
+    if settings.cache_backend == "mongo":
+        # Shared cache entries are removed once their expires_at passes
+        manifest.append(IndexSpec("cache", (("expires_at", 1),), expire_after_seconds=0))
+
+    return manifest
+
+
+def build_hot_queries() -> List[HotQuery]:
+    """Return representative instances of the queries issued on hot paths."""
+    now = datetime.utcnow()
+    return [
+        HotQuery("list_contracts", "contracts", {}, sort=[("upload_date", -1), ("_id", -1)]),
+        HotQuery("list_contracts_by_status", "contracts", {"status": "completed"},
+                 sort=[("upload_date", -1), ("_id", -1)]),
+        HotQuery("list_contracts_after_cursor", "contracts",
+                 {"$or": [{"upload_date": {"$lt": now}}, {"upload_date": now, "_id": {"$lt": ""}}]},
+                 sort=[("upload_date", -1), ("_id", -1)]),
+        HotQuery("contract_state", "contracts", {"_id": ""}, projection={"_id": 1, "status": 1},
+                 hint=[("_id", 1), ("status", 1)]),
+        HotQuery("contract_data_by_contract", "contract_data", {"contract_id": ""}),
+        HotQuery("dedup_lookup", "contracts", {"content_hash": "", "status": "completed"}),
+        HotQuery("batch_progress", "contracts", {"batch_id": ""}),
+        HotQuery("claim_job", "jobs", {"status": "queued", "available_at": {"$lte": now}},
+                 sort=[("available_at", 1)]),
+        HotQuery("reclaim_expired_jobs", "jobs", {"status": "running", "lease_expires_at": {"$lt": now}}),
+    ]
+
+
+async def reconcile_indexes(database: AsyncIOMotorDatabase, apply: bool = False,
+                            drop_extra: bool = False) -> Dict[str, List[str]]:
+    """Compare existing indexes with the manifest.
+
+    Missing indexes are created when ``apply`` is set; ones that cannot be
+    built (e.g. a unique index over duplicate data) are reported as failed.
+    Indexes that exist with
+    different options are reported as conflicting and left untouched. Indexes
+    not in the manifest are reported as extra, and dropped only when
+    ``drop_extra`` is set.
+    """
+    report = {"missing": [], "created": [], "failed": [], "conflicting": [], "extra": [], "dropped": []}
+    manifest = build_manifest()
+
+    for collection_name in sorted({spec.collection for spec in manifest}):
+        collection = database[collection_name]
+        existing = {}
+        async for index_info in collection.list_indexes():
+            keys = tuple(
+                (field, int(direction) if isinstance(direction, (int, float)) else direction)
+                for field, direction in index_info["key"].items()
+            )
+            existing[keys] = index_info
+
+        expected = [spec for spec in manifest if spec.collection == collection_name]
+        for spec in expected:
+            label = f"{collection_name}.{spec.name}"
+            index_info = existing.get(spec.keys)
+            if index_info is None:
+                report["missing"].append(label)
+                if apply:
+                    try:
+                        await collection.create_index(list(spec.keys), **spec.options())
+                        report["created"].append(label)
+                    except OperationFailure as e:
+                        logger.error(f"Failed to create index {label}: {e}")
+                        report["failed"].append(label)
+            elif not spec.matches(index_info):
+                report["conflicting"].append(label)
+
+        expected_keys = {spec.keys for spec in expected}
+        for keys, index_info in existing.items():
+            if keys == (("_id", 1),) or keys in expected_keys:
+                continue
+            label = f"{collection_name}.{index_info['name']}"
+            report["extra"].append(label)
+            if drop_extra:
+                await collection.drop_index(index_info["name"])
+                report["dropped"].append(label)
+
+    return report
+
+
+def _plan_stages(plan: Dict[str, Any]) -> List[str]:
+    """Flatten the stage names of a query plan tree."""
+    stages = [plan.get("stage", "")]
+    if "inputStage" in plan:
+        stages.extend(_plan_stages(plan["inputStage"]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_plan_stages(child))
+    return stages
+
+
+async def explain_hot_queries(database: AsyncIOMotorDatabase) -> List[Dict[str, Any]]:
+    """Explain each hot query and report whether it is served by an index."""
+    results = []
+    for query in build_hot_queries():
+        cursor = database[query.collection].find(query.filter, query.projection).limit(1)
+        if query.sort:
+            cursor = cursor.sort(query.sort)
+        if query.hint:
+            cursor = cursor.hint(query.hint)
+
+        explanation = await cursor.explain()
+        stages = _plan_stages(explanation["queryPlanner"]["winningPlan"])
+        results.append({
+            "query": query.name,
+            "collection": query.collection,
+            "stages": stages,
+            "indexed": "COLLSCAN" not in stages,
+            "covered": "FETCH" not in stages and "COLLSCAN" not in stages
+        })
+    return results
+
+
+async def main():
+    """Report, apply and explain the index manifest from the command line."""
+    from app.database import connect_to_mongo, close_mongo_connection, get_database
+
+    parser = argparse.ArgumentParser(description="Reconcile MongoDB indexes with the manifest")
+    parser.add_argument("--apply", action="store_true", help="create missing indexes")
+    parser.add_argument("--drop-extra", action="store_true", help="drop indexes not in the manifest")
+    parser.add_argument("--explain", action="store_true", help="check hot queries use an index")
+    args = parser.parse_args()
+
+    await connect_to_mongo(ensure_indexes=False)
+    try:
+        database = get_database()
+        output = {"indexes": await reconcile_indexes(database, apply=args.apply, drop_extra=args.drop_extra)}
+        if args.explain:
+            output["queries"] = await explain_hot_queries(database)
+        print(json.dumps(output, indent=2))
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,17 +2,35 @@
 
 import logging
 import os
+import uuid
+import zipfile
 from contextlib import asynccontextmanager
-from typing import Optional
+from functools import partial
+from typing import Optional, List
 import asyncio
-from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Query, Depends
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Query, Depends, Header, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse, PlainTextResponse
+from starlette.background import BackgroundTask
 from fastapi.middleware.cors import CORSMiddleware
 from app.database import connect_to_mongo, close_mongo_connection, get_database
-from app.services.contract_service import ContractService
+from app.dependencies import Services, get_contract_service, get_job_queue, get_profile_store, require_profiling_token
+from app.services.contract_service import ContractService, UploadValidationError, InvalidCursorError
+from app.services.extraction_executor import extraction_executor
+from app.services.job_queue import JobQueue
+from app.services.profiles import ProfileStore, ProfilingMiddleware, profile_info
+from app.services.cache import contract_cache
+from app.services.dedup import dedup_stats
+from app.services.events import contract_events, status_event, format_sse, ChangeStreamFeeder, TERMINAL_STATUSES
+from app.utils.archive import ZipMemberReader, list_pdf_members
+from app.utils.http import RangeFileResponse, RangeNotSatisfiableError, etag_matches, parse_range
+from app.utils.metrics import metrics, jobs
+from app.utils.profiling import profiling_requested
+from app.worker import Worker
 from app.schemas import (
     ContractUploadResponse, ContractStatusResponse, ContractDataResponse,
-    ContractListResponse, ErrorResponse, HealthCheckResponse
+    ContractListResponse, ErrorResponse, HealthCheckResponse,
+    BatchUploadItem, BatchUploadResponse, BatchStatusResponse,
+    ProfileInfo, ProfileListResponse
 )
 from app.config import settings
 from datetime import datetime
@@ -30,9 +48,32 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
     await connect_to_mongo()
+    extraction_executor.start()
+    app.state.services = Services(get_database())
+    
+    # Drop cached status and data whenever a contract changes state
+    contract_events.add_listener(contract_cache.handle_event)
+    
+    # Optionally consume jobs in-process instead of in separate workers
+    worker, worker_task = None, None
+    if settings.embedded_worker:
+        worker = Worker(get_database())
+        await worker.recover()
+        worker_task = asyncio.create_task(worker.run())
+    
+    # Any worker, embedded in another replica or standalone, may process a
+    # contract uploaded here; follow every status change via a change stream
+    feeder_task = asyncio.create_task(ChangeStreamFeeder(get_database(), contract_events).run())
+    
     logger.info("Application started")
     yield
     # Shutdown
+    feeder_task.cancel()
+    contract_events.remove_listener(contract_cache.handle_event)
+    if worker:
+        worker.stop()
+        await worker_task
+    await extraction_executor.shutdown()
     await close_mongo_connection()
     logger.info("Application shutdown")
 
@@ -54,19 +95,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-
-def get_contract_service() -> ContractService:
-    """Get contract service instance."""
-    return ContractService(get_database())
-
-
-async def process_contract_background(contract_id: str):
-    """Background task for processing contracts."""
-    try:
-        service = get_contract_service()
-        await service.process_contract(contract_id)
-    except Exception as e:
-        logger.error(f"Background processing failed for contract {contract_id}: {e}")
+# Profile requests that carry an allowlisted profiling token
+app.add_middleware(ProfilingMiddleware)
 
 
 @app.get("/")
@@ -92,14 +122,50 @@ async def health_check():
     }
 
 
+@app.get("/stats")
+async def get_stats():
+    """Processing statistics for this API process."""
+    return {
+        "dedup": dedup_stats.as_dict(),
+        "cache": {"backend": contract_cache.backend, **contract_cache.stats.as_dict()},
+        "extraction": extraction_executor.stats()
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(job_queue: JobQueue = Depends(get_job_queue)):
+    """Metrics of this API process in the Prometheus text exposition format.
+    
+    Includes per-stage parse and processing time histograms, in-flight
+    parses, processed contracts, upload counters (upload bytes/sec is
+    ``rate(contract_upload_bytes_total[1m])``) and the job queue depth,
+    which is counted at scrape time. Processing and parse metrics are only
+    recorded here with the embedded worker; standalone workers serve theirs
+    on ``WORKER_METRICS_PORT``.
+    """
+    try:
+        for status, count in (await job_queue.depth()).items():
+            jobs.set(count, status=status)
+    except Exception as e:
+        logger.error(f"Error counting jobs: {e}")
+    
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/contracts/upload")
-async def upload_contract(file: UploadFile = File(...)):
+async def upload_contract(
+    file: UploadFile = File(...),
+    profile: bool = Depends(profiling_requested),
+    service: ContractService = Depends(get_contract_service),
+    job_queue: JobQueue = Depends(get_job_queue)
+):
     """
     Upload PDF contract file for processing.
     
     - **file**: PDF contract file (max 50MB)
     
-    Returns contract_id for tracking processing status.
+    Returns contract_id for tracking processing status. With an allowlisted
+    profiling token, processing is profiled as well as the upload.
     """
     try:
         # Validate file type
@@ -109,42 +175,34 @@ async def upload_contract(file: UploadFile = File(...)):
                 detail="Only PDF files are supported"
             )
         
-        # Read file content
-        content = await file.read()
-        
-        # Validate file size
-        if len(content) > settings.max_file_size:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size exceeds maximum limit of {settings.max_file_size} bytes"
-            )
-        
-        if len(content) == 0:
+        # Stream file to disk, validating size as chunks arrive
+        try:
+            record = await service.ingest_upload(file.filename, file)
+        except UploadValidationError as e:
             raise HTTPException(
                 status_code=400,
-                detail="File is empty"
+                detail=str(e)
             )
         
-        # Initialize service
-        service = get_contract_service()
+        # Create contract record, releasing the stored file if that fails
+        try:
+            contract_id = await service.create_contract(**record)
+        except Exception:
+            await service.discard_uploads([record])
+            raise
         
-        # Save file and create contract record
-        file_path, content_hash = await service.save_uploaded_file(file.filename, content)
-        contract_id = await service.create_contract(
-            filename=file.filename,
-            file_path=file_path,
-            file_size=len(content),
-            content_hash=content_hash
-        )
-        
-        # Start background processing (simplified)
-        asyncio.create_task(process_contract_background(contract_id))
+        if record["data_contract_id"]:
+            message = "Contract uploaded successfully. Reused extraction of an identical contract."
+        else:
+            # Queue contract for processing by a worker
+            await job_queue.enqueue(contract_id, profile=profile)
+            message = "Contract uploaded successfully. Processing started."
         
         return {
             "contract_id": contract_id,
-            "message": "Contract uploaded successfully. Processing started.",
+            "message": message,
             "filename": file.filename,
-            "file_size": len(content)
+            "file_size": record["file_size"]
         }
         
     except HTTPException:
@@ -157,8 +215,141 @@ async def upload_contract(file: UploadFile = File(...)):
         )
 
 
+@app.post("/contracts/batch", response_model=BatchUploadResponse)
+async def upload_contract_batch(
+    files: List[UploadFile] = File(...),
+    profile: bool = Depends(profiling_requested),
+    service: ContractService = Depends(get_contract_service),
+    job_queue: JobQueue = Depends(get_job_queue)
+):
+    """
+    Upload many PDF contracts in a single request.
+    
+    - **files**: PDF contract files, or a single ZIP archive of PDFs
+    
+    Returns a batch_id and per-file contract ids. Files that fail validation
+    are reported individually and do not reject the whole batch. With an
+    allowlisted profiling token, processing of every contract is profiled.
+    """
+    records, contract_ids = [], None
+    try:
+        batch_id = str(uuid.uuid4())
+        items = []
+        
+        async def ingest(filename: str, reader):
+            try:
+                record = await service.ingest_upload(filename, reader)
+            except UploadValidationError as e:
+                items.append(BatchUploadItem(filename=filename, error=str(e)))
+                return
+            records.append(record)
+            items.append(BatchUploadItem(
+                filename=filename,
+                file_size=record["file_size"],
+                deduplicated=record["data_contract_id"] is not None
+            ))
+        
+        if len(files) == 1 and files[0].filename.lower().endswith('.zip'):
+            # Stream members out of the spooled archive one chunk at a time
+            try:
+                with zipfile.ZipFile(files[0].file) as archive:
+                    members = list_pdf_members(archive)
+                    if len(members) > settings.batch_max_files:
+                        raise HTTPException(
+                            status_code=400,
+                            detail=f"Batch exceeds maximum of {settings.batch_max_files} files"
+                        )
+                    for member in members:
+                        with archive.open(member) as member_file:
+                            await ingest(os.path.basename(member.filename), ZipMemberReader(member_file))
+            except zipfile.BadZipFile:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid ZIP archive"
+                )
+        else:
+            if len(files) > settings.batch_max_files:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Batch exceeds maximum of {settings.batch_max_files} files"
+                )
+            for file in files:
+                if not file.filename.lower().endswith('.pdf'):
+                    items.append(BatchUploadItem(filename=file.filename, error="Only PDF files are supported"))
+                    continue
+                await ingest(file.filename, file)
+        
+        if not records:
+            raise HTTPException(
+                status_code=400,
+                detail="Batch contains no valid PDF files"
+            )
+        
+        # Create all contract records at once and queue those that need parsing
+        contract_ids = await service.create_contracts(records, batch_id)
+        await job_queue.enqueue_many([
+            contract_id for contract_id, record in zip(contract_ids, records)
+            if not record["data_contract_id"]
+        ], profile=profile)
+        
+        accepted = iter(contract_ids)
+        for item in items:
+            if item.error is None:
+                item.contract_id = next(accepted)
+        
+        return BatchUploadResponse(
+            batch_id=batch_id,
+            accepted=len(contract_ids),
+            rejected=len(items) - len(contract_ids),
+            contracts=items
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error uploading contract batch: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error during batch upload"
+        )
+    finally:
+        # Files stored before the batch was rejected are no longer referenced
+        if contract_ids is None:
+            await service.discard_uploads(records)
+
+
+@app.get("/contracts/batch/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch_status(batch_id: str, service: ContractService = Depends(get_contract_service)):
+    """
+    Get aggregate processing progress for a batch upload.
+    
+    - **batch_id**: Batch identifier returned by the batch upload
+    
+    Returns per-status counts and average progress.
+    """
+    try:
+        batch_data = await service.get_batch_progress(batch_id)
+        
+        if not batch_data:
+            raise HTTPException(
+                status_code=404,
+                detail="Batch not found"
+            )
+        
+        return BatchStatusResponse(**batch_data)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting batch status: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error"
+        )
+
+
 @app.get("/contracts/{contract_id}/status", response_model=ContractStatusResponse)
-async def get_contract_status(contract_id: str):
+async def get_contract_status(contract_id: str, service: ContractService = Depends(get_contract_service)):
     """
     Get contract processing status.
     
@@ -167,7 +358,6 @@ async def get_contract_status(contract_id: str):
     Returns processing state, progress, and error details if any.
     """
     try:
-        service = get_contract_service()
         status_data = await service.get_contract_status(contract_id)
         
         if not status_data:
@@ -188,8 +378,164 @@ async def get_contract_status(contract_id: str):
         )
 
 
+@app.get("/contracts/{contract_id}/events")
+async def stream_contract_events(contract_id: str, service: ContractService = Depends(get_contract_service)):
+    """
+    Stream contract status transitions as server-sent events.
+    
+    - **contract_id**: Unique contract identifier
+    
+    Sends the current status first, then each transition as it happens.
+    The stream ends once the contract is completed or failed.
+    """
+    try:
+        
+        # Subscribe before reading the current status so no transition is missed
+        subscription = contract_events.open([contract_id])
+        status_data = await service.get_contract_status(contract_id, cached=False)
+        if not status_data:
+            subscription.close()
+            raise HTTPException(
+                status_code=404,
+                detail="Contract not found"
+            )
+        
+        current = status_event(
+            contract_id, status_data["status"], status_data["progress"], status_data.get("error_message")
+        )
+        
+        async def event_stream():
+            last = current
+            try:
+                yield format_sse("status", current)
+                if current["status"] in TERMINAL_STATUSES:
+                    return
+                while True:
+                    if contract_events.live:
+                        event = await subscription.get(timeout=settings.events_keepalive_seconds)
+                        if event is None:
+                            yield ": keepalive\n\n"
+                            continue
+                    else:
+                        # No change stream to follow other processes; poll instead
+                        event = await subscription.get(timeout=settings.events_poll_seconds)
+                        if event is None:
+                            status_data = await service.get_contract_status(contract_id, cached=False)
+                            if not status_data:
+                                return
+                            event = status_event(
+                                contract_id, status_data["status"], status_data["progress"],
+                                status_data.get("error_message")
+                            )
+                            if event == last:
+                                yield ": keepalive\n\n"
+                                continue
+                    last = event
+                    yield format_sse("status", event)
+                    if event["status"] in TERMINAL_STATUSES:
+                        return
+            finally:
+                subscription.close()
+        
+        return StreamingResponse(
+            event_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            background=BackgroundTask(subscription.close)
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error streaming contract events: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error"
+        )
+
+
+@app.websocket("/ws/contracts")
+async def contract_events_websocket(websocket: WebSocket, service: ContractService = Depends(get_contract_service)):
+    """
+    Multiplexed contract status stream over a single WebSocket.
+    
+    Clients send ``{"action": "subscribe", "contract_ids": [...]}`` or
+    ``{"action": "unsubscribe", "contract_ids": [...]}``. The server replies
+    with the current status of each newly subscribed contract, followed by
+    every transition of the subscribed contracts.
+    """
+    await websocket.accept()
+    
+    async with contract_events.subscribe() as subscription:
+        async def forward_events():
+            # Last status sent per contract, compared against when polling
+            sent = {}
+            while True:
+                event = await subscription.get(timeout=settings.events_poll_seconds)
+                if event is None:
+                    if contract_events.live:
+                        continue
+                    # No change stream to follow other processes; poll instead
+                    for contract_id in list(subscription.contract_ids):
+                        if sent.get(contract_id, {}).get("status") in TERMINAL_STATUSES:
+                            continue
+                        status_data = await service.get_contract_status(contract_id, cached=False)
+                        if not status_data or contract_id not in subscription.contract_ids:
+                            continue
+                        polled = status_event(
+                            contract_id, status_data["status"], status_data["progress"],
+                            status_data.get("error_message")
+                        )
+                        if polled != sent.get(contract_id):
+                            sent[contract_id] = polled
+                            await websocket.send_json(polled)
+                    continue
+                if "status" in event:
+                    sent[event["contract_id"]] = event
+                await websocket.send_json(event)
+        
+        sender = asyncio.create_task(forward_events())
+        try:
+            while True:
+                try:
+                    message = await websocket.receive_json()
+                except ValueError:
+                    subscription.deliver({"error": "Messages must be JSON"})
+                    continue
+                
+                action = message.get("action") if isinstance(message, dict) else None
+                contract_ids = message.get("contract_ids") if action else None
+                if action not in ("subscribe", "unsubscribe") or not isinstance(contract_ids, list):
+                    subscription.deliver({"error": "Expected an action and a list of contract_ids"})
+                    continue
+                
+                if action == "unsubscribe":
+                    subscription.remove(contract_ids)
+                    continue
+                
+                new_ids = [contract_id for contract_id in contract_ids if contract_id not in subscription.contract_ids]
+                subscription.add(new_ids)
+                for contract_id in new_ids:
+                    status_data = await service.get_contract_status(contract_id, cached=False)
+                    if not status_data:
+                        subscription.remove([contract_id])
+                        subscription.deliver({"contract_id": contract_id, "error": "Contract not found"})
+                        continue
+                    subscription.deliver(status_event(
+                        contract_id, status_data["status"], status_data["progress"], status_data.get("error_message")
+                    ))
+        except WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
+
+
 @app.get("/contracts/{contract_id}", response_model=ContractDataResponse)
-async def get_contract_data(contract_id: str):
+async def get_contract_data(
+    contract_id: str,
+    if_none_match: Optional[str] = Header(None),
+    service: ContractService = Depends(get_contract_service)
+):
     """
     Get extracted contract data.
     
@@ -197,23 +543,23 @@ async def get_contract_data(contract_id: str):
     
     Returns parsed contract data with confidence scores.
     Available only when processing status is "completed".
+    Responses carry an ETag; a matching If-None-Match yields 304 Not Modified.
     """
     try:
-        service = get_contract_service()
         contract_data = await service.get_contract_data(contract_id)
         
         if not contract_data:
             # Check if contract exists but not completed
-            status_data = await service.get_contract_status(contract_id)
-            if not status_data:
+            state = await service.get_contract_state(contract_id)
+            if not state:
                 raise HTTPException(
                     status_code=404,
                     detail="Contract not found"
                 )
-            elif status_data["status"] != "completed":
+            elif state != "completed":
                 raise HTTPException(
                     status_code=400,
-                    detail=f"Contract processing not completed. Current status: {status_data['status']}"
+                    detail=f"Contract processing not completed. Current status: {state}"
                 )
             else:
                 raise HTTPException(
@@ -221,7 +567,15 @@ async def get_contract_data(contract_id: str):
                     detail="Contract data not found"
                 )
         
-        return ContractDataResponse(**contract_data)
+        # Completed extractions are immutable; serve the stored JSON as-is
+        headers = {
+            "ETag": contract_data["etag"],
+            "Cache-Control": f"private, max-age={settings.data_cache_max_age}"
+        }
+        if etag_matches(if_none_match, contract_data["etag"]):
+            return Response(status_code=304, headers=headers)
+        
+        return Response(content=contract_data["body"], media_type="application/json", headers=headers)
         
     except HTTPException:
         raise
@@ -237,27 +591,38 @@ async def get_contract_data(contract_id: str):
 async def get_contracts_list(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
-    status: Optional[str] = Query(None, description="Filter by status (pending, processing, completed, failed)")
+    status: Optional[str] = Query(None, description="Filter by status (pending, processing, completed, failed)"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Include total count (estimated when unfiltered)"),
+    service: ContractService = Depends(get_contract_service)
 ):
     """
     Get paginated list of contracts.
     
-    - **page**: Page number (starts from 1)
+    - **page**: Page number (starts from 1), for shallow pages
     - **page_size**: Number of contracts per page (1-100)
     - **status**: Optional status filter
+    - **cursor**: Opaque cursor for keyset pagination; overrides page
+    - **include_total**: Whether to return the total count
     
-    Returns paginated list with metadata and confidence scores.
+    Returns paginated list with metadata, confidence scores and next_cursor.
     """
     try:
-        service = get_contract_service()
         contracts_data = await service.get_contracts_list(
             page=page,
             page_size=page_size,
-            status_filter=status
+            status_filter=status,
+            cursor=cursor,
+            include_total=include_total
         )
         
         return ContractListResponse(**contracts_data)
         
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
     except Exception as e:
         logger.error(f"Error getting contracts list: {e}")
         raise HTTPException(
@@ -267,44 +632,170 @@ async def get_contracts_list(
 
 
 @app.get("/contracts/{contract_id}/download")
-async def download_contract(contract_id: str):
+async def download_contract(
+    contract_id: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    service: ContractService = Depends(get_contract_service)
+):
     """
     Download original PDF contract file.
     
     - **contract_id**: Unique contract identifier
     
-    Returns the original PDF file with proper headers.
+    Returns the original PDF file with proper headers. The ETag is derived
+    from the file's content hash; a matching If-None-Match yields 304 Not
+    Modified. A single byte range may be requested with Range (and If-Range)
+    for resumable downloads.
     """
     try:
-        service = get_contract_service()
-        file_path = await service.get_contract_file_path(contract_id)
+        file_info = await service.get_contract_file(contract_id)
         
-        if not file_path or not os.path.exists(file_path):
+        if not file_info:
             raise HTTPException(
                 status_code=404,
                 detail="Contract file not found"
             )
         
-        # Get original filename from database
-        status_data = await service.get_contract_status(contract_id)
-        if not status_data:
+        etag = f'"{file_info["content_hash"]}"' if file_info["content_hash"] else None
+        if etag and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Accept-Ranges": "bytes"})
+        
+        blob = file_info["blob"]
+        
+        # A stale If-Range validator means the client's partial copy is outdated
+        byte_range = None
+        if not if_range or (etag and if_range.strip() == etag):
+            try:
+                byte_range = parse_range(range_header, blob.size)
+            except RangeNotSatisfiableError:
+                return Response(
+                    status_code=416,
+                    headers={"Content-Range": f"bytes */{blob.size}", "Accept-Ranges": "bytes"}
+                )
+        
+        return RangeFileResponse(
+            size=blob.size,
+            modified=blob.modified,
+            filename=file_info["filename"],
+            media_type="application/pdf",
+            etag=etag,
+            byte_range=byte_range,
+            path=blob.path,
+            chunks=partial(service.storage.iter_range, blob.key) if file_info["storage_key"] else None
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error downloading contract: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error"
+        )
+
+
+@app.get("/admin/contracts/{contract_id}/profiles", response_model=ProfileListResponse,
+         dependencies=[Depends(require_profiling_token)])
+async def list_contract_profiles(
+    contract_id: str,
+    limit: int = Query(50, ge=1, le=200, description="Maximum number of profiles"),
+    profile_store: ProfileStore = Depends(get_profile_store)
+):
+    """
+    List the stored profiles of a contract, newest first.
+    
+    - **contract_id**: Unique contract identifier
+    
+    Requires an allowlisted profiling token in the X-Profile header.
+    """
+    try:
+        profiles = await profile_store.list_for_contract(contract_id, limit)
+        return ProfileListResponse(
+            contract_id=contract_id,
+            profiles=[ProfileInfo(**profile_info(profile)) for profile in profiles]
+        )
+        
+    except Exception as e:
+        logger.error(f"Error listing profiles: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error"
+        )
+
+
+@app.post("/admin/contracts/{contract_id}/profile", response_model=ProfileInfo,
+          dependencies=[Depends(require_profiling_token)])
+async def profile_contract_parse(
+    contract_id: str,
+    service: ContractService = Depends(get_contract_service),
+    profile_store: ProfileStore = Depends(get_profile_store)
+):
+    """
+    Parse a contract's stored file again under the profiler.
+    
+    - **contract_id**: Unique contract identifier
+    
+    The contract and its extracted data are not changed. Returns the stored
+    profile, which is kept even if parsing fails.
+    """
+    try:
+        profile_id = await service.profile_parse(contract_id)
+        
+        if not profile_id:
             raise HTTPException(
                 status_code=404,
-                detail="Contract not found"
+                detail="Contract file not found"
             )
         
-        filename = status_data.get("filename", "contract.pdf")
+        return ProfileInfo(**profile_info(await profile_store.get(profile_id)))
         
-        return FileResponse(
-            path=file_path,
-            filename=filename,
-            media_type="application/pdf"
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error profiling contract: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error"
+        )
+
+
+@app.get("/admin/profiles/{profile_id}", dependencies=[Depends(require_profiling_token)])
+async def download_profile(
+    profile_id: str,
+    format: str = Query("prof", pattern="^(prof|text)$", description="prof for pstats/snakeviz, text for a summary"),
+    profile_store: ProfileStore = Depends(get_profile_store)
+):
+    """
+    Download a stored profile.
+    
+    - **profile_id**: Profile identifier from X-Profile-Id or a profile listing
+    - **format**: ``prof`` for the raw statistics, loadable with ``pstats`` or
+      snakeviz, or ``text`` for the functions with the highest cumulative time
+    """
+    try:
+        profile = await profile_store.get(profile_id)
+        
+        if not profile:
+            raise HTTPException(
+                status_code=404,
+                detail="Profile not found"
+            )
+        
+        if format == "text":
+            return PlainTextResponse(profile["summary"])
+        
+        return Response(
+            content=bytes(profile["stats"]),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.prof"'}
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error downloading contract: {e}")
+        logger.error(f"Error downloading profile: {e}")
         raise HTTPException(
             status_code=500,
             detail="Internal server error"
@@ -11,13 +11,16 @@ class ContractModel(BaseModel):
     
     id: str = Field(default_factory=lambda: str(ObjectId()), alias="_id")
     filename: str
-    file_path: str
+    storage_key: Optional[str] = None  # content hash of the stored file
+    file_path: Optional[str] = None  # flat upload path of files stored before storage keys
     status: str = "pending"  # pending, processing, completed, failed
     progress: int = 0
     upload_date: datetime = Field(default_factory=datetime.utcnow)
     error_message: Optional[str] = None
     file_size: int
     content_hash: str
+    data_contract_id: Optional[str] = None  # contract whose extraction is reused
+    batch_id: Optional[str] = None
 
     class Config:
         populate_by_name = True
@@ -182,6 +185,7 @@ class ExtractedData(BaseModel):
     payment_structure: Optional[PaymentStructure] = None
     revenue_classification: Optional[RevenueClassification] = None
     sla_terms: Optional[SLATerms] = None
+    gap_analysis: Optional[GapAnalysis] = None
 
 
 class ContractDataModel(BaseModel):
@@ -189,10 +193,10 @@ class ContractDataModel(BaseModel):
     
     id: str = Field(default_factory=lambda: str(ObjectId()), alias="_id")
     contract_id: str
+    content_hash: Optional[str] = None
     extracted_data: ExtractedData
     confidence_score: float = 0.0
     processing_date: datetime = Field(default_factory=datetime.utcnow)
-    gap_analysis: Optional[GapAnalysis] = None
 
     class Config:
         populate_by_name = True
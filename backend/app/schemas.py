@@ -14,6 +14,35 @@ class ContractUploadResponse(BaseModel):
     file_size: int
 
 
+class BatchUploadItem(BaseModel):
+    """Per-file result of a batch upload."""
+    
+    filename: str
+    contract_id: Optional[str] = None
+    file_size: Optional[int] = None
+    deduplicated: bool = False
+    error: Optional[str] = None
+
+
+class BatchUploadResponse(BaseModel):
+    """Response schema for batch upload."""
+    
+    batch_id: str
+    accepted: int
+    rejected: int
+    contracts: List[BatchUploadItem]
+
+
+class BatchStatusResponse(BaseModel):
+    """Response schema for aggregate batch progress."""
+    
+    batch_id: str
+    total: int
+    status_counts: Dict[str, int]
+    progress: float  # average progress across contracts, 0-100
+    finished: bool
+
+
 class ContractStatusResponse(BaseModel):
     """Response schema for contract processing status."""
     
@@ -39,10 +68,11 @@ class ContractListResponse(BaseModel):
     """Response schema for contract list."""
     
     contracts: List[ContractListItem]
-    total: int
-    page: int
+    total: Optional[int] = None  # estimated when unfiltered
+    page: Optional[int] = None  # None in cursor mode
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class ContractDataResponse(BaseModel):
@@ -69,3 +99,24 @@ class HealthCheckResponse(BaseModel):
     status: str
     timestamp: datetime
     database_connected: bool
+
+
+class ProfileInfo(BaseModel):
+    """Metadata of a stored profile."""
+    
+    profile_id: str
+    kind: str  # processing, parse, request
+    contract_id: Optional[str] = None
+    method: Optional[str] = None
+    path: Optional[str] = None
+    status: str  # completed, failed
+    duration_seconds: float
+    size: int
+    created_at: datetime
+
+
+class ProfileListResponse(BaseModel):
+    """Profiles stored for a contract, newest first."""
+    
+    contract_id: str
+    profiles: List[ProfileInfo]
@@ -0,0 +1,200 @@
+"""Read-through caching of contract status and extraction results.
+
+Completed extractions never change, so their API payloads are cached until
+evicted. Status payloads are cached for ``STATUS_CACHE_TTL`` seconds. Both are
+invalidated whenever a status transition for the contract is published to
+the event broker, which also covers transitions made by standalone workers
+when the change stream feeder is running.
+
+``CACHE_BACKEND`` selects the backend: ``memory`` (per process, the default),
+``mongo`` (a collection shared by all API nodes) or ``none``.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Tuple
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def status_key(contract_id: str) -> str:
+    """Cache key of a contract's status payload."""
+    return f"status:{contract_id}"
+
+
+def data_key(contract_id: str) -> str:
+    """Cache key of a contract's extracted data payload."""
+    return f"data:{contract_id}"
+
+
+class CacheStats:
+    """Counters for cache lookups in this process."""
+
+    def __init__(self):
+        """Initialize counters at zero."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return counters as a serializable dict."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate, 4)
+        }
+
+
+class Cache:
+    """Cache interface. This base implementation caches nothing."""
+
+    backend = "none"
+
+    def __init__(self):
+        """Initialize cache counters."""
+        self.stats = CacheStats()
+        self._pending = set()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None."""
+        self.stats.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Cache a value, for ``ttl`` seconds or until evicted."""
+
+    async def delete(self, *keys: str):
+        """Remove keys from the cache."""
+
+    def invalidate_contract(self, contract_id: str):
+        """Drop cached payloads of a contract.
+
+        Called synchronously from event broker listeners; backends that need
+        I/O schedule the deletion on the running event loop.
+        """
+        task = asyncio.get_running_loop().create_task(
+            self.delete(status_key(contract_id), data_key(contract_id))
+        )
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def handle_event(self, event: Dict[str, Any]):
+        """Event broker listener invalidating contracts on status transitions."""
+        if "contract_id" in event:
+            self.invalidate_contract(event["contract_id"])
+
+
+class MemoryCache(Cache):
+    """Bounded in-process cache with LRU eviction and per-entry TTL."""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int):
+        """Initialize an empty cache holding at most ``max_entries`` values."""
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+
+    def _now(self) -> float:
+        """Monotonic clock used for expiry."""
+        return asyncio.get_running_loop().time()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None if absent or expired."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is None or expires_at > self._now():
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return value
+            del self._entries[key]
+
+        self.stats.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Cache a value, evicting the least recently used entries when full."""
+        expires_at = self._now() + ttl if ttl is not None else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def delete(self, *keys: str):
+        """Remove keys from the cache."""
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def invalidate_contract(self, contract_id: str):
+        """Drop cached payloads of a contract immediately."""
+        self._entries.pop(status_key(contract_id), None)
+        self._entries.pop(data_key(contract_id), None)
+
+
+class MongoCache(Cache):
+    """Cache shared by all API nodes, stored in the ``cache`` collection.
+
+    Expired entries are ignored on read and removed by a TTL index. Size is
+    not bounded here; the collection only holds payloads of contracts that
+    were actually requested.
+    """
+
+    backend = "mongo"
+
+    def _collection(self):
+        """The cache collection of the connected database."""
+        from app.database import get_database
+        return get_database().cache
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None if absent or expired."""
+        entry = await self._collection().find_one(
+            {"_id": key, "$or": [{"expires_at": None}, {"expires_at": {"$gt": datetime.utcnow()}}]},
+            {"value": 1}
+        )
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        return entry["value"]
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Cache a value, for ``ttl`` seconds or indefinitely."""
+        expires_at = datetime.utcnow() + timedelta(seconds=ttl) if ttl is not None else None
+        await self._collection().replace_one(
+            {"_id": key},
+            {"_id": key, "value": value, "expires_at": expires_at},
+            upsert=True
+        )
+
+    async def delete(self, *keys: str):
+        """Remove keys from the cache."""
+        await self._collection().delete_many({"_id": {"$in": list(keys)}})
+
+
+def build_cache() -> Cache:
+    """Create the cache backend selected in settings."""
+    if settings.cache_backend == "memory":
+        return MemoryCache(settings.cache_max_entries)
+    if settings.cache_backend == "mongo":
+        return MongoCache()
+    if settings.cache_backend != "none":
+        logger.warning(f"Unknown cache backend {settings.cache_backend!r}; caching disabled")
+    return Cache()
+
+
+contract_cache = build_cache()
@@ -1,75 +1,217 @@
 """Contract service with scoring algorithm and business logic."""
 
+import asyncio
+import base64
+import json
 import logging
 import hashlib
 import os
+import time
 import uuid
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 import aiofiles
+from fastapi.encoders import jsonable_encoder
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import OperationFailure
 from app.models import ContractModel, ContractDataModel, ExtractedData
-from app.utils.pdf_parser import pdf_parser
+from app.services.cache import contract_cache, status_key, data_key
+from app.services.dedup import DedupIndex
+from app.services.events import contract_events, status_event
+from app.services.progress import ProgressReporter, progress_store
+from app.services.storage import Storage, StoredBlob, contract_storage
+from app.services.extraction_executor import extraction_executor
 from app.config import settings
+from app.services.profiles import ProfileStore
+from app.utils.metrics import processing_stage_seconds, contracts_processed_total, uploads_total, upload_bytes_total
+from app.utils.profiling import ProfileCollector
 
 logger = logging.getLogger(__name__)
 
 
+class UploadValidationError(ValueError):
+    """Raised when an uploaded file fails validation while being streamed."""
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a listing cursor cannot be decoded."""
+
+
 class ContractService:
     """Service class for contract processing and scoring."""
     
-    def __init__(self, database: AsyncIOMotorDatabase):
-        """Initialize contract service with database connection."""
+    # Fields each access path reads; nothing else is pulled from MongoDB
+    PROJECTIONS = {
+        "processing": {"storage_key": 1, "file_path": 1, "content_hash": 1},
+        "status": {"status": 1, "progress": 1, "error_message": 1, "upload_date": 1},
+        # Served from the (_id, status) index without fetching the document
+        "state": {"_id": 1, "status": 1},
+        "data_owner": {"status": 1, "data_contract_id": 1},
+        "data_response": {"extracted_data_json": 1, "confidence_score": 1, "processing_date": 1},
+        "data_legacy": {"extracted_data": 1},
+        "list_score": {"_id": 0, "confidence_score": 1},
+        "list": {
+            "_id": 0,
+            "contract_id": "$_id",
+            "filename": 1,
+            "status": 1,
+            "upload_date": 1,
+            "file_size": 1,
+            "confidence_score": {"$arrayElemAt": ["$contract_data.confidence_score", 0]}
+        },
+        "file": {"storage_key": 1, "file_path": 1, "filename": 1, "content_hash": 1}
+    }
+    STATE_INDEX = [("_id", 1), ("status", 1)]
+    
+    def __init__(self, database: AsyncIOMotorDatabase, storage: Storage = contract_storage):
+        """Initialize contract service with database connection and file storage."""
         self.db = database
         self.contracts_collection = database.contracts
         self.contract_data_collection = database.contract_data
-        from app.utils.pdf_parser import PDFParser
-        self.pdf_parser = PDFParser()
-    
-    
-    def _generate_file_hash(self, content: bytes) -> str:
-        """Generate SHA256 hash of file content."""
-        return hashlib.sha256(content).hexdigest()
-    
-    async def save_uploaded_file(self, filename: str, content: bytes) -> tuple[str, str]:
-        """Save uploaded file to disk and return file path and hash."""
-        # Generate unique filename
-        file_id = str(uuid.uuid4())
-        safe_filename = f"{file_id}_{filename}"
-        file_path = os.path.join(settings.upload_dir, safe_filename)
-        
+        self.dedup_index = DedupIndex(database)
+        self.cache = contract_cache
+        self.storage = storage
+        self.profiles = ProfileStore(database)
+
+    async def save_upload_stream(self, upload) -> tuple[str, str, int]:
+        """Stream an upload into storage in fixed-size chunks.
+
+        Hashes and writes each chunk as it arrives so memory stays bounded by
+        ``settings.upload_chunk_size``. The file is staged under a temporary
+        name and handed to storage only once the whole upload has been
+        accepted; storage keeps one copy per distinct content.
+
+        Returns storage key, content hash and file size.
+        """
+        temp_path = os.path.join(settings.upload_dir, f".{uuid.uuid4()}.part")
+
         # Ensure upload directory exists
         os.makedirs(settings.upload_dir, exist_ok=True)
+
+        hasher = hashlib.sha256()
+        file_size = 0
+
+        try:
+            async with aiofiles.open(temp_path, 'wb') as f:
+                while True:
+                    chunk = await upload.read(settings.upload_chunk_size)
+                    if not chunk:
+                        break
+
+                    file_size += len(chunk)
+                    if file_size > settings.max_file_size:
+                        raise UploadValidationError(
+                            f"File size exceeds maximum limit of {settings.max_file_size} bytes"
+                        )
+
+                    hasher.update(chunk)
+                    await f.write(chunk)
+
+            if file_size == 0:
+                raise UploadValidationError("File is empty")
+
+            content_hash = hasher.hexdigest()
+            storage_key = await self.storage.store(temp_path, content_hash, file_size)
+        except BaseException:
+            # Storage consumes the staged file only once it has stored it
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        uploads_total.inc()
+        upload_bytes_total.inc(file_size)
+        return storage_key, content_hash, file_size
+
+    async def ingest_upload(self, filename: str, upload) -> Dict[str, Any]:
+        """Store an upload and look for a reusable extraction of the same content.
         
-        # Save file
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(content)
+        Returns the fields needed to create the contract record.
+        """
+        storage_key, content_hash, file_size = await self.save_upload_stream(upload)
         
-        # Generate content hash
-        content_hash = self._generate_file_hash(content)
+        # Reuse the extraction of an identical, already processed contract
+        source = await self.dedup_index.find_completed(content_hash)
         
-        return file_path, content_hash
+        return {
+            "filename": filename,
+            "storage_key": storage_key,
+            "file_size": file_size,
+            "content_hash": content_hash,
+            "data_contract_id": source["data_contract_id"] if source else None
+        }
     
-    async def create_contract(self, filename: str, file_path: str, file_size: int, content_hash: str) -> str:
-        """Create new contract record in database."""
-        contract_id = str(uuid.uuid4())
+    async def discard_uploads(self, records: List[Dict[str, Any]]):
+        """Release the stored files of uploads that did not become contracts."""
+        for record in records:
+            await self.storage.release(record["storage_key"])
+    
+    def _build_contract(self, filename: str, storage_key: str, file_size: int, content_hash: str,
+                        data_contract_id: Optional[str] = None, batch_id: Optional[str] = None) -> ContractModel:
+        """Build a new contract document.
+        
+        When ``data_contract_id`` is given the contract reuses that contract's
+        extraction result and is created already completed.
+        """
+        completed = data_contract_id is not None
         
-        contract = ContractModel(
-            id=contract_id,
+        return ContractModel(
+            id=str(uuid.uuid4()),
             filename=filename,
-            file_path=file_path,
+            storage_key=storage_key,
             file_size=file_size,
             content_hash=content_hash,
-            status="pending",
-            progress=0,
-            upload_date=datetime.utcnow()
+            status="completed" if completed else "pending",
+            progress=100 if completed else 0,
+            upload_date=datetime.utcnow(),
+            data_contract_id=data_contract_id,
+            batch_id=batch_id
         )
+    
+    async def create_contract(self, filename: str, storage_key: str, file_size: int, content_hash: str,
+                              data_contract_id: Optional[str] = None) -> str:
+        """Create new contract record in database."""
+        contract = self._build_contract(filename, storage_key, file_size, content_hash, data_contract_id)
         
         # Insert into database
         result = await self.contracts_collection.insert_one(contract.dict(by_alias=True))
         
-        logger.info(f"Created contract record: {contract_id}")
-        return contract_id
+        logger.info(f"Created contract record: {contract.id}")
+        return contract.id
+    
+    async def create_contracts(self, records: List[Dict[str, Any]], batch_id: str) -> List[str]:
+        """Create contract records for a batch with a single insert."""
+        contracts = [self._build_contract(batch_id=batch_id, **record) for record in records]
+        
+        await self.contracts_collection.insert_many([contract.dict(by_alias=True) for contract in contracts])
+        
+        logger.info(f"Created {len(contracts)} contract records for batch {batch_id}")
+        return [contract.id for contract in contracts]
+    
+    async def get_batch_progress(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Get aggregate processing progress for a batch."""
+        cursor = self.contracts_collection.aggregate([
+            {"$match": {"batch_id": batch_id}},
+            {"$group": {
+                "_id": "$status",
+                "count": {"$sum": 1},
+                "progress": {"$sum": "$progress"}
+            }}
+        ])
+        groups = await cursor.to_list(length=None)
+        if not groups:
+            return None
+        
+        status_counts = {group["_id"]: group["count"] for group in groups}
+        total = sum(status_counts.values())
+        finished = status_counts.get("completed", 0) + status_counts.get("failed", 0)
+        
+        return {
+            "batch_id": batch_id,
+            "total": total,
+            "status_counts": status_counts,
+            "progress": round(sum(group["progress"] for group in groups) / total, 1),
+            "finished": finished == total
+        }
     
     async def update_contract_status(self, contract_id: str, status: str, progress: int = None, error_message: str = None):
         """Update contract processing status."""
@@ -85,140 +227,383 @@ class ContractService:
             {"_id": contract_id},
             {"$set": update_data}
         )
+        contract_events.publish(status_event(contract_id, status, progress, error_message))
+        
+        logger.debug(f"Updated contract {contract_id} status to {status}")
+    
+    async def process_contract(self, contract_id: str, profile: bool = False):
+        """Process contract and extract data.
         
-        logger.info(f"Updated contract {contract_id} status to {status}")
+        The time of each stage, the parse including its wait for a pool
+        worker, is recorded in ``contract_processing_stage_seconds``. With
+        ``profile`` the run is profiled in this process and in the extraction
+        workers, and the profile is stored with the contract whether or not
+        processing succeeds.
+        """
+        if not profile:
+            return await self._process_contract(contract_id)
+        
+        collector = ProfileCollector()
+        status = "failed"
+        start = time.perf_counter()
+        try:
+            with collector.profile():
+                await self._process_contract(contract_id, collector)
+            status = "completed"
+        finally:
+            await self._save_profile(collector, "processing", time.perf_counter() - start, status, contract_id)
     
-    async def process_contract(self, contract_id: str):
-        """Process contract and extract data."""
+    async def _process_contract(self, contract_id: str, profile: Optional[ProfileCollector] = None):
+        """Run the processing stages of a contract, profiling extraction into ``profile``."""
+        reporter = ProgressReporter(self.db, contract_id)
+        timed = processing_stage_seconds.time
         try:
-            # Update status to processing
-            await self.update_contract_status(contract_id, "processing", 10)
-            
-            # Get contract record
-            contract = await self.contracts_collection.find_one({"_id": contract_id})
+            # Mark as processing and load the contract record in one round trip
+            with timed(stage="start"):
+                contract = await reporter.start(10, self.PROJECTIONS["processing"])
             if not contract:
                 raise ValueError(f"Contract {contract_id} not found")
             
-            # Read file content
-            async with aiofiles.open(contract["file_path"], 'rb') as f:
-                file_content = await f.read()
+            # Locate the file; local files are mapped by the worker instead of read here
+            with timed(stage="locate"):
+                blob = await self._stat_contract_file(contract)
+            if blob is None:
+                raise ValueError(f"File of contract {contract_id} not found")
             
             # Update progress
-            await self.update_contract_status(contract_id, "processing", 30)
+            reporter.report(30)
             
-            # Parse PDF and extract data
-            extracted_data = pdf_parser.parse_contract(file_content)
+            # Parse PDF and calculate confidence score in the extraction pool
+            if blob.path:
+                with timed(stage="parse"):
+                    extracted_data, confidence_score = await extraction_executor.parse_contract_file(blob.path, profile)
+            else:
+                with timed(stage="read"):
+                    file_content = await self.read_contract_file(contract)
+                with timed(stage="parse"):
+                    extracted_data, confidence_score = await extraction_executor.parse_contract(file_content, profile)
             
             # Update progress
-            await self.update_contract_status(contract_id, "processing", 70)
+            reporter.report(70)
             
-            # Calculate confidence score using PDF parser's method
-            confidence_score = self.pdf_parser.calculate_confidence_score(extracted_data)
-            
-            # Save extracted data
+            # Save extracted data and mark the contract completed together
             contract_data = ContractDataModel(
                 contract_id=contract_id,
+                content_hash=contract.get("content_hash"),
                 extracted_data=extracted_data,
                 confidence_score=confidence_score,
                 processing_date=datetime.utcnow()
-            )
-            
-            await self.contract_data_collection.insert_one(contract_data.dict(by_alias=True))
+            ).dict(by_alias=True)
             
-            # Update contract status to completed
-            await self.update_contract_status(contract_id, "completed", 100)
+            # Store the response body fragment so reads skip re-serialization
+            with timed(stage="serialize"):
+                contract_data["extracted_data_json"] = self._dump_json(contract_data["extracted_data"])
+            with timed(stage="store"):
+                await reporter.complete(contract_data)
             
+            contracts_processed_total.inc(status="completed")
             logger.info(f"Successfully processed contract {contract_id} with score {confidence_score}")
             
         except Exception as e:
+            # Reported by fail_contract once the queue has decided on a retry
             logger.error(f"Error processing contract {contract_id}: {e}")
-            await self.update_contract_status(contract_id, "failed", error_message=str(e))
+            progress_store.discard(contract_id)
             raise
     
-    async def get_contract_status(self, contract_id: str) -> Optional[Dict[str, Any]]:
-        """Get contract processing status."""
-        contract = await self.contracts_collection.find_one({"_id": contract_id})
+    async def fail_contract(self, contract_id: str, error_message: str, retry: bool = False):
+        """Report a failed processing attempt.
+        
+        A contract that will be retried goes back to ``pending``; only the
+        final failure is stored and published as ``failed``.
+        """
+        reporter = ProgressReporter(self.db, contract_id)
+        if retry:
+            await reporter.retry()
+        else:
+            contracts_processed_total.inc(status="failed")
+            await reporter.fail(error_message)
+    
+    async def profile_parse(self, contract_id: str) -> Optional[str]:
+        """Parse the stored file of a contract again under the profiler.
+        
+        The contract and its extraction are left unchanged; only the profile
+        is stored, also when parsing fails. Returns the profile id, or None if
+        the contract or its file does not exist.
+        """
+        contract = await self.contracts_collection.find_one({"_id": contract_id}, self.PROJECTIONS["file"])
         if not contract:
             return None
         
-        return {
-            "contract_id": contract_id,
-            "status": contract["status"],
-            "progress": contract["progress"],
-            "error_message": contract.get("error_message"),
-            "upload_date": contract["upload_date"]
-        }
+        blob = await self._stat_contract_file(contract)
+        if blob is None:
+            return None
+        
+        collector = ProfileCollector()
+        status = "failed"
+        start = time.perf_counter()
+        try:
+            with collector.profile():
+                if blob.path:
+                    await extraction_executor.parse_contract_file(blob.path, collector)
+                else:
+                    await extraction_executor.parse_contract(await self.read_contract_file(contract), collector)
+            status = "completed"
+        except ValueError as e:
+            logger.warning(f"Profiled parse of contract {contract_id} failed: {e}")
+        
+        return await self.profiles.save(
+            collector, "parse", time.perf_counter() - start, status, contract_id=contract_id
+        )
+    
+    async def _save_profile(self, collector: ProfileCollector, kind: str, duration_seconds: float,
+                            status: str, contract_id: str):
+        """Store a profile of processing, logging rather than raising if that fails."""
+        try:
+            await self.profiles.save(collector, kind, duration_seconds, status, contract_id=contract_id)
+        except Exception as e:
+            logger.error(f"Failed to store profile of contract {contract_id}: {e}")
+    
+    async def get_contract_status(self, contract_id: str, cached: bool = True) -> Optional[Dict[str, Any]]:
+        """Get contract processing status, cached for a short TTL.
+        
+        Pass ``cached=False`` for a fresh read, e.g. for the initial snapshot
+        of an event stream that must not miss later transitions.
+        """
+        status_data = await self.cache.get(status_key(contract_id)) if cached else None
+        if status_data is None:
+            contract = await self.contracts_collection.find_one({"_id": contract_id}, self.PROJECTIONS["status"])
+            if not contract:
+                return None
+            
+            status_data = {
+                "contract_id": contract_id,
+                "status": contract["status"],
+                "progress": contract["progress"],
+                "error_message": contract.get("error_message"),
+                "upload_date": contract["upload_date"]
+            }
+            await self.cache.set(status_key(contract_id), status_data, ttl=settings.status_cache_ttl)
+        
+        # Fine-grained progress of contracts being processed in this process
+        if status_data["status"] == "processing":
+            progress = progress_store.get(contract_id)
+            if progress:
+                status_data = {**status_data, "progress": progress}
+        
+        return status_data
+    
+    async def get_contract_state(self, contract_id: str) -> Optional[str]:
+        """Get only the processing status of a contract, read from an index."""
+        try:
+            contract = await self.contracts_collection.find_one(
+                {"_id": contract_id}, self.PROJECTIONS["state"], hint=self.STATE_INDEX
+            )
+        except OperationFailure:
+            # Index not built yet; fall back to the _id index
+            contract = await self.contracts_collection.find_one({"_id": contract_id}, self.PROJECTIONS["state"])
+        return contract["status"] if contract else None
+    
+    def _dump_json(self, value: Any) -> str:
+        """Serialize a value exactly as FastAPI renders JSON responses."""
+        return json.dumps(
+            jsonable_encoder(value),
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":")
+        )
     
     async def get_contract_data(self, contract_id: str) -> Optional[Dict[str, Any]]:
-        """Get extracted contract data."""
+        """Get the serialized contract data response and its ETag.
+        
+        Returns a dict with the JSON ``body`` (bytes, matching the
+        ``ContractDataResponse`` schema) and a strong ``etag``, or None if the
+        contract does not exist or has not completed. The extraction is stored
+        pre-serialized at completion, so the body is assembled by splicing
+        strings; results are cached since completed extractions are immutable.
+        """
+        cached = await self.cache.get(data_key(contract_id))
+        if cached is not None:
+            return cached
+        
         # Check if contract exists and is completed
-        contract = await self.contracts_collection.find_one({"_id": contract_id})
+        contract = await self.contracts_collection.find_one({"_id": contract_id}, self.PROJECTIONS["data_owner"])
         if not contract or contract["status"] != "completed":
             return None
         
-        # Get extracted data
-        contract_data = await self.contract_data_collection.find_one({"contract_id": contract_id})
+        # Get extracted data, which may belong to an identical earlier upload
+        data_contract_id = contract.get("data_contract_id") or contract_id
+        contract_data = await self.contract_data_collection.find_one(
+            {"contract_id": data_contract_id}, self.PROJECTIONS["data_response"]
+        )
         if not contract_data:
             return None
         
-        return {
-            "contract_id": contract_id,
-            "extracted_data": contract_data["extracted_data"],
-            "confidence_score": contract_data["confidence_score"],
-            "processing_date": contract_data["processing_date"],
-            "status": contract["status"]
+        extracted_data_json = contract_data.get("extracted_data_json")
+        if extracted_data_json is None:
+            # Extraction stored before responses were pre-serialized
+            legacy = await self.contract_data_collection.find_one(
+                {"_id": contract_data["_id"]}, self.PROJECTIONS["data_legacy"]
+            )
+            extracted_data_json = self._dump_json(legacy["extracted_data"])
+        
+        body = (
+            f'{{"contract_id":{self._dump_json(contract_id)}'
+            f',"extracted_data":{extracted_data_json}'
+            f',"confidence_score":{self._dump_json(float(contract_data["confidence_score"]))}'
+            f',"processing_date":{self._dump_json(contract_data["processing_date"])}'
+            f',"status":{self._dump_json(contract["status"])}}}'
+        ).encode("utf-8")
+        
+        # The envelope depends on the requested contract and the immutable extraction
+        etag_source = f"{contract_id}:{contract_data['_id']}"
+        result = {
+            "body": body,
+            "etag": f'"{hashlib.sha256(etag_source.encode()).hexdigest()[:32]}"'
         }
+        
+        await self.cache.set(data_key(contract_id), result)
+        return result
+    
+    def _encode_cursor(self, contract: Dict[str, Any]) -> str:
+        """Encode the sort key of the last listed contract as an opaque cursor."""
+        key = {"upload_date": contract["upload_date"].isoformat(), "contract_id": contract["contract_id"]}
+        return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
     
-    async def get_contracts_list(self, page: int = 1, page_size: int = 20, status_filter: str = None) -> Dict[str, Any]:
-        """Get paginated list of contracts."""
-        skip = (page - 1) * page_size
+    def _decode_cursor(self, cursor: str) -> tuple[datetime, str]:
+        """Decode a listing cursor into its (upload_date, contract_id) sort key."""
+        try:
+            key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return datetime.fromisoformat(key["upload_date"]), key["contract_id"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise InvalidCursorError("Invalid pagination cursor") from e
+    
+    async def get_contracts_list(self, page: int = 1, page_size: int = 20, status_filter: str = None,
+                                 cursor: Optional[str] = None, include_total: bool = True) -> Dict[str, Any]:
+        """Get paginated list of contracts.
         
+        Pages are addressed either by ``page`` number (offset pagination, for
+        shallow pages) or by the ``cursor`` returned as ``next_cursor`` from the
+        previous page (keyset pagination on ``(upload_date, _id)``, constant
+        cost at any depth). The total is estimated from collection metadata
+        when unfiltered, counted exactly for filtered offset pages, and omitted
+        for filtered cursor pages or when ``include_total`` is False.
+        """
         # Build query filter
         query = {}
         if status_filter:
             query["status"] = status_filter
         
-        # Get total count
-        total = await self.contracts_collection.count_documents(query)
+        if cursor:
+            upload_date, contract_id = self._decode_cursor(cursor)
+            query["$or"] = [
+                {"upload_date": {"$lt": upload_date}},
+                {"upload_date": upload_date, "_id": {"$lt": contract_id}}
+            ]
+            skip = 0
+        else:
+            skip = (page - 1) * page_size
+            if skip > settings.max_page_offset:
+                # Still served, but the skip scans every contract before the page
+                logger.warning(
+                    f"Listing page {page} skips {skip} contracts, beyond {settings.max_page_offset}; "
+                    f"cursor pagination serves deep pages at constant cost"
+                )
         
-        # Get contracts with pagination
-        cursor = self.contracts_collection.find(query).sort("upload_date", -1).skip(skip).limit(page_size)
-        contracts = await cursor.to_list(length=page_size)
+        # Fetch one extra contract to know whether another page follows
+        page_stages = [
+            {"$skip": skip},
+            {"$limit": page_size + 1},
+            # Pull only the score, from the contract that owns the extraction
+            {"$lookup": {
+                "from": "contract_data",
+                "let": {
+                    "data_contract_id": {"$ifNull": ["$data_contract_id", "$_id"]},
+                    "status": "$status"
+                },
+                "pipeline": [
+                    {"$match": {"$expr": {"$and": [
+                        {"$eq": ["$$status", "completed"]},
+                        {"$eq": ["$contract_id", "$$data_contract_id"]}
+                    ]}}},
+                    {"$limit": 1},
+                    {"$project": self.PROJECTIONS["list_score"]}
+                ],
+                "as": "contract_data"
+            }},
+            {"$project": self.PROJECTIONS["list"]}
+        ]
+        pipeline = [
+            {"$match": query},
+            {"$sort": {"upload_date": -1, "_id": -1}}
+        ]
         
-        # Get confidence scores for completed contracts
-        contract_list = []
-        for contract in contracts:
-            contract_item = {
-                "contract_id": contract["_id"],
-                "filename": contract["filename"],
-                "status": contract["status"],
-                "upload_date": contract["upload_date"],
-                "file_size": contract["file_size"],
-                "confidence_score": None
-            }
-            
-            # Add confidence score if available
-            if contract["status"] == "completed":
-                contract_data = await self.contract_data_collection.find_one({"contract_id": contract["_id"]})
-                if contract_data:
-                    contract_item["confidence_score"] = contract_data["confidence_score"]
-            
-            contract_list.append(contract_item)
+        # An exact count is only paid for filtered offset listings
+        total = None
+        if include_total and status_filter and not cursor:
+            # Count and page in a single round trip
+            pipeline.append({"$facet": {"total": [{"$count": "count"}], "contracts": page_stages}})
+            result = (await self.contracts_collection.aggregate(pipeline).to_list(length=1))[0]
+            total = result["total"][0]["count"] if result["total"] else 0
+            contract_list = result["contracts"]
+        else:
+            contract_list = await self.contracts_collection.aggregate(pipeline + page_stages).to_list(length=page_size + 1)
+            if include_total and not status_filter:
+                total = await self.contracts_collection.estimated_document_count()
         
-        total_pages = (total + page_size - 1) // page_size
+        next_cursor = None
+        if len(contract_list) > page_size:
+            contract_list = contract_list[:page_size]
+            next_cursor = self._encode_cursor(contract_list[-1])
         
         return {
             "contracts": contract_list,
             "total": total,
-            "page": page,
+            "page": None if cursor else page,
             "page_size": page_size,
-            "total_pages": total_pages
+            "total_pages": (total + page_size - 1) // page_size if total is not None else None,
+            "next_cursor": next_cursor
         }
     
-    async def get_contract_file_path(self, contract_id: str) -> Optional[str]:
-        """Get contract file path for download."""
-        contract = await self.contracts_collection.find_one({"_id": contract_id})
+    async def get_contract_file(self, contract_id: str) -> Optional[Dict[str, Any]]:
+        """Locate the stored file of a contract with a single projected read.
+        
+        Returns the file's metadata, original filename and content hash, or
+        None if the contract or its file does not exist.
+        """
+        contract = await self.contracts_collection.find_one({"_id": contract_id}, self.PROJECTIONS["file"])
         if not contract:
             return None
         
-        return contract["file_path"]
+        blob = await self._stat_contract_file(contract)
+        if blob is None:
+            return None
+        
+        return {
+            "blob": blob,
+            "storage_key": contract.get("storage_key"),
+            "filename": contract["filename"],
+            "content_hash": contract.get("content_hash")
+        }
+    
+    async def _stat_contract_file(self, contract: Dict[str, Any]) -> Optional[StoredBlob]:
+        """Metadata of a contract's file, from storage or its legacy upload path."""
+        if contract.get("storage_key"):
+            return await self.storage.stat(contract["storage_key"])
+        
+        file_path = contract.get("file_path")
+        if not file_path:
+            return None
+        try:
+            stat_result = await asyncio.to_thread(os.stat, file_path)
+        except FileNotFoundError:
+            return None
+        return StoredBlob(key=file_path, size=stat_result.st_size, modified=stat_result.st_mtime, path=file_path)
+    
+    async def read_contract_file(self, contract: Dict[str, Any]) -> bytes:
+        """Read a contract's file, from storage or its legacy upload path."""
+        if contract.get("storage_key"):
+            return await self.storage.read(contract["storage_key"])
+        
+        async with aiofiles.open(contract["file_path"], 'rb') as f:
+            return await f.read()
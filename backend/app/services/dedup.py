@@ -0,0 +1,66 @@
+"""Content-hash deduplication of contract extractions."""
+
+import logging
+from typing import Optional, Dict, Any
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DedupStats:
+    """Counters for deduplication lookups in this process."""
+
+    def __init__(self):
+        """Initialize counters at zero."""
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that reused an existing extraction."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return counters as a serializable dict."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4)
+        }
+
+
+dedup_stats = DedupStats()
+
+
+class DedupIndex:
+    """Finds completed contracts whose extraction can be reused for an upload."""
+
+    def __init__(self, database: AsyncIOMotorDatabase):
+        """Initialize dedup index with database connection."""
+        self.contracts_collection = database.contracts
+
+    async def find_completed(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Find a completed contract with the same content hash.
+
+        Returns the source contract id and the contract id that owns the
+        extraction result.
+        """
+        if not settings.dedup_enabled:
+            return None
+
+        source = await self.contracts_collection.find_one(
+            {"content_hash": content_hash, "status": "completed"},
+            {"_id": 1, "data_contract_id": 1}
+        )
+
+        if not source:
+            dedup_stats.misses += 1
+            return None
+
+        dedup_stats.hits += 1
+        return {
+            "contract_id": source["_id"],
+            "data_contract_id": source.get("data_contract_id") or source["_id"]
+        }
@@ -0,0 +1,194 @@
+"""Publish/subscribe of contract status events.
+
+``ContractService.update_contract_status`` publishes every status transition
+to the process-wide ``contract_events`` broker, which fans it out to the SSE
+and WebSocket subscribers of this API process. Jobs are claimed from a shared
+queue, so a contract uploaded here may be processed by a standalone worker or
+by the embedded worker of another API replica; the ``ChangeStreamFeeder``
+watches the contracts collection and republishes every change into the local
+broker. While it is watching, subscribers receive transitions only from the
+change stream, in the order they were written, and transitions made in this
+process reach just the broker's listeners directly.
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, Set, Iterable, AsyncIterator, Callable, List
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def status_event(contract_id: str, status: str, progress: Optional[int] = None,
+                 error_message: Optional[str] = None) -> Dict[str, Any]:
+    """Build the payload pushed to subscribers for a status transition."""
+    return {
+        "contract_id": contract_id,
+        "status": status,
+        "progress": progress,
+        "error_message": error_message
+    }
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode a payload as a server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class Subscription:
+    """A subscriber's queue of events for a set of contracts."""
+
+    def __init__(self, broker: "EventBroker", max_queued: int):
+        """Initialize an empty subscription."""
+        self._broker = broker
+        self.contract_ids: Set[str] = set()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+
+    def add(self, contract_ids: Iterable[str]):
+        """Start receiving events for the given contracts."""
+        for contract_id in contract_ids:
+            if contract_id not in self.contract_ids:
+                self.contract_ids.add(contract_id)
+                self._broker._subscribers.setdefault(contract_id, set()).add(self)
+
+    def remove(self, contract_ids: Iterable[str]):
+        """Stop receiving events for the given contracts."""
+        for contract_id in contract_ids:
+            if contract_id in self.contract_ids:
+                self.contract_ids.discard(contract_id)
+                subscribers = self._broker._subscribers.get(contract_id)
+                if subscribers is not None:
+                    subscribers.discard(self)
+                    if not subscribers:
+                        del self._broker._subscribers[contract_id]
+
+    def close(self):
+        """Unsubscribe from every contract."""
+        self.remove(list(self.contract_ids))
+
+    def deliver(self, event: Dict[str, Any]):
+        """Queue an event, dropping the oldest one if the subscriber lags behind."""
+        if self.queue.full():
+            # Only the latest state matters to a status display
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Wait for the next event. Returns None if the timeout elapses first."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBroker:
+    """In-process fan-out of contract status events to subscribers."""
+
+    def __init__(self, max_queued: int = 100):
+        """Initialize broker with no subscribers."""
+        self.max_queued = max_queued
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        # Whether every status transition reaches this broker, which is only
+        # known while a change stream is followed; when not, subscribers must
+        # re-read the status themselves
+        self.live = False
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of (contract, subscriber) pairs currently registered."""
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """Call ``listener`` synchronously with every published event."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """Stop calling a previously added listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def publish(self, event: Dict[str, Any], followed: bool = False):
+        """Deliver an event to every listener and subscriber of its contract.
+
+        ``followed`` marks events read from the change stream. While the
+        broker is live those are the only ones subscribers receive, so a
+        transition made in this process is not delivered twice, or out of
+        order with the stream's copy of it.
+        """
+        for listener in list(self._listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logger.error(f"Event listener failed: {e}")
+        if self.live and not followed:
+            return
+        for subscription in list(self._subscribers.get(event["contract_id"], ())):
+            subscription.deliver(event)
+
+    def open(self, contract_ids: Iterable[str] = ()) -> Subscription:
+        """Open a subscription; the caller must ``close`` it."""
+        subscription = Subscription(self, self.max_queued)
+        subscription.add(contract_ids)
+        return subscription
+
+    @asynccontextmanager
+    async def subscribe(self, contract_ids: Iterable[str] = ()) -> AsyncIterator[Subscription]:
+        """Open a subscription that is closed when the context exits."""
+        subscription = self.open(contract_ids)
+        try:
+            yield subscription
+        finally:
+            subscription.close()
+
+
+contract_events = EventBroker()
+
+
+class ChangeStreamFeeder:
+    """Republishes contract status changes made by any process.
+
+    Requires MongoDB to run as a replica set; on a standalone server the
+    feeder logs a warning and stops, leaving the broker marked as not live so
+    that subscribers fall back to polling the status.
+    """
+
+    def __init__(self, database: AsyncIOMotorDatabase, broker: EventBroker):
+        """Initialize feeder with database connection and target broker."""
+        self.contracts_collection = database.contracts
+        self.broker = broker
+
+    async def run(self):
+        """Watch the contracts collection until cancelled."""
+        pipeline = [{"$match": {
+            "operationType": "update",
+            "updateDescription.updatedFields.status": {"$exists": True}
+        }}]
+        resume_token = None
+
+        while True:
+            try:
+                async with self.contracts_collection.watch(pipeline, resume_after=resume_token) as stream:
+                    logger.info("Watching contract status changes")
+                    self.broker.live = True
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        fields = change["updateDescription"]["updatedFields"]
+                        self.broker.publish(status_event(
+                            change["documentKey"]["_id"],
+                            fields["status"],
+                            fields.get("progress"),
+                            fields.get("error_message")
+                        ), followed=True)
+            except PyMongoError as e:
+                self.broker.live = False
+                if getattr(e, "code", None) == 40573:
+                    logger.warning("Change streams are unavailable (MongoDB is not a replica set)")
+                    return
+                logger.error(f"Contract change stream failed, retrying: {e}")
+                await asyncio.sleep(1)
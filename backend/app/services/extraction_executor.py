@@ -0,0 +1,245 @@
+"""Process pool executor that runs PDF extraction off the event loop."""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Tuple, Dict, Any, List
+from app.config import settings
+from app.models import ExtractedData
+from app.utils.memory import peak_rss, reset_peak_rss
+from app.utils.metrics import StageTimings, parse_stage_seconds, parses_in_flight, pattern_seconds_total
+from app.utils.profiling import ProfileCollector, run_profiled
+
+logger = logging.getLogger(__name__)
+
+# Parser owned by each worker process, created once by the pool initializer
+_worker_parser = None
+
+
+def _initialize_worker():
+    """Bind the process-wide parser, importing (and compiling patterns) once per worker."""
+    global _worker_parser
+    from app.utils.pdf_parser import pdf_parser
+    _worker_parser = pdf_parser
+
+
+@dataclass
+class WorkerResult:
+    """Outcome of a task in an extraction worker.
+
+    Holds either the parsed contract or, when the document has more pages
+    than one task covers, the page count and the texts of the pages done.
+    ``timings`` holds the seconds spent in each parsing stage of the task and
+    ``pattern_timings`` in each regex pattern, and ``profile`` its raw
+    cProfile statistics when it was profiled.
+    """
+
+    peak_rss: int
+    extracted_data: Optional[ExtractedData] = None
+    confidence_score: Optional[int] = None
+    page_count: int = 0
+    page_texts: List[str] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    pattern_timings: Dict[str, float] = field(default_factory=dict)
+    profile: Optional[Dict[Tuple, Any]] = None
+
+
+def _parsed(extracted_data: ExtractedData, timings: StageTimings) -> WorkerResult:
+    """Score a parsed contract and capture the worker's peak RSS since the task began."""
+    with timings.stage("confidence_score"):
+        confidence_score = _worker_parser.calculate_confidence_score(extracted_data)
+    return WorkerResult(
+        peak_rss(), extracted_data, confidence_score, timings=timings.seconds, pattern_timings=timings.patterns
+    )
+
+
+def _parse_contract(file_content: bytes) -> WorkerResult:
+    """Parse a contract inside a worker process and score the result."""
+    reset_peak_rss()
+    timings = StageTimings()
+    return _parsed(_worker_parser.parse_contract(file_content, timings), timings)
+
+
+def _extract_pages(file_path: str, start: int, stop: Optional[int],
+                   timings: StageTimings) -> Tuple[int, List[str]]:
+    """Extract a page slice of a stored PDF through a memory map.
+
+    Only the path crosses the process boundary, and the file is never copied
+    into a bytes object; the PDF reader pages it in from the map on demand.
+    """
+    from app.utils.pdf_parser import map_pdf
+
+    try:
+        with timings.stage("extract_text"), map_pdf(file_path) as pdf_content:
+            return _worker_parser.extract_page_texts(pdf_content, start, stop)
+    except ValueError as e:
+        raise ValueError(f"Failed to parse contract: {e}")
+
+
+def _parse_contract_file(file_path: str, pages_per_task: Optional[int]) -> WorkerResult:
+    """Parse a stored contract inside a worker process.
+
+    Documents longer than ``pages_per_task`` are not parsed here: the texts
+    of their first pages are returned with the page count so the caller can
+    spread the remaining pages over the pool.
+    """
+    reset_peak_rss()
+    timings = StageTimings()
+    page_count, page_texts = _extract_pages(file_path, 0, pages_per_task, timings)
+    if len(page_texts) < page_count:
+        return WorkerResult(peak_rss(), page_count=page_count, page_texts=page_texts, timings=timings.seconds)
+
+    text = _worker_parser.join_page_texts(page_texts)
+    return _parsed(_worker_parser.parse_contract_text(text, timings), timings)
+
+
+def _extract_file_pages(file_path: str, start: int, stop: int) -> WorkerResult:
+    """Extract the texts of a page slice of a stored contract."""
+    reset_peak_rss()
+    timings = StageTimings()
+    page_count, page_texts = _extract_pages(file_path, start, stop, timings)
+    return WorkerResult(peak_rss(), page_count=page_count, page_texts=page_texts, timings=timings.seconds)
+
+
+def _parse_contract_pages(page_texts: List[str]) -> WorkerResult:
+    """Extract fields from the page texts of a whole contract, in order, and score the result."""
+    reset_peak_rss()
+    timings = StageTimings()
+    text = _worker_parser.join_page_texts(page_texts)
+    return _parsed(_worker_parser.parse_contract_text(text, timings), timings)
+
+
+def _profiled(function, *args) -> WorkerResult:
+    """Run a worker task under cProfile and attach the statistics to its result."""
+    result, stats = run_profiled(function, *args)
+    result.profile = stats
+    return result
+
+
+class ExtractionExecutor:
+    """Runs CPU-bound contract parsing in a dedicated process pool."""
+
+    def __init__(self, max_workers: int):
+        """Initialize executor with the number of worker processes."""
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Highest worker RSS observed during a parse, and the latest one
+        self.peak_rss = 0
+        self.last_peak_rss = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether the process pool has been started."""
+        return self._pool is not None
+
+    def start(self):
+        """Start the worker process pool."""
+        if self._pool is not None:
+            return
+
+        # Spawned workers do not inherit the event loop or Mongo client threads
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker
+        )
+        logger.info(f"Started extraction pool with {self.max_workers} workers")
+
+    async def shutdown(self):
+        """Stop the pool after in-flight extractions have finished."""
+        if self._pool is None:
+            return
+
+        pool, self._pool = self._pool, None
+        await asyncio.to_thread(pool.shutdown, wait=True)
+        logger.info("Extraction pool shut down")
+
+    def stats(self) -> Dict[str, Any]:
+        """Worker count and peak worker memory observed while parsing."""
+        return {
+            "workers": self.max_workers,
+            "peak_rss_bytes": self.peak_rss,
+            "last_peak_rss_bytes": self.last_peak_rss
+        }
+
+    async def _run(self, function, *args, profile: Optional[ProfileCollector] = None) -> WorkerResult:
+        """Run a task in the pool and record the worker's peak memory.
+
+        With a ``profile`` collector the task runs under cProfile in the
+        worker and its statistics are merged into the collector.
+        """
+        if self._pool is None:
+            self.start()
+
+        loop = asyncio.get_running_loop()
+        if profile is None:
+            result = await loop.run_in_executor(self._pool, function, *args)
+        else:
+            result = await loop.run_in_executor(self._pool, _profiled, function, *args)
+            profile.add(result.profile)
+        self.last_peak_rss = result.peak_rss
+        self.peak_rss = max(self.peak_rss, result.peak_rss)
+        logger.debug(f"Extraction worker peak RSS {result.peak_rss / 2**20:.1f} MiB")
+        return result
+
+    def _observe(self, timings: Dict[str, float], pattern_timings: Dict[str, float]):
+        """Record the stage timings of a parse, summed over the tasks it took, and its pattern timings."""
+        for stage, seconds in timings.items():
+            parse_stage_seconds.observe(seconds, stage=stage)
+        pattern_seconds_total.inc_each(pattern_timings)
+
+    async def parse_contract(self, file_content: bytes,
+                             profile: Optional[ProfileCollector] = None) -> Tuple[ExtractedData, int]:
+        """Parse contract PDF in the pool and return extracted data with its score."""
+        with parses_in_flight.track():
+            result = await self._run(_parse_contract, file_content, profile=profile)
+
+        self._observe(result.timings, result.pattern_timings)
+        return result.extracted_data, result.confidence_score
+
+    async def parse_contract_file(self, file_path: str,
+                                  profile: Optional[ProfileCollector] = None) -> Tuple[ExtractedData, int]:
+        """Parse a contract PDF stored at a local path, memory-mapped in the workers.
+
+        With parallel extraction enabled and more than one worker, documents
+        longer than ``EXTRACTION_PAGES_PER_TASK`` pages have their page range
+        split into slices extracted concurrently, each worker mapping the
+        file on its own. Shorter documents, single pages included, are parsed
+        by a single task. With a ``profile`` collector every task is profiled.
+        """
+        with parses_in_flight.track():
+            result, timings = await self._parse_contract_file(file_path, profile)
+
+        self._observe(timings.seconds, result.pattern_timings)
+        return result.extracted_data, result.confidence_score
+
+    async def _parse_contract_file(self, file_path: str,
+                                   profile: Optional[ProfileCollector]) -> Tuple[WorkerResult, StageTimings]:
+        """Run the tasks parsing a stored contract and collect their stage timings."""
+        pages_per_task = settings.extraction_pages_per_task
+        if not settings.parallel_extraction or self.max_workers < 2:
+            pages_per_task = None
+
+        timings = StageTimings()
+        result = await self._run(_parse_contract_file, file_path, pages_per_task, profile=profile)
+        timings.merge(result.timings)
+        if result.extracted_data is not None:
+            return result, timings
+
+        slices = await asyncio.gather(*(
+            self._run(_extract_file_pages, file_path, start, start + pages_per_task, profile=profile)
+            for start in range(pages_per_task, result.page_count, pages_per_task)
+        ))
+        page_texts = result.page_texts + [page_text for page_slice in slices for page_text in page_slice.page_texts]
+        logger.debug(f"Extracted {len(page_texts)} pages in {len(slices) + 1} tasks")
+        for page_slice in slices:
+            timings.merge(page_slice.timings)
+
+        result = await self._run(_parse_contract_pages, page_texts, profile=profile)
+        timings.merge(result.timings)
+        return result, timings
+
+
+extraction_executor = ExtractionExecutor(max_workers=settings.extraction_workers)
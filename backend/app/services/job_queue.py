@@ -0,0 +1,267 @@
+"""MongoDB-backed job queue for contract processing."""
+
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from app.config import settings
+from app.services.events import contract_events, status_event
+
+logger = logging.getLogger(__name__)
+
+# Server error code for a unique index violation
+DUPLICATE_KEY = 11000
+
+# Job states a contract may have at most one job in, enforced by a unique index
+ACTIVE_STATUSES = ["queued", "running"]
+
+
+class JobQueue:
+    """Persistent queue of processing jobs with leases and retries.
+
+    Jobs move through ``queued`` -> ``running`` -> ``completed``/``failed``.
+    A running job holds a lease that its worker extends with heartbeats; jobs
+    whose lease expires are returned to the queue so another worker can pick
+    them up. A contract has at most one queued or running job: enqueueing a
+    contract that already has one returns the existing job.
+    """
+
+    def __init__(self, database: AsyncIOMotorDatabase):
+        """Initialize job queue with database connection."""
+        self.db = database
+        self.jobs_collection = database.jobs
+        self.contracts_collection = database.contracts
+
+    def _new_job(self, contract_id: str, now: datetime, profile: bool = False) -> Dict[str, Any]:
+        """Build a queued job document for a contract, optionally to be run under the profiler."""
+        return {
+            "_id": str(uuid.uuid4()),
+            "contract_id": contract_id,
+            "status": "queued",
+            "attempts": 0,
+            "max_attempts": settings.job_max_attempts,
+            "available_at": now,
+            "lease_expires_at": None,
+            "heartbeat_at": None,
+            "worker_id": None,
+            "last_error": None,
+            "profile": profile,
+            "created_at": now,
+            "updated_at": now
+        }
+
+    async def enqueue(self, contract_id: str, profile: bool = False) -> str:
+        """Add a processing job for a contract and return the job id.
+
+        With ``profile`` the worker runs the job under the profiler and stores
+        the profile with the contract.
+        """
+        job = self._new_job(contract_id, datetime.utcnow(), profile)
+        try:
+            await self.jobs_collection.insert_one(job)
+        except DuplicateKeyError:
+            # Already queued, e.g. by orphan recovery racing the upload
+            existing = await self.jobs_collection.find_one(
+                {"contract_id": contract_id, "status": {"$in": ACTIVE_STATUSES}}, {"_id": 1}
+            )
+            if existing:
+                logger.info(f"Contract {contract_id} already has job {existing['_id']}")
+                return existing["_id"]
+            raise
+
+        logger.info(f"Enqueued job {job['_id']} for contract {contract_id}")
+        return job["_id"]
+
+    async def enqueue_many(self, contract_ids: List[str], profile: bool = False) -> List[str]:
+        """Add processing jobs for several contracts with a single insert.
+
+        Contracts that already have a queued or running job are skipped;
+        returns the ids of the jobs added.
+        """
+        if not contract_ids:
+            return []
+
+        now = datetime.utcnow()
+        jobs = [self._new_job(contract_id, now, profile) for contract_id in contract_ids]
+        try:
+            await self.jobs_collection.insert_many(jobs, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details["writeErrors"]
+            if any(error["code"] != DUPLICATE_KEY for error in errors):
+                raise
+            skipped = {error["index"] for error in errors}
+            jobs = [job for i, job in enumerate(jobs) if i not in skipped]
+            logger.info(f"Skipped {len(skipped)} contracts that are already queued")
+
+        logger.info(f"Enqueued {len(jobs)} jobs")
+        return [job["_id"] for job in jobs]
+
+    async def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Atomically claim the oldest available job for a worker."""
+        now = datetime.utcnow()
+
+        return await self.jobs_collection.find_one_and_update(
+            {"status": "queued", "available_at": {"$lte": now}},
+            {
+                "$set": {
+                    "status": "running",
+                    "worker_id": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=settings.job_lease_seconds),
+                    "heartbeat_at": now,
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("available_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """Extend the lease of a running job. Returns False if the lease was lost."""
+        now = datetime.utcnow()
+
+        result = await self.jobs_collection.update_one(
+            {"_id": job_id, "status": "running", "worker_id": worker_id},
+            {"$set": {
+                "lease_expires_at": now + timedelta(seconds=settings.job_lease_seconds),
+                "heartbeat_at": now,
+                "updated_at": now
+            }}
+        )
+        return result.modified_count == 1
+
+    async def complete(self, job_id: str, worker_id: str):
+        """Mark a running job as completed."""
+        await self.jobs_collection.update_one(
+            {"_id": job_id, "worker_id": worker_id},
+            {"$set": {
+                "status": "completed",
+                "lease_expires_at": None,
+                "updated_at": datetime.utcnow()
+            }}
+        )
+
+    async def fail(self, job_id: str, worker_id: str, error_message: str) -> Optional[bool]:
+        """Record a job failure.
+
+        Returns True if the job was requeued for retry, False if it failed for
+        good, and None if the worker no longer holds the job, e.g. because its
+        lease expired and another worker took it over.
+        """
+        job = await self.jobs_collection.find_one(
+            {"_id": job_id, "status": "running", "worker_id": worker_id}
+        )
+        if not job:
+            return None
+
+        now = datetime.utcnow()
+        retry = job["attempts"] < job["max_attempts"]
+        update_data = {
+            "status": "queued" if retry else "failed",
+            "worker_id": None,
+            "lease_expires_at": None,
+            "last_error": error_message,
+            "updated_at": now
+        }
+        if retry:
+            # Back off linearly with the number of attempts so far
+            update_data["available_at"] = now + timedelta(seconds=settings.job_retry_delay_seconds * job["attempts"])
+
+        result = await self.jobs_collection.update_one(
+            {"_id": job_id, "status": "running", "worker_id": worker_id},
+            {"$set": update_data}
+        )
+        if result.modified_count == 0:
+            return None
+
+        logger.warning(f"Job {job_id} failed (attempt {job['attempts']}/{job['max_attempts']}): {error_message}")
+        return retry
+
+    async def reclaim_expired(self) -> int:
+        """Requeue running jobs whose lease has expired. Returns the number reclaimed.
+
+        Workers run this periodically, so the jobs of a worker that died are
+        picked up by the others. Updates are conditional on the expired lease,
+        so concurrent reclaims by several workers are safe.
+        """
+        now = datetime.utcnow()
+        reclaimed = 0
+
+        cursor = self.jobs_collection.find({"status": "running", "lease_expires_at": {"$lt": now}})
+        async for job in cursor:
+            retry = job["attempts"] < job["max_attempts"]
+            if retry:
+                update_data = {"status": "queued", "available_at": now}
+            else:
+                update_data = {"status": "failed", "last_error": "Lease expired on final attempt"}
+
+            update_data.update({"worker_id": None, "lease_expires_at": None, "updated_at": now})
+            result = await self.jobs_collection.update_one(
+                {"_id": job["_id"], "status": "running", "lease_expires_at": job["lease_expires_at"]},
+                {"$set": update_data}
+            )
+            if not result.modified_count:
+                # The worker heartbeated or finished in the meantime
+                continue
+
+            if retry:
+                # Show the contract as waiting again rather than stuck processing
+                await self.contracts_collection.update_one(
+                    {"_id": job["contract_id"]},
+                    {"$set": {"status": "pending", "progress": 0}}
+                )
+                contract_events.publish(status_event(job["contract_id"], "pending", 0))
+            else:
+                error_message = "Processing worker stopped responding"
+                await self.contracts_collection.update_one(
+                    {"_id": job["contract_id"]},
+                    {"$set": {"status": "failed", "error_message": error_message}}
+                )
+                contract_events.publish(status_event(job["contract_id"], "failed", error_message=error_message))
+            reclaimed += 1
+
+        if reclaimed:
+            logger.info(f"Reclaimed {reclaimed} jobs with expired leases")
+        return reclaimed
+
+    async def recover_orphaned_contracts(self) -> int:
+        """Enqueue pending/processing contracts that have no active job.
+
+        The unique index on active jobs makes this safe to run while uploads
+        are being enqueued: a contract queued in the meantime is skipped.
+        """
+        now = datetime.utcnow()
+        recovered = 0
+
+        cursor = self.contracts_collection.find(
+            {"status": {"$in": ["pending", "processing"]}},
+            {"_id": 1}
+        )
+        async for contract in cursor:
+            job = self._new_job(contract["_id"], now)
+            del job["contract_id"]
+            try:
+                result = await self.jobs_collection.update_one(
+                    {"contract_id": contract["_id"], "status": {"$in": ACTIVE_STATUSES}},
+                    {"$setOnInsert": job},
+                    upsert=True
+                )
+            except DuplicateKeyError:
+                # Enqueued concurrently, e.g. by the upload that created it
+                continue
+            if result.upserted_id is not None:
+                recovered += 1
+
+        if recovered:
+            logger.info(f"Enqueued {recovered} orphaned contracts")
+        return recovered
+
+    async def depth(self) -> Dict[str, int]:
+        """Number of queued and running jobs, counted on the status indexes."""
+        return {
+            status: await self.jobs_collection.count_documents({"status": status})
+            for status in ("queued", "running")
+        }
@@ -0,0 +1,139 @@
+"""MongoDB storage of profiles taken with the opt-in profiling hook.
+
+Profiles are kept in the ``profiles`` collection next to the contracts they
+belong to, with the raw statistics in the ``.prof`` format and a text summary
+by cumulative time. A TTL index removes them after
+``PROFILE_RETENTION_SECONDS``.
+"""
+
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+from bson import Binary
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils.profiling import ProfileCollector, PROFILE_ID_HEADER, profiling_requested
+
+logger = logging.getLogger(__name__)
+
+# Fields returned when listing profiles, without the statistics themselves
+INFO_PROJECTION = {"stats": 0, "summary": 0}
+
+# Endpoints serving stored profiles, which are never profiled themselves
+ADMIN_PATH_PREFIX = "/admin/"
+
+# Server-sent event streams, which stay open for as long as a client listens
+STREAMING_PATH_SUFFIXES = ("/events",)
+
+
+class ProfileStore:
+    """Saves and loads stored profiles."""
+
+    def __init__(self, database: AsyncIOMotorDatabase):
+        """Initialize profile store with database connection."""
+        self.profiles_collection = database.profiles
+
+    async def save(self, collector: ProfileCollector, kind: str, duration_seconds: float,
+                   status: str = "completed", contract_id: Optional[str] = None,
+                   method: Optional[str] = None, path: Optional[str] = None,
+                   profile_id: Optional[str] = None) -> str:
+        """Store a finished profile and return its id."""
+        stats = collector.dump()
+        profile = {
+            "_id": profile_id or str(uuid.uuid4()),
+            "kind": kind,
+            "contract_id": contract_id,
+            "method": method,
+            "path": path,
+            "status": status,
+            "duration_seconds": round(duration_seconds, 6),
+            "size": len(stats),
+            "created_at": datetime.utcnow(),
+            "stats": Binary(stats),
+            "summary": collector.summary()
+        }
+        await self.profiles_collection.insert_one(profile)
+
+        logger.info(f"Stored {kind} profile {profile['_id']} ({len(stats)} bytes)"
+                    + (f" for contract {contract_id}" if contract_id else ""))
+        return profile["_id"]
+
+    async def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """Return a stored profile with its statistics and summary."""
+        return await self.profiles_collection.find_one({"_id": profile_id})
+
+    async def list_for_contract(self, contract_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """Return metadata of the profiles of a contract, newest first."""
+        cursor = self.profiles_collection.find({"contract_id": contract_id}, INFO_PROJECTION)
+        return await cursor.sort("created_at", -1).to_list(length=limit)
+
+
+def profile_info(profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Public metadata of a stored profile."""
+    info = {key: value for key, value in profile.items() if key not in ("_id", "stats", "summary")}
+    return {"profile_id": profile["_id"], **info}
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling HTTP requests that ask for it.
+
+    A request carrying an allowlisted token is profiled until its response has
+    been sent, and the profile is stored as kind ``request`` under the id
+    returned in the ``X-Profile-Id`` header. Requests without a token pass
+    straight through, as do requests arriving while another profile runs.
+    Event streams and websockets are never profiled: they stay open for as
+    long as the client listens, and cProfile would record everything the
+    event loop runs in the meantime.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """Wrap an ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Run the request, under the profiler if it asks for it."""
+        if (scope["type"] != "http" or scope["path"].startswith(ADMIN_PATH_PREFIX)
+                or scope["path"].endswith(STREAMING_PATH_SUFFIXES)
+                or not profiling_requested(HTTPConnection(scope))):
+            await self.app(scope, receive, send)
+            return
+
+        collector = ProfileCollector()
+        profile_id = str(uuid.uuid4())
+        response_status = None
+
+        async def send_with_profile_id(message: Message):
+            nonlocal response_status
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+                if not collector.busy:
+                    MutableHeaders(scope=message).append(PROFILE_ID_HEADER, profile_id)
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            with collector.profile():
+                await self.app(scope, receive, send_with_profile_id)
+        finally:
+            if not collector.busy:
+                await self._save(scope, collector, profile_id, time.perf_counter() - start, response_status)
+
+    async def _save(self, scope: Scope, collector: ProfileCollector, profile_id: str,
+                    duration_seconds: float, response_status: Optional[int]):
+        """Store the profile of a request, logging rather than raising if that fails."""
+        failed = response_status is None or response_status >= 500
+        try:
+            await scope["app"].state.services.profile_store.save(
+                collector, "request", duration_seconds,
+                status="failed" if failed else "completed",
+                contract_id=scope.get("path_params", {}).get("contract_id"),
+                method=scope["method"],
+                path=scope["path"],
+                profile_id=profile_id
+            )
+        except Exception as e:
+            logger.error(f"Failed to store profile of {scope['method']} {scope['path']}: {e}")
@@ -0,0 +1,162 @@
+"""Progress reporting for contract processing with coalesced writes."""
+
+import logging
+from typing import Optional, Dict, Any
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from app.services.events import EventBroker, contract_events, status_event
+
+logger = logging.getLogger(__name__)
+
+# Server error code for transactions on a standalone MongoDB
+ILLEGAL_OPERATION = 20
+
+
+class ProgressStore:
+    """In-memory progress of contracts being processed in this process."""
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._progress: Dict[str, int] = {}
+
+    def set(self, contract_id: str, progress: int):
+        """Record the latest progress of a contract."""
+        self._progress[contract_id] = progress
+
+    def get(self, contract_id: str) -> Optional[int]:
+        """Latest in-memory progress of a contract, if it is being processed here."""
+        return self._progress.get(contract_id)
+
+    def discard(self, contract_id: str):
+        """Forget a contract once its final state is persisted."""
+        self._progress.pop(contract_id, None)
+
+
+progress_store = ProgressStore()
+
+
+class ProgressReporter:
+    """Tracks processing progress of one contract.
+
+    Only state transitions are written to MongoDB: entering ``processing``,
+    returning to ``pending`` for a retry, and the final ``completed`` or
+    ``failed`` state. Intermediate progress is kept in the ``ProgressStore``
+    and pushed to status subscribers. The
+    extraction result and the ``completed`` flip are written in a single
+    transaction when the server supports it.
+    """
+
+    # Whether the server supports transactions; None until first attempt
+    _transactions_supported: Optional[bool] = None
+
+    def __init__(self, database: AsyncIOMotorDatabase, contract_id: str,
+                 store: ProgressStore = progress_store, broker: EventBroker = contract_events):
+        """Initialize reporter for a contract."""
+        self.db = database
+        self.contracts_collection = database.contracts
+        self.contract_data_collection = database.contract_data
+        self.contract_id = contract_id
+        self.store = store
+        self.broker = broker
+
+    def _publish(self, status: str, progress: Optional[int], error_message: Optional[str] = None):
+        """Push a status event to subscribers."""
+        self.broker.publish(status_event(self.contract_id, status, progress, error_message))
+
+    async def start(self, progress: int = 10,
+                    projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Mark the contract as processing and return its record in one round trip."""
+        contract = await self.contracts_collection.find_one_and_update(
+            {"_id": self.contract_id},
+            {"$set": {"status": "processing", "progress": progress}},
+            projection=projection,
+            return_document=ReturnDocument.AFTER
+        )
+        if contract:
+            self.store.set(self.contract_id, progress)
+            self._publish("processing", progress)
+            logger.debug(f"Contract {self.contract_id} processing")
+        return contract
+
+    def report(self, progress: int):
+        """Record intermediate progress without writing to the database."""
+        self.store.set(self.contract_id, progress)
+        self._publish("processing", progress)
+        logger.debug(f"Contract {self.contract_id} progress {progress}%")
+
+    async def complete(self, contract_data: Dict[str, Any]) -> Optional[str]:
+        """Store the extraction result and mark the contract completed.
+
+        Returns the contract id owning an identical, previously stored
+        extraction if this result was discarded as a duplicate.
+        """
+        completed = {"status": "completed", "progress": 100}
+        data_contract_id = None
+
+        try:
+            await self._insert_and_update(contract_data, completed)
+        except DuplicateKeyError:
+            # An identical file finished processing first; reference its extraction
+            existing = await self.contract_data_collection.find_one(
+                {"$or": [{"contract_id": self.contract_id}, {"content_hash": contract_data.get("content_hash")}]},
+                {"contract_id": 1}
+            )
+            if existing["contract_id"] != self.contract_id:
+                data_contract_id = existing["contract_id"]
+                completed["data_contract_id"] = data_contract_id
+            await self.contracts_collection.update_one(
+                {"_id": self.contract_id},
+                {"$set": completed}
+            )
+
+        self.store.discard(self.contract_id)
+        self._publish("completed", 100)
+        logger.debug(f"Contract {self.contract_id} completed")
+        return data_contract_id
+
+    async def fail(self, error_message: str):
+        """Mark the contract as failed."""
+        await self.contracts_collection.update_one(
+            {"_id": self.contract_id},
+            {"$set": {"status": "failed", "error_message": error_message}}
+        )
+        self.store.discard(self.contract_id)
+        self._publish("failed", None, error_message)
+        logger.debug(f"Contract {self.contract_id} failed")
+
+    async def retry(self):
+        """Return the contract to pending for another processing attempt."""
+        await self.contracts_collection.update_one(
+            {"_id": self.contract_id},
+            {"$set": {"status": "pending", "progress": 0}}
+        )
+        self.store.discard(self.contract_id)
+        self._publish("pending", 0)
+        logger.debug(f"Contract {self.contract_id} pending retry")
+
+    async def _insert_and_update(self, contract_data: Dict[str, Any], update_data: Dict[str, Any]):
+        """Insert the extraction and update the contract, atomically when possible."""
+        if ProgressReporter._transactions_supported is not False:
+            try:
+                async with await self.db.client.start_session() as session:
+                    async with session.start_transaction():
+                        await self.contract_data_collection.insert_one(contract_data, session=session)
+                        await self.contracts_collection.update_one(
+                            {"_id": self.contract_id},
+                            {"$set": update_data},
+                            session=session
+                        )
+                ProgressReporter._transactions_supported = True
+                return
+            except OperationFailure as e:
+                if e.code != ILLEGAL_OPERATION:
+                    raise
+                ProgressReporter._transactions_supported = False
+                logger.info("MongoDB does not support transactions; completing contracts with two writes")
+
+        await self.contract_data_collection.insert_one(contract_data)
+        await self.contracts_collection.update_one(
+            {"_id": self.contract_id},
+            {"$set": update_data}
+        )
@@ -0,0 +1,481 @@
+"""Content-addressed storage of uploaded contract files.
+
+Files are stored once per distinct content under their SHA-256 hash, in a
+sharded ``ab/cd/<sha256>`` layout, so identical uploads share one object and
+no directory grows past 256 entries. The ``blobs`` collection counts the
+contracts referencing each object; an object is deleted with its last
+reference. The record of an object being deleted is kept as a tombstone
+until its bytes are gone, and a store of the same content waits for the
+deletion rather than reference bytes about to disappear. References of
+uploads that never became contracts, e.g. after a crash, are corrected by
+``reconcile_refcounts``.
+
+``STORAGE_BACKEND`` selects the backend: ``local`` (files under
+``UPLOAD_DIR``, the default) or ``s3`` (an S3-compatible object store). For
+``s3`` without ``STORAGE_S3_ENDPOINT_URL`` a local stand-in that implements
+the subset of the S3 API used here is kept under ``UPLOAD_DIR/object-store``.
+"""
+
+import asyncio
+import logging
+import mmap
+import os
+import shutil
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, AsyncIterator
+import aiofiles
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks while a store waits for a deletion of the same content
+DELETION_POLL_SECONDS = 0.05
+# Age after which the tombstone of a deletion is taken to be abandoned by a crash
+DELETION_TIMEOUT = timedelta(minutes=5)
+
+
+def shard_path(content_hash: str) -> str:
+    """Relative location of an object: ``ab/cd/<sha256>``."""
+    return f"{content_hash[:2]}/{content_hash[2:4]}/{content_hash}"
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    """Metadata of a stored object."""
+
+    key: str
+    size: int
+    modified: float
+    # Local file holding the object, when the backend keeps one
+    path: Optional[str] = None
+
+
+class Storage:
+    """Storage interface with reference counting shared by all backends."""
+
+    backend = "none"
+
+    def _blobs(self):
+        """The blob reference count collection of the connected database."""
+        from app.database import get_database
+        return get_database().blobs
+
+    async def store(self, source_path: str, content_hash: str, size: int) -> str:
+        """Take ownership of a local file and add a reference to its content.
+
+        The file is moved (or uploaded and removed) unless an object with the
+        same content already exists. If that object is being deleted, waits
+        for the deletion to finish and stores the content again. Returns the
+        storage key.
+        """
+        blobs = self._blobs()
+        while True:
+            now = datetime.utcnow()
+            try:
+                await blobs.update_one(
+                    {"_id": content_hash, "state": {"$ne": "deleting"}},
+                    {
+                        "$inc": {"refcount": 1},
+                        "$set": {"referenced_at": now},
+                        "$setOnInsert": {"size": size, "state": "live", "created_at": now}
+                    },
+                    upsert=True
+                )
+                break
+            except DuplicateKeyError:
+                # A tombstone: take it over if its deleter died, otherwise wait for it
+                result = await blobs.update_one(
+                    {"_id": content_hash, "state": "deleting", "deleting_at": {"$lt": now - DELETION_TIMEOUT}},
+                    {"$set": {"state": "live", "refcount": 1, "referenced_at": now}}
+                )
+                if result.modified_count:
+                    break
+                await asyncio.sleep(DELETION_POLL_SECONDS)
+
+        await self._put(source_path, content_hash)
+        return content_hash
+
+    async def release(self, key: str):
+        """Drop a reference, deleting the object once nothing references it."""
+        blob = await self._blobs().find_one_and_update(
+            {"_id": key, "state": {"$ne": "deleting"}},
+            {"$inc": {"refcount": -1}},
+            projection={"refcount": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if blob is not None and blob["refcount"] <= 0:
+            await self._delete_unreferenced(key)
+
+    async def _delete_unreferenced(self, key: str) -> bool:
+        """Delete an object if it is still unreferenced. Returns True if it was deleted.
+
+        The record is first turned into a tombstone, atomically with the
+        refcount check, so a concurrent ``store`` cannot add a reference to
+        the bytes being deleted; the tombstone is removed once they are gone.
+        """
+        blobs = self._blobs()
+        result = await blobs.update_one(
+            {"_id": key, "state": {"$ne": "deleting"}, "refcount": {"$lte": 0}},
+            {"$set": {"state": "deleting", "deleting_at": datetime.utcnow()}}
+        )
+        if not result.modified_count:
+            return False
+
+        await self._delete(key)
+        await blobs.delete_one({"_id": key, "state": "deleting"})
+        logger.info(f"Deleted unreferenced object {key}")
+        return True
+
+    async def reconcile_refcounts(self, contracts_collection, older_than: timedelta) -> Dict[str, int]:
+        """Set refcounts to the number of contracts referencing each object.
+
+        Corrects references added by uploads whose contract was never created,
+        e.g. when the process crashed in between, and deletes objects left
+        without any. Only objects not referenced within ``older_than`` are
+        checked, so uploads still on their way to a contract are left alone.
+        """
+        blobs = self._blobs()
+        cutoff = datetime.utcnow() - older_than
+        report = {"checked": 0, "corrected": 0, "deleted": 0}
+
+        counts = {
+            group["_id"]: group["count"]
+            async for group in contracts_collection.aggregate([
+                {"$match": {"storage_key": {"$type": "string"}}},
+                {"$group": {"_id": "$storage_key", "count": {"$sum": 1}}}
+            ])
+        }
+
+        cursor = blobs.find(
+            {"state": {"$ne": "deleting"}, "referenced_at": {"$not": {"$gte": cutoff}}},
+            {"refcount": 1, "referenced_at": 1}
+        )
+        async for blob in cursor:
+            report["checked"] += 1
+            count = counts.get(blob["_id"], 0)
+            if blob["refcount"] == count:
+                continue
+
+            # Only if no reference was added or dropped since it was read
+            result = await blobs.update_one(
+                {"_id": blob["_id"], "refcount": blob["refcount"], "referenced_at": blob.get("referenced_at")},
+                {"$set": {"refcount": count}}
+            )
+            if not result.modified_count:
+                continue
+            logger.warning(f"Corrected refcount of object {blob['_id']} from {blob['refcount']} to {count}")
+            report["corrected"] += 1
+            if count == 0 and await self._delete_unreferenced(blob["_id"]):
+                report["deleted"] += 1
+
+        return report
+
+    async def stat(self, key: str) -> Optional[StoredBlob]:
+        """Metadata of an object, or None if it does not exist."""
+        raise NotImplementedError
+
+    async def read(self, key: str) -> bytes:
+        """Read a whole object."""
+        raise NotImplementedError
+
+    def iter_range(self, key: str, offset: int, count: int,
+                   chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Yield ``count`` bytes of an object starting at ``offset``."""
+        raise NotImplementedError
+
+    async def _put(self, source_path: str, key: str):
+        """Move a local file into the store under ``key``."""
+        raise NotImplementedError
+
+    async def _delete(self, key: str):
+        """Remove an object."""
+        raise NotImplementedError
+
+
+def _read_mapped(path: str, offset: int = 0, count: Optional[int] = None) -> bytes:
+    """Copy a slice of a file out of a read-only memory map."""
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        end = len(mapped) if count is None else offset + count
+        return mapped[offset:end]
+
+
+def _map_file(path: str) -> mmap.mmap:
+    """Map a whole file read-only; the map stays valid after the file is closed."""
+    with open(path, "rb") as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class LocalStorage(Storage):
+    """Content-addressed files on the local filesystem.
+
+    Objects of at least ``STORAGE_MMAP_THRESHOLD`` bytes are read through a
+    memory map, copying straight from the page cache instead of through
+    buffered reads. All file access, including copies out of a map, which
+    fault pages in from disk, runs in a thread off the event loop.
+    """
+
+    backend = "local"
+
+    def __init__(self, root: str, mmap_threshold: int):
+        """Initialize storage rooted at a directory."""
+        self.root = root
+        self.mmap_threshold = mmap_threshold
+
+    def path(self, key: str) -> str:
+        """Filesystem path of an object."""
+        return os.path.join(self.root, *shard_path(key).split("/"))
+
+    async def stat(self, key: str) -> Optional[StoredBlob]:
+        """Metadata of an object, or None if it does not exist."""
+        path = self.path(key)
+        try:
+            stat_result = await asyncio.to_thread(os.stat, path)
+        except FileNotFoundError:
+            return None
+        return StoredBlob(key=key, size=stat_result.st_size, modified=stat_result.st_mtime, path=path)
+
+    async def read(self, key: str) -> bytes:
+        """Read a whole object, through a memory map when it is large."""
+        path = self.path(key)
+        if await asyncio.to_thread(os.path.getsize, path) >= self.mmap_threshold:
+            return await asyncio.to_thread(_read_mapped, path)
+
+        async with aiofiles.open(path, "rb") as file:
+            return await file.read()
+
+    async def iter_range(self, key: str, offset: int, count: int,
+                         chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Yield a byte range of an object, sliced from a memory map when it is large."""
+        path = self.path(key)
+        if await asyncio.to_thread(os.path.getsize, path) >= self.mmap_threshold:
+            mapped = await asyncio.to_thread(_map_file, path)
+            try:
+                end = min(offset + count, len(mapped))
+                for position in range(offset, end, chunk_size):
+                    yield await asyncio.to_thread(mapped.__getitem__, slice(position, min(position + chunk_size, end)))
+            finally:
+                mapped.close()
+            return
+
+        async with aiofiles.open(path, "rb") as file:
+            await file.seek(offset)
+            remaining = count
+            while remaining > 0:
+                chunk = await file.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    async def _put(self, source_path: str, key: str):
+        """Move a staged file into its shard directory."""
+        path = self.path(key)
+
+        def put():
+            if os.path.exists(path):
+                # Same content is already stored
+                os.remove(source_path)
+                return
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Atomic; a concurrent store of the same content writes identical bytes
+            os.replace(source_path, path)
+        await asyncio.to_thread(put)
+
+    async def _delete(self, key: str):
+        """Remove an object file."""
+        try:
+            await asyncio.to_thread(os.remove, self.path(key))
+        except FileNotFoundError:
+            pass
+
+
+class ObjectNotFoundError(Exception):
+    """Raised by ``LocalObjectStore`` for a missing key, shaped like botocore's ClientError."""
+
+    def __init__(self, key: str):
+        """Initialize error for a missing key."""
+        super().__init__(f"No such key: {key}")
+        self.response = {"Error": {"Code": "NoSuchKey", "Message": str(self)}}
+
+
+class _ObjectBody:
+    """Streaming body of a ``get_object`` response."""
+
+    def __init__(self, file, count: int):
+        """Wrap a file positioned at the first byte to return."""
+        self._file = file
+        self._remaining = count
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        """Read up to ``amt`` bytes, or the rest of the body."""
+        size = self._remaining if amt is None else min(amt, self._remaining)
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        """Release the underlying file."""
+        self._file.close()
+
+
+class LocalObjectStore:
+    """Local stand-in for an S3 client.
+
+    Implements ``put_object``, ``head_object``, ``get_object`` (with
+    ``Range``) and ``delete_object`` with boto3's call and response shapes,
+    storing each bucket as a directory, so ``S3Storage`` runs without an
+    object store in development.
+    """
+
+    def __init__(self, root: str):
+        """Initialize store keeping buckets under a directory."""
+        self.root = root
+
+    def _path(self, bucket: str, key: str) -> str:
+        """Filesystem path of an object."""
+        return os.path.join(self.root, bucket, *key.split("/"))
+
+    def put_object(self, Bucket: str, Key: str, Body) -> Dict[str, Any]:
+        """Store an object from a readable file object, atomically."""
+        path = self._path(Bucket, Key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.part"
+        with open(temp_path, "wb") as file:
+            shutil.copyfileobj(Body, file)
+        os.replace(temp_path, path)
+        return {}
+
+    def head_object(self, Bucket: str, Key: str) -> Dict[str, Any]:
+        """Return object metadata."""
+        try:
+            stat_result = os.stat(self._path(Bucket, Key))
+        except FileNotFoundError:
+            raise ObjectNotFoundError(Key)
+        return {
+            "ContentLength": stat_result.st_size,
+            "LastModified": datetime.fromtimestamp(stat_result.st_mtime, timezone.utc)
+        }
+
+    def get_object(self, Bucket: str, Key: str, Range: Optional[str] = None) -> Dict[str, Any]:
+        """Return an object, or the ``bytes=start-end`` range of it, as a streaming body."""
+        try:
+            file = open(self._path(Bucket, Key), "rb")
+        except FileNotFoundError:
+            raise ObjectNotFoundError(Key)
+
+        size = os.fstat(file.fileno()).st_size
+        start, end = 0, size - 1
+        if Range:
+            first, _, last = Range.removeprefix("bytes=").partition("-")
+            start, end = int(first), min(int(last), size - 1)
+        file.seek(start)
+        return {"Body": _ObjectBody(file, end - start + 1), "ContentLength": end - start + 1}
+
+    def delete_object(self, Bucket: str, Key: str) -> Dict[str, Any]:
+        """Remove an object; missing keys are not an error, as in S3."""
+        try:
+            os.remove(self._path(Bucket, Key))
+        except FileNotFoundError:
+            pass
+        return {}
+
+
+def _is_not_found(error: Exception) -> bool:
+    """Whether an S3 client error reports a missing object."""
+    code = getattr(error, "response", {}).get("Error", {}).get("Code")
+    return code in ("404", "NoSuchKey", "NotFound")
+
+
+class S3Storage(Storage):
+    """Content-addressed objects in an S3-compatible bucket.
+
+    The synchronous client calls run in a thread. Objects are never served
+    from a local path, so downloads stream ranged ``get_object`` bodies.
+    """
+
+    backend = "s3"
+
+    def __init__(self, client, bucket: str):
+        """Initialize storage over an S3 client and bucket."""
+        self.client = client
+        self.bucket = bucket
+
+    async def stat(self, key: str) -> Optional[StoredBlob]:
+        """Metadata of an object, or None if it does not exist."""
+        try:
+            head = await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=shard_path(key))
+        except Exception as e:
+            if _is_not_found(e):
+                return None
+            raise
+        return StoredBlob(key=key, size=head["ContentLength"], modified=head["LastModified"].timestamp())
+
+    async def read(self, key: str) -> bytes:
+        """Read a whole object."""
+        response = await asyncio.to_thread(self.client.get_object, Bucket=self.bucket, Key=shard_path(key))
+        try:
+            return await asyncio.to_thread(response["Body"].read)
+        finally:
+            response["Body"].close()
+
+    async def iter_range(self, key: str, offset: int, count: int,
+                         chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """Yield a byte range of an object from a ranged ``get_object``."""
+        response = await asyncio.to_thread(
+            self.client.get_object,
+            Bucket=self.bucket,
+            Key=shard_path(key),
+            Range=f"bytes={offset}-{offset + count - 1}"
+        )
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await asyncio.to_thread(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+    async def _put(self, source_path: str, key: str):
+        """Upload a staged file unless the object already exists, then remove it."""
+        try:
+            if await self.stat(key) is None:
+                def upload():
+                    with open(source_path, "rb") as file:
+                        self.client.put_object(Bucket=self.bucket, Key=shard_path(key), Body=file)
+                await asyncio.to_thread(upload)
+        finally:
+            os.remove(source_path)
+
+    async def _delete(self, key: str):
+        """Remove an object."""
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket, Key=shard_path(key))
+
+
+def build_s3_client():
+    """Create a boto3 client for the configured endpoint, or the local stand-in."""
+    if not settings.storage_s3_endpoint_url:
+        return LocalObjectStore(os.path.join(settings.upload_dir, "object-store"))
+
+    try:
+        import boto3
+    except ImportError:
+        raise RuntimeError("STORAGE_S3_ENDPOINT_URL is set but boto3 is not installed")
+    return boto3.client("s3", endpoint_url=settings.storage_s3_endpoint_url)
+
+
+def build_storage() -> Storage:
+    """Create the storage backend selected in settings."""
+    if settings.storage_backend == "s3":
+        return S3Storage(build_s3_client(), settings.storage_s3_bucket)
+    if settings.storage_backend != "local":
+        logger.warning(f"Unknown storage backend {settings.storage_backend!r}; using local storage")
+    return LocalStorage(settings.upload_dir, settings.storage_mmap_threshold)
+
+
+contract_storage = build_storage()
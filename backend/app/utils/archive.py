@@ -0,0 +1,30 @@
+"""Helpers for reading contract PDFs out of ZIP archives."""
+
+import os
+import zipfile
+from typing import List
+from starlette.concurrency import run_in_threadpool
+
+
+class ZipMemberReader:
+    """Async chunk reader over an open ZIP member, matching ``UploadFile.read``."""
+
+    def __init__(self, member_file):
+        """Wrap a file object returned by ``ZipFile.open``."""
+        self._file = member_file
+
+    async def read(self, size: int = -1) -> bytes:
+        """Read and decompress up to ``size`` bytes off the event loop."""
+        return await run_in_threadpool(self._file.read, size)
+
+
+def list_pdf_members(archive: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    """Return PDF entries of an archive, skipping directories and metadata files."""
+    members = []
+    for member in archive.infolist():
+        name = os.path.basename(member.filename)
+        if member.is_dir() or not name or name.startswith('.') or member.filename.startswith('__MACOSX/'):
+            continue
+        if name.lower().endswith('.pdf'):
+            members.append(member)
+    return members
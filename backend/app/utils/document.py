@@ -0,0 +1,82 @@
+"""Contract text indexed once for the field extractors.
+
+A ``ParsedDocument`` holds the text of a contract as extracted, the offset of
+each of its lines and an inverted index from the anchor keywords of the
+pattern registry to the lines they occur on. ``AnchoredPattern`` uses the
+index to run only on candidate lines, and results needed by more than one
+extractor are memoised on the document.
+
+Text is kept exactly as extracted: the extractors' results depend on every
+character of it, so normalising it would change what they find. Keywords are
+looked up case-insensitively, folding the text the way ``re.IGNORECASE``
+matches ASCII letters, so the index finds every line a pattern can match on.
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+from app.utils.patterns import ANCHOR_KEYWORDS
+
+# Characters other than ASCII letters that ``re.IGNORECASE`` matches to one;
+# ``str.lower`` leaves them, or in the case of U+0130 lengthens them
+IGNORECASE_FOLDS = [("İ", "i"), ("ı", "i"), ("ſ", "s"), ("K", "k")]
+
+
+class ParsedDocument:
+    """Contract text with its line offsets and an index of anchor keywords."""
+
+    def __init__(self, text: str, keywords: Iterable[str] = ANCHOR_KEYWORDS):
+        """Split the text into lines and index the lines each keyword occurs on."""
+        self.text = text
+        self.line_starts = list(accumulate((len(line) + 1 for line in text.split("\n")[:-1]), initial=0))
+        self.index = self._index(keywords)
+        self._lines: Dict[Tuple[str, ...], List[int]] = {}
+        self._memo: Dict[str, Any] = {}
+
+    def _index(self, keywords: Iterable[str]) -> Dict[str, List[int]]:
+        """Lines of each lower-cased keyword, in order, once per line."""
+        folded = self.text
+        if not folded.isascii():
+            for char, replacement in IGNORECASE_FOLDS:
+                if char in folded:
+                    folded = folded.replace(char, replacement)
+        folded = folded.lower()
+
+        starts = self.line_starts
+        index = {}
+        for keyword in keywords:
+            keyword = keyword.lower()
+            lines = []
+            pos = folded.find(keyword)
+            while pos >= 0:
+                line = bisect_right(starts, pos) - 1
+                lines.append(line)
+                if line + 1 == len(starts):
+                    break
+                pos = folded.find(keyword, starts[line + 1])
+            index[keyword] = lines
+        return index
+
+    def line_span(self, line: int) -> Tuple[int, int]:
+        """Start and end offsets of a line, the end including its line break."""
+        end = self.line_starts[line + 1] if line + 1 < len(self.line_starts) else len(self.text)
+        return self.line_starts[line], end
+
+    def lines_with(self, keywords: Tuple[str, ...]) -> List[int]:
+        """Lines on which any of the keywords occurs, in order.
+
+        Raises ``KeyError`` for a keyword that was not indexed, rather than
+        report it absent.
+        """
+        lines = self._lines.get(keywords)
+        if lines is None:
+            found = [self.index[keyword.lower()] for keyword in keywords]
+            lines = found[0] if len(found) == 1 else sorted(set().union(*found))
+            self._lines[keywords] = lines
+        return lines
+
+    def memo(self, key: str, function: Callable[..., Any], *args) -> Any:
+        """``function(*args)``, called once per document under ``key``."""
+        if key not in self._memo:
+            self._memo[key] = function(*args)
+        return self._memo[key]
@@ -0,0 +1,129 @@
+"""HTTP helpers for conditional and partial responses."""
+
+from email.utils import formatdate
+from typing import Optional, Tuple, Callable, AsyncIterator
+from urllib.parse import quote
+import aiofiles
+from starlette.responses import Response
+from starlette.types import Scope, Receive, Send
+
+
+class RangeNotSatisfiableError(ValueError):
+    """Raised when a Range header selects no bytes of the representation."""
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in [candidate.removeprefix("W/") for candidate in candidates]
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single byte range into an inclusive ``(start, end)`` pair.
+
+    Returns None when the header is absent, malformed, uses another unit or
+    asks for several ranges; the full representation is served then. Raises
+    RangeNotSatisfiableError when the range lies beyond the end of the file.
+    """
+    if not range_header:
+        return None
+
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+
+    first, dash, last = ranges.strip().partition("-")
+    if not dash:
+        return None
+
+    try:
+        start = int(first) if first else None
+        end = int(last) if last else None
+    except ValueError:
+        return None
+
+    if start is None:
+        # Suffix range: the last ``end`` bytes
+        if end is None or end < 0:
+            return None
+        if end == 0 or size == 0:
+            raise RangeNotSatisfiableError(range_header)
+        return max(size - end, 0), size - 1
+
+    if start < 0 or (end is not None and end < start):
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(range_header)
+    return start, size - 1 if end is None else min(end, size - 1)
+
+
+class RangeFileResponse(Response):
+    """File response serving the whole file or a single byte range.
+
+    The body is streamed from ``chunks(offset, count)``, or read from the
+    local file at ``path`` in chunks.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, size: int, modified: float, filename: str, media_type: str,
+                 etag: Optional[str] = None, byte_range: Optional[Tuple[int, int]] = None,
+                 path: Optional[str] = None,
+                 chunks: Optional[Callable[[int, int], AsyncIterator[bytes]]] = None):
+        """Initialize response for ``byte_range`` of a file, or all of it."""
+        self.path = path
+        self.chunks = chunks or self._read_chunks
+        self.media_type = media_type
+        self.background = None
+
+        if byte_range is None:
+            self.status_code = 200
+            self.offset, self.count = 0, size
+        else:
+            start, end = byte_range
+            self.status_code = 206
+            self.offset, self.count = start, end - start + 1
+
+        self.init_headers({
+            "Accept-Ranges": "bytes",
+            "Content-Length": str(self.count),
+            "Last-Modified": formatdate(modified, usegmt=True)
+        })
+        if byte_range is not None:
+            self.headers["Content-Range"] = f"bytes {byte_range[0]}-{byte_range[1]}/{size}"
+        if etag:
+            self.headers["ETag"] = etag
+
+        quoted_filename = quote(filename)
+        if quoted_filename != filename:
+            self.headers["Content-Disposition"] = f"attachment; filename*=utf-8''{quoted_filename}"
+        else:
+            self.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+
+    async def _read_chunks(self, offset: int, count: int) -> AsyncIterator[bytes]:
+        """Read ``count`` bytes of the local file from ``offset`` in chunks."""
+        async with aiofiles.open(self.path, "rb") as file:
+            await file.seek(offset)
+            remaining = count
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    # File was truncated after it was stat'ed
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Send headers, then the selected bytes of the file."""
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers
+        })
+
+        if self.count > 0:
+            async for chunk in self.chunks(self.offset, self.count):
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
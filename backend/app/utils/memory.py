@@ -0,0 +1,35 @@
+"""Peak resident memory measurement of the current process."""
+
+import sys
+
+KIB = 1024
+
+
+def reset_peak_rss() -> bool:
+    """Reset the peak RSS counter so the next reading covers only what follows.
+
+    Only Linux supports this; elsewhere the peak stays the process lifetime
+    maximum. Returns whether the counter was reset.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process in bytes since start or last reset."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * KIB
+    except OSError:
+        pass
+
+    import resource
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and kilobytes elsewhere
+    return max_rss if sys.platform == "darwin" else max_rss * KIB
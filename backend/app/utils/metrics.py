@@ -0,0 +1,347 @@
+"""Process-local metrics exported in the Prometheus text format.
+
+Counters, gauges and histograms live in the ``metrics`` registry of the
+process that updates them and are rendered by ``GET /metrics`` of the API, or
+by the listener ``start_metrics_server`` opens in a standalone job worker.
+Extraction pool workers run in other processes, so they time their stages
+into a ``StageTimings`` that travels back with the task result and is
+observed by the process that submitted it.
+
+Updating a metric is a dictionary lookup and an addition, and timers use
+``time.perf_counter``; ``benchmarks.metrics_overhead`` measures the cost
+against an uninstrumented parse.
+"""
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds, from a regex over a short page to a long contract through the pool
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value, integers without a decimal point."""
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape_label(value: str) -> str:
+    """Escape a label value as the text format requires."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    """Render a label set."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels) + "}"
+
+
+class Metric:
+    """A named metric with one series per combination of label values."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Initialize an empty metric."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """Label values in declaration order."""
+        try:
+            if len(labels) == len(self.labelnames):
+                return tuple([str(labels[name]) for name in self.labelnames])
+        except KeyError:
+            pass
+        raise ValueError(f"Metric {self.name} takes labels {', '.join(self.labelnames) or 'none'}")
+
+    def _labels(self, key: Tuple[str, ...]) -> List[Tuple[str, str]]:
+        """Label pairs of a series."""
+        return list(zip(self.labelnames, key))
+
+    def samples(self) -> Iterator[Tuple[str, List[Tuple[str, str]], float]]:
+        """Yield the name, labels and value of every sample."""
+        for key, value in sorted(self._series.items()):
+            yield self.name, self._labels(key), value
+
+    def render(self) -> str:
+        """Render the metric in the text exposition format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for name, labels, value in self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """A value that only goes up."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels: str):
+        """Add to the counter."""
+        key = self._key(labels)
+        self._series[key] = self._series.get(key, 0) + amount
+
+    def inc_each(self, amounts: Dict[str, float]):
+        """Add to many series of a counter with a single label, keyed by label value."""
+        if len(self.labelnames) != 1:
+            raise ValueError(f"Metric {self.name} takes labels {', '.join(self.labelnames) or 'none'}")
+        series = self._series
+        for value, amount in amounts.items():
+            key = (value,)
+            series[key] = series.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """A value that goes up and down."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: str):
+        """Set the gauge."""
+        self._series[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str):
+        """Raise the gauge."""
+        key = self._key(labels)
+        self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str):
+        """Lower the gauge."""
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels: str) -> Iterator[None]:
+        """Count the block as in progress while it runs."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class _HistogramSeries:
+    """Bucket counts, sum and count of one histogram series."""
+
+    __slots__ = ("buckets", "sum", "count")
+
+    def __init__(self, size: int):
+        """Initialize empty buckets."""
+        self.buckets = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(Metric):
+    """Observations counted in cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Initialize a histogram with upper bucket bounds in ascending order."""
+        super().__init__(name, documentation, labelnames)
+        self.bounds = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str):
+        """Record an observation."""
+        self._observe(self._key(labels), value)
+
+    def _observe(self, key: Tuple[str, ...], value: float):
+        """Record an observation in the series of a label key."""
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _HistogramSeries(len(self.bounds))
+
+        # Values above the last bound only count towards +Inf
+        index = bisect_left(self.bounds, value)
+        if index < len(self.bounds):
+            series.buckets[index] += 1
+        series.sum += value
+        series.count += 1
+
+    def time(self, **labels: str) -> "_Timer":
+        """Context manager observing the duration of its block in seconds."""
+        return _Timer(self._observe, self._key(labels))
+
+    def samples(self) -> Iterator[Tuple[str, List[Tuple[str, str]], float]]:
+        """Yield cumulative bucket, sum and count samples of every series."""
+        for key, series in sorted(self._series.items()):
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.bounds, series.buckets):
+                cumulative += count
+                yield f"{self.name}_bucket", labels + [("le", _format_value(bound))], cumulative
+            yield f"{self.name}_bucket", labels + [("le", "+Inf")], series.count
+            yield f"{self.name}_sum", labels, series.sum
+            yield f"{self.name}_count", labels, series.count
+
+
+class MetricsRegistry:
+    """The metrics of a process, rendered together."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        """Add a metric, refusing duplicate names."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Create and register a gauge."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Create and register a histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render every metric in the text exposition format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+class _Timer:
+    """Context manager passing the duration of its block to a callback.
+
+    A class rather than a generator-based context manager: timers wrap every
+    parse stage, and this halves their cost.
+    """
+
+    __slots__ = ("record", "key", "start")
+
+    def __init__(self, record: Callable[[Any, float], None], key: Any):
+        """Remember where to send the duration, and under which key."""
+        self.record = record
+        self.key = key
+
+    def __enter__(self):
+        """Start timing."""
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop timing and record, whether or not the block raised."""
+        self.record(self.key, time.perf_counter() - self.start)
+        return False
+
+
+class StageTimings:
+    """Durations of the stages of one parse, in seconds, in stage order.
+
+    ``patterns`` holds the seconds spent in each regex pattern of the parse.
+    """
+
+    def __init__(self):
+        """Initialize with no stages timed."""
+        self.seconds: Dict[str, float] = {}
+        self.patterns: Dict[str, float] = {}
+
+    def stage(self, name: str) -> _Timer:
+        """Context manager timing its block, added to earlier time of the same stage."""
+        return _Timer(self._add, name)
+
+    def _add(self, name: str, elapsed: float):
+        """Add time to a stage."""
+        self.seconds[name] = self.seconds.get(name, 0.0) + elapsed
+
+    def merge(self, seconds: Dict[str, float]):
+        """Add stage durations timed elsewhere, such as another worker."""
+        for name, value in seconds.items():
+            self.seconds[name] = self.seconds.get(name, 0.0) + value
+
+    def add_patterns(self, seconds: Dict[str, float]):
+        """Add time spent in regex patterns, taking over ``seconds`` if none was added before."""
+        if not self.patterns:
+            self.patterns = seconds
+            return
+        for name, value in seconds.items():
+            self.patterns[name] = self.patterns.get(name, 0.0) + value
+
+
+_UNTIMED = nullcontext()
+
+
+def stage_timer(timings: Optional[StageTimings]):
+    """The ``stage`` context factory of ``timings``, or one that times nothing."""
+    if timings is None:
+        return lambda name: _UNTIMED
+    return timings.stage
+
+
+metrics = MetricsRegistry()
+
+parse_stage_seconds = metrics.histogram(
+    "contract_parse_stage_seconds",
+    "Time spent in each stage of parsing a contract in the extraction workers",
+    ["stage"]
+)
+processing_stage_seconds = metrics.histogram(
+    "contract_processing_stage_seconds",
+    "Time spent in each stage of processing a contract, including pool and database waits",
+    ["stage"]
+)
+contracts_processed_total = metrics.counter(
+    "contracts_processed_total", "Contracts processed by this process", ["status"]
+)
+parses_in_flight = metrics.gauge(
+    "contract_parses_in_flight", "Contract parses submitted to the extraction pool and not yet finished"
+)
+pattern_seconds_total = metrics.counter(
+    "contract_pattern_seconds_total", "Time spent matching each extraction regex in the extraction workers", ["pattern"]
+)
+jobs = metrics.gauge("contract_jobs", "Processing jobs in the queue, by status", ["status"])
+uploads_total = metrics.counter("contract_uploads_total", "Files uploaded to this process")
+upload_bytes_total = metrics.counter("contract_upload_bytes_total", "Bytes of files uploaded to this process")
+
+
+async def start_metrics_server(port: int, host: str = "0.0.0.0",
+                               registry: MetricsRegistry = metrics) -> asyncio.AbstractServer:
+    """Serve ``GET /metrics`` of a registry on a plain HTTP listener.
+
+    For processes without an ASGI app, such as standalone job workers, whose
+    processing metrics would otherwise never be scraped.
+    """
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            # Skip the headers; requests have no body
+            while (await reader.readline()).strip():
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", registry.render().encode()
+            else:
+                status, body = "404 Not Found", b"Not Found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: text/plain; version=0.0.4\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (ConnectionError, UnicodeDecodeError) as e:
+            logger.debug(f"Metrics request failed: {e}")
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    logger.info(f"Serving metrics on {host}:{port}/metrics")
+    return server
@@ -0,0 +1,248 @@
+"""Time budgets and per-pattern timing for regex field extraction.
+
+Python's ``re`` engine cannot be cancelled, but it does check for signals
+while matching, so a pattern that backtracks catastrophically on adversarial
+or garbage-OCR text is interrupted by a ``SIGALRM`` whose handler raises
+``PatternTimeout``. ``TimeBudget`` arms that alarm around a block.
+``PatternBudget`` bounds one field extractor: only time spent in its
+``TimedPattern`` calls counts against it, and the timeout is raised only
+inside a pattern call, never in the extractor's own code. The parser then
+skips the extractor and notes it in the gap analysis. Budgets need
+``signal.setitimer`` and the main thread, where extraction workers run their
+tasks; elsewhere extraction runs unbounded.
+
+``TimedPattern`` wraps a compiled pattern to add the time of every call to a
+``PatternClock`` and to name the pattern in a ``PatternTimeout`` raised
+while it was matching. Its ``*_in`` methods take a ``ParsedDocument`` and run
+anchored patterns on its candidate lines only.
+"""
+
+import signal
+import threading
+from time import perf_counter
+from types import FrameType
+from typing import Any, Collection, Dict, List, Mapping, Optional
+
+# The budget whose alarm is pending; alarms are ignored when there is none
+_budget: Optional["TimeBudget"] = None
+_handler_installed = False
+
+# Seconds between checks for a pattern call once a ``PatternBudget`` is spent
+_EXPIRED_POLL_SECONDS = 0.001
+
+_HAS_TIMER = hasattr(signal, "setitimer")
+_MAIN_THREAD_ID = threading.main_thread().ident
+
+
+class PatternTimeout(Exception):
+    """A field extractor ran past its time budget."""
+
+    def __init__(self):
+        """Initialize without the pattern, which ``TimedPattern`` fills in."""
+        super().__init__("Extractor time budget exceeded")
+        self.pattern: Optional[str] = None
+
+
+def _on_alarm(signum, frame):
+    """SIGALRM handler passing the alarm to the pending budget."""
+    if _budget is not None:
+        _budget.expire(frame)
+
+
+def budgets_supported() -> bool:
+    """Whether budgets can be enforced on this platform and thread."""
+    return _HAS_TIMER and threading.get_ident() == _MAIN_THREAD_ID
+
+
+class TimeBudget:
+    """Context manager raising ``PatternTimeout`` in its block after ``seconds``.
+
+    A budget of 0, or one entered where budgets are unsupported, does
+    nothing. A class rather than a generator-based context manager, as
+    ``PatternBudget`` wraps every field extractor of every parse.
+    """
+
+    __slots__ = ("seconds", "enforced")
+
+    def __init__(self, seconds: float):
+        """Set the budget of the block."""
+        self.seconds = seconds
+        self.enforced = False
+
+    def __enter__(self):
+        """Arm the alarm."""
+        global _budget, _handler_installed
+        if self.seconds <= 0 or not budgets_supported():
+            return self
+
+        if not _handler_installed:
+            signal.signal(signal.SIGALRM, _on_alarm)
+            _handler_installed = True
+
+        _budget = self
+        self.enforced = True
+        signal.setitimer(signal.ITIMER_REAL, self.seconds)
+        return self
+
+    def __exit__(self, *exc_info):
+        """Cancel the alarm, whether or not the block raised."""
+        global _budget
+        if self.enforced:
+            _budget = None
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        return False
+
+    def expire(self, frame: Optional[FrameType]):
+        """Interrupt the block when the alarm goes off."""
+        raise PatternTimeout()
+
+
+class PatternBudget(TimeBudget):
+    """Budget of the ``TimedPattern`` calls timed into a clock within its block.
+
+    When the alarm goes off, the pattern time of the block is read from the
+    clock, plus the call in progress if the alarm interrupted one. Time spent
+    outside pattern calls does not count: the alarm is re-armed for what is
+    left of the budget. Once the budget is spent, a pattern call in progress
+    is interrupted; otherwise the alarm polls until the next pattern call,
+    so the extractor's own code is never interrupted and pattern calls pay
+    nothing for the budget.
+    """
+
+    __slots__ = ("clock", "spent_before")
+
+    def __init__(self, seconds: float, clock: "PatternClock"):
+        """Set the budget of the pattern calls timed into ``clock``."""
+        super().__init__(seconds)
+        self.clock = clock
+        self.spent_before = 0.0
+
+    def __enter__(self):
+        """Note the pattern time spent before the block and arm the alarm."""
+        self.spent_before = sum(self.clock.seconds.values())
+        return TimeBudget.__enter__(self)
+
+    def expire(self, frame: Optional[FrameType]):
+        """Raise in the pattern call in progress once the budget is spent."""
+        call_start = _pattern_call_start(frame)
+        spent = sum(self.clock.seconds.values()) - self.spent_before
+        if call_start is not None:
+            spent += perf_counter() - call_start
+
+        remaining = self.seconds - spent
+        if remaining > 0:
+            signal.setitimer(signal.ITIMER_REAL, remaining)
+        elif call_start is not None:
+            raise PatternTimeout()
+        else:
+            signal.setitimer(signal.ITIMER_REAL, _EXPIRED_POLL_SECONDS)
+
+
+class PatternClock:
+    """Seconds spent in each pattern during one parse."""
+
+    __slots__ = ("seconds",)
+
+    def __init__(self):
+        """Initialize with nothing timed."""
+        self.seconds: Dict[str, float] = {}
+
+    def reset(self) -> Dict[str, float]:
+        """Start timing a new parse and return the seconds of the previous one."""
+        seconds, self.seconds = self.seconds, {}
+        return seconds
+
+
+class TimedPattern:
+    """A compiled pattern, ``GuidedPattern`` or ``AnchoredPattern``, timed into a ``PatternClock``."""
+
+    __slots__ = ("name", "pattern", "clock", "anchored")
+
+    def __init__(self, name: str, pattern: Any, clock: PatternClock):
+        """Wrap a pattern of the registry under its name."""
+        self.name = name
+        self.pattern = pattern
+        self.clock = clock
+        self.anchored = hasattr(pattern, "findall_in")
+
+    def findall(self, text: str) -> List[Any]:
+        """Timed ``findall``."""
+        start = perf_counter()
+        try:
+            return self.pattern.findall(text)
+        except PatternTimeout as e:
+            e.pattern = self.name
+            raise
+        finally:
+            seconds = self.clock.seconds
+            seconds[self.name] = seconds.get(self.name, 0.0) + perf_counter() - start
+
+    def search(self, text: str):
+        """Timed ``search``."""
+        start = perf_counter()
+        try:
+            return self.pattern.search(text)
+        except PatternTimeout as e:
+            e.pattern = self.name
+            raise
+        finally:
+            seconds = self.clock.seconds
+            seconds[self.name] = seconds.get(self.name, 0.0) + perf_counter() - start
+
+    def findall_in(self, document) -> List[Any]:
+        """Timed ``findall`` over a ``ParsedDocument``."""
+        start = perf_counter()
+        try:
+            return self.pattern.findall_in(document) if self.anchored else self.pattern.findall(document.text)
+        except PatternTimeout as e:
+            e.pattern = self.name
+            raise
+        finally:
+            seconds = self.clock.seconds
+            seconds[self.name] = seconds.get(self.name, 0.0) + perf_counter() - start
+
+    def search_in(self, document):
+        """Timed ``search`` over a ``ParsedDocument``."""
+        start = perf_counter()
+        try:
+            return self.pattern.search_in(document) if self.anchored else self.pattern.search(document.text)
+        except PatternTimeout as e:
+            e.pattern = self.name
+            raise
+        finally:
+            seconds = self.clock.seconds
+            seconds[self.name] = seconds.get(self.name, 0.0) + perf_counter() - start
+
+    def sub(self, replacement: str, text: str) -> str:
+        """Timed ``sub``."""
+        start = perf_counter()
+        try:
+            return self.pattern.sub(replacement, text)
+        except PatternTimeout as e:
+            e.pattern = self.name
+            raise
+        finally:
+            seconds = self.clock.seconds
+            seconds[self.name] = seconds.get(self.name, 0.0) + perf_counter() - start
+
+
+def timed_patterns(patterns: Mapping[str, Any], clock: PatternClock, untimed: Collection[str] = ()) -> Dict[str, Any]:
+    """Wrap every pattern of a registry, except those named in ``untimed``, so its calls are timed into ``clock``."""
+    return {
+        name: pattern if name in untimed else TimedPattern(name, pattern, clock) for name, pattern in patterns.items()
+    }
+
+
+# Code of the ``TimedPattern`` methods that match, to find a call in progress
+_TIMED_CODE = {
+    getattr(TimedPattern, method).__code__ for method in ("findall", "search", "findall_in", "search_in", "sub")
+}
+
+
+def _pattern_call_start(frame: Optional[FrameType]) -> Optional[float]:
+    """Start of the ``TimedPattern`` call a signal interrupted, or None outside pattern calls."""
+    while frame is not None:
+        if frame.f_code in _TIMED_CODE:
+            return frame.f_locals.get("start")
+        frame = frame.f_back
+    return None
@@ -0,0 +1,245 @@
+"""Registry of regex patterns used for contract data extraction.
+
+Every pattern is compiled once at import time and shared by all parsers in the
+process. Patterns shaped like ``[class]+<remainder>`` (a greedy character run
+followed by a keyword) are wrapped in ``GuidedPattern``, which only attempts a
+match where the remainder actually occurs instead of retrying at every position
+of every long run of letters. Patterns that start with one of a few keywords
+are wrapped in ``AnchoredPattern``, which is tried only at those keywords on
+the lines a ``ParsedDocument`` has indexed them on.
+
+Patterns that backtracked polynomially on adversarial text are written so the
+engine has fewer ways to fail: possessive runs where the next token cannot
+start inside them, a ``(?<!\d)`` guard on numbers that can only match from
+the start of a digit run, and single-digit groups behind greedy ``[\s\w]*``
+bridges, which never left the group more than its last digit anyway. Matches
+are unchanged; the extractor time budget (``pattern_budget``) bounds the rest.
+"""
+
+import re
+from bisect import bisect_right
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
+
+COMPANY_SUFFIX = r'(?:LLC|Inc|Corp|Corporation|Ltd|Limited|Company|Co\.|Partners)'
+SERVICE_KEYWORD = r'(?:Consulting|Assessment|Training|Support|Service|Management)'
+
+
+class GuidedPattern:
+    """Pattern of the form ``<run>+<remainder>`` with anchor-guided matching.
+
+    A match can only start in the run of ``run`` characters immediately
+    preceding an occurrence of ``remainder``. Those occurrences are located
+    with a single linear scan, and the wrapped pattern is then matched only at
+    the leftmost feasible start, so results are identical to
+    ``pattern.findall`` while avoiding the quadratic retry of the greedy run.
+    """
+
+    def __init__(self, pattern: str, run: str, remainder: str, flags: int = 0):
+        """Compile the full pattern, its leading run and the remainder anchor."""
+        self.pattern = re.compile(pattern, flags)
+        self._run = re.compile(f'{run}+', flags)
+        self._anchor = re.compile(f'(?={remainder})', flags)
+
+    @property
+    def groups(self) -> int:
+        """Number of capture groups in the wrapped pattern."""
+        return self.pattern.groups
+
+    def finditer(self, text: str) -> Iterator[re.Match]:
+        """Yield the same matches as ``pattern.finditer(text)``."""
+        anchors = [m.start() for m in self._anchor.finditer(text)]
+        if not anchors:
+            return
+
+        runs = [(m.start(), m.end()) for m in self._run.finditer(text)]
+        run_starts = [start for start, _ in runs]
+
+        pos = 0
+        for anchor in anchors:
+            # The run must cover at least one character before the anchor
+            if anchor - 1 < pos:
+                continue
+            index = bisect_right(run_starts, anchor - 1) - 1
+            if index < 0 or runs[index][1] < anchor:
+                continue
+
+            start = max(pos, runs[index][0])
+            match = self.pattern.match(text, start) or self.pattern.search(text, start)
+            if match is None:
+                return
+
+            yield match
+            pos = match.end() if match.end() > match.start() else match.end() + 1
+
+    def findall(self, text: str) -> List[Any]:
+        """Return the same result as ``pattern.findall(text)``."""
+        return _findall_result(self.finditer(text), self.groups)
+
+    def search(self, text: str):
+        """Return the first match, as ``pattern.search(text)`` would."""
+        return next(self.finditer(text), None)
+
+
+class AnchoredPattern:
+    """Pattern whose every match starts with one of its anchor keywords.
+
+    ``ParsedDocument`` indexes the lines each anchor occurs on, and the
+    ``*_in`` methods try the pattern only at anchor occurrences on those
+    lines instead of at every position of the text, with the same results as
+    ``pattern.findall`` and ``pattern.search``. With ``leading=False`` the
+    anchors need only occur somewhere in every match: the pattern then runs
+    over the whole text, but not at all on documents without an anchor.
+    """
+
+    def __init__(self, pattern: str, anchors: Tuple[str, ...], flags: int = 0, leading: bool = True):
+        """Compile the pattern and a lookahead finding where each anchor starts."""
+        self.pattern = re.compile(pattern, flags)
+        self.anchors = anchors
+        self.leading = leading
+        self._anchor = re.compile('(?=' + '|'.join(re.escape(anchor) for anchor in anchors) + ')', flags)
+
+    @property
+    def groups(self) -> int:
+        """Number of capture groups in the wrapped pattern."""
+        return self.pattern.groups
+
+    def findall(self, text: str) -> List[Any]:
+        """``pattern.findall`` over the whole text."""
+        return self.pattern.findall(text)
+
+    def search(self, text: str):
+        """``pattern.search`` over the whole text."""
+        return self.pattern.search(text)
+
+    def finditer_in(self, document) -> Iterator[re.Match]:
+        """Yield the same matches as ``pattern.finditer(document.text)``."""
+        text = document.text
+        pos = 0
+        for line in document.lines_with(self.anchors):
+            start, end = document.line_span(line)
+            if end <= pos:
+                continue
+            # Anchors never span a line break, so each one starts and ends within its line
+            for anchor in self._anchor.finditer(text, max(start, pos), end):
+                if anchor.start() < pos:
+                    continue
+                match = self.pattern.match(text, anchor.start())
+                if match:
+                    yield match
+                    pos = match.end()
+
+    def findall_in(self, document) -> List[Any]:
+        """Return the same result as ``pattern.findall(document.text)``."""
+        if not self.leading:
+            return self.pattern.findall(document.text) if document.lines_with(self.anchors) else []
+        return _findall_result(self.finditer_in(document), self.groups)
+
+    def search_in(self, document):
+        """Return the first match, as ``pattern.search(document.text)`` would."""
+        if not self.leading:
+            return self.pattern.search(document.text) if document.lines_with(self.anchors) else None
+        return next(self.finditer_in(document), None)
+
+
+def _findall_result(matches: Iterable[re.Match], groups: int) -> List[Any]:
+    """Shape matches the way ``re.findall`` does for a pattern with ``groups`` groups."""
+    results = []
+    for match in matches:
+        if groups == 0:
+            results.append(match.group(0))
+        elif groups == 1:
+            results.append(match.group(1) or '')
+        else:
+            results.append(match.groups(''))
+    return results
+
+
+PATTERNS: Dict[str, Any] = {
+    # Parties
+    'company_name': GuidedPattern(rf'([A-Za-z\s&]+{COMPANY_SUFFIX})', r'[A-Za-z\s&]', COMPANY_SUFFIX, re.IGNORECASE),
+    'consultant_company': AnchoredPattern(rf'(?:\*\*Consultant:\*\*|Consultant:)\s*\n?([A-Za-z\s&]+{COMPANY_SUFFIX})', ('**Consultant:**', 'Consultant:'), re.IGNORECASE),
+    'client_company': AnchoredPattern(rf'(?:\*\*Client:\*\*|Client:)\s*\n?([A-Za-z\s&]+{COMPANY_SUFFIX})', ('**Client:**', 'Client:'), re.IGNORECASE),
+    'service_provider': AnchoredPattern(rf'(?:\*\*Service Provider:\*\*|Service Provider:)\s*\n?([A-Za-z\s&]+{COMPANY_SUFFIX})', ('**Service Provider:**', 'Service Provider:'), re.IGNORECASE),
+    'broad_company': re.compile(rf'(?:^|\n|\.\s+)([A-Z][A-Za-z\s&,.-]{{3,35}}{COMPANY_SUFFIX})(?:\s|$|\n|\.)', re.IGNORECASE | re.MULTILINE),
+    'customer_labeled': AnchoredPattern(rf'(?:Client|Customer|Purchaser):\s*([A-Z][A-Za-z\s&,.-]{{3,35}}{COMPANY_SUFFIX})', ('Client:', 'Customer:', 'Purchaser:'), re.IGNORECASE),
+    'customer_between': AnchoredPattern(rf'(?:Agreement between|Contract between)\s+[^,]+,\s*and\s+([A-Z][A-Za-z\s&,.-]{{3,35}}{COMPANY_SUFFIX})', ('Agreement between', 'Contract between'), re.IGNORECASE),
+    'customer_with': AnchoredPattern(rf'(?:with|for)\s+([A-Z][A-Za-z\s&,.-]{{3,35}}{COMPANY_SUFFIX})(?:\s|$|\n|\.)', ('with', 'for'), re.IGNORECASE),
+    'company_prefix_noise': re.compile(r'^(?:Service Provider|liability|limited to|between|with|and)\s+', re.IGNORECASE),
+    'company_suffix_noise': re.compile(r'\s+(?:liability|limited to|shall|will|may).*$', re.IGNORECASE),
+    'whitespace': re.compile(r'\s+'),
+
+    # Contact details
+    'email': AnchoredPattern(r'Email:\s*([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})', ('Email:',), re.IGNORECASE),
+    'any_email': AnchoredPattern(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', ('@',), leading=False),
+    'phone': AnchoredPattern(r'Phone:\s*(\([0-9]{3}\)\s*[0-9]{3}-[0-9]{4})', ('Phone:',), re.IGNORECASE),
+    'any_phone': re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),
+    'address': re.compile(r'(\d+\s+[A-Za-z0-9\s,.-]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Way|Place|Pl)[\s,]*+[A-Za-z\s,]*+\d{5})', re.IGNORECASE),
+    'tax_id': AnchoredPattern(r'(?:Tax ID|EIN|Federal EIN):\s*(\d{2}-\d{7})', ('Tax ID', 'EIN', 'Federal EIN'), re.IGNORECASE),
+
+    # Financial details
+    'currency_amount': re.compile(r'\$([0-9,]+\.?[0-9]*)', re.IGNORECASE),
+    'monthly_amount': AnchoredPattern(r'Monthly[^$]*\$([0-9,]+\.?[0-9]*)', ('Monthly',), re.IGNORECASE),
+    'annual_amount': AnchoredPattern(r'Annual[^$]*\$([0-9,]+\.?[0-9]*)', ('Annual',), re.IGNORECASE),
+    'hourly_rate': AnchoredPattern(r'Rate:\s*\$([0-9,]+\.?[0-9]*)/hour', ('Rate:',), re.IGNORECASE),
+    'fixed_fee': AnchoredPattern(r'Fixed fee:\s*\$([0-9,]+\.?[0-9]*)', ('Fixed fee:',), re.IGNORECASE),
+    'service_rate': GuidedPattern(
+        rf'([A-Za-z\s]+{SERVICE_KEYWORD})[\s\-:]*\$([0-9,]+\.?[0-9]*)/?(hour|fixed|month)?',
+        r'[A-Za-z\s]', rf'{SERVICE_KEYWORD}[\s\-:]*\$[0-9,]', re.IGNORECASE
+    ),
+    'hourly_line_item': GuidedPattern(
+        r'([A-Za-z\s]+):\s*([0-9]+)\s*hours?\s*\(\$([0-9,]+\.?[0-9]*)\)',
+        r'[A-Za-z\s]', r':\s*[0-9]+\s*hours?\s*\(\$[0-9,]+\.?[0-9]*\)', re.IGNORECASE
+    ),
+    'monthly_total': AnchoredPattern(r'(?:Monthly|Per Month)[\s\w]*Total[\s:]*\$([0-9,]+\.?[0-9]*)', ('Monthly', 'Per Month'), re.IGNORECASE),
+    'setup_fee': AnchoredPattern(r'(?:Setup|Initial|Project)[\s\w]*Fee[\s:]*\$([0-9,]+\.?[0-9]*)', ('Setup', 'Initial', 'Project'), re.IGNORECASE),
+    'annual_value': AnchoredPattern(r'(?:Annual|Yearly)[\s\w]*(?:Value|Total|Amount)[\s:]*\$([0-9,]+\.?[0-9]*)', ('Annual', 'Yearly'), re.IGNORECASE),
+
+    # Payment structure
+    'payment_terms': AnchoredPattern(r'Net\s+(\d+)\s+days?', ('Net',), re.IGNORECASE),
+    'alt_payment_terms': AnchoredPattern(r'(?:payment|due)[\s\w]*(\d)[\s]*(?:days?|months?)', ('payment', 'due'), re.IGNORECASE),
+    'payment_method': AnchoredPattern(r'(?:Payment Method|Payment Options?):\s*([^.\n]+)', ('Payment Method', 'Payment Option'), re.IGNORECASE),
+    'billing_schedule': AnchoredPattern(r'(?:billed|invoiced|charged)[\s\w]*(?:monthly|quarterly|annually|yearly)', ('billed', 'invoiced', 'charged'), re.IGNORECASE),
+    'late_fee': AnchoredPattern(r'(?:late fee|penalty|interest)[\s\w]*([0-9.]+%)', ('late fee', 'penalty', 'interest'), re.IGNORECASE),
+    'discount': AnchoredPattern(r'(?:discount|early payment)[\s\w]*([0-9.]+%)', ('discount', 'early payment'), re.IGNORECASE),
+    'bank_name': AnchoredPattern(r'(?:bank|financial institution)[\s:]*([A-Za-z\s&]+)', ('bank', 'financial institution'), re.IGNORECASE),
+    'bank_account': AnchoredPattern(r'(?:account|acct)[\s#:]*([A-Za-z0-9-]+)', ('account', 'acct'), re.IGNORECASE),
+    'routing_number': AnchoredPattern(r'(?:routing|aba)[\s#:]*([0-9]{9})', ('routing', 'aba'), re.IGNORECASE),
+    'swift_code': AnchoredPattern(r'(?:swift|bic)[\s:]*([A-Z0-9]{8,11})', ('swift', 'bic'), re.IGNORECASE),
+
+    # Account information
+    'account_number': AnchoredPattern(r'(?:Account ID|Client Account|Agreement ID):\s*([A-Z0-9-]+)', ('Account ID', 'Client Account', 'Agreement ID'), re.IGNORECASE),
+    'contract_number': AnchoredPattern(r'(?:Contract Number|Agreement ID):\s*([A-Z0-9-]+)', ('Contract Number', 'Agreement ID'), re.IGNORECASE),
+    'billing_phone': AnchoredPattern(r'(?:billing|accounting|finance)[\s\w]*(?:phone|tel)[\s:]*(\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})', ('billing', 'accounting', 'finance'), re.IGNORECASE),
+    'billing_contact': AnchoredPattern(r'(?:billing contact|accounts receivable|finance contact)[\s:]*([A-Za-z\s]+)', ('billing contact', 'accounts receivable', 'finance contact'), re.IGNORECASE),
+
+    # Revenue classification
+    'contract_term': AnchoredPattern(r'(?:Term|Duration|Contract Period):\s*(\d+)\s*months?', ('Term:', 'Duration:', 'Contract Period:'), re.IGNORECASE),
+    'auto_renewal': AnchoredPattern(r'(?:Automatic|Auto[- ]?renewal):\s*(\d+)[- ]?month', ('Auto',), re.IGNORECASE),
+    'recurring_keyword': AnchoredPattern(r'recurring|subscription|monthly|quarterly|annual', ('recurring', 'subscription', 'monthly', 'quarterly', 'annual'), re.IGNORECASE),
+    'one_time_keyword': AnchoredPattern(r'one.?time|single payment|lump sum', ('one', 'single payment', 'lump sum'), re.IGNORECASE),
+    'monthly_keyword': AnchoredPattern(r'monthly|per month', ('monthly', 'per month'), re.IGNORECASE),
+    'quarterly_keyword': AnchoredPattern(r'quarterly|per quarter', ('quarterly', 'per quarter'), re.IGNORECASE),
+    'annual_keyword': AnchoredPattern(r'annually|yearly|per year', ('annually', 'yearly', 'per year'), re.IGNORECASE),
+    'termination_notice': AnchoredPattern(r'(?:termination|cancellation)[\s\w]*([0-9])[\s]*(?:days?|months?)', ('termination', 'cancellation'), re.IGNORECASE),
+    'pricing_adjustment': AnchoredPattern(r'(?:price increase|adjustment)[\s\w]*([0-9.]+%)', ('price increase', 'adjustment'), re.IGNORECASE),
+
+    # SLA terms
+    'uptime': AnchoredPattern(r'(?<!\d)(\d++(?:\.\d*+)?%)\s*(?:uptime|availability)', ('uptime', 'availability'), re.IGNORECASE, leading=False),
+    'response_time': AnchoredPattern(r'(?<!\d)(\d++)\s*hours?\s*(?:response|within)', ('response', 'within'), re.IGNORECASE, leading=False),
+    'critical_response': AnchoredPattern(r'(?:critical|emergency)[\s\w]*([0-9])[\s]*(?:hours?|minutes?)', ('critical', 'emergency'), re.IGNORECASE),
+    'high_response': AnchoredPattern(r'(?:high priority|urgent)[\s\w]*([0-9])[\s]*(?:hours?|minutes?)', ('high priority', 'urgent'), re.IGNORECASE),
+    'medium_response': AnchoredPattern(r'(?:medium|normal)[\s\w]*([0-9])[\s]*(?:hours?|minutes?)', ('medium', 'normal'), re.IGNORECASE),
+    'low_response': AnchoredPattern(r'(?:low priority|routine)[\s\w]*([0-9])[\s]*(?:hours?|days?)', ('low priority', 'routine'), re.IGNORECASE),
+    'system_response_time': AnchoredPattern(r'(?:system response|response time)[\s\w]*([0-9.]+)[\s]*(?:seconds?|ms)', ('system response', 'response time'), re.IGNORECASE),
+    'backup_rate': AnchoredPattern(r'(?:backup success|backup rate)[\s\w]*([0-9.]+%)', ('backup success', 'backup rate'), re.IGNORECASE),
+    'service_credit': AnchoredPattern(r'(?:service credit|penalty)[\s\w]*([0-9.]+%)[\s\w]*(?:below|under)[\s]*([0-9.]+%)', ('service credit', 'penalty'), re.IGNORECASE),
+}
+
+# Patterns applied to short matched values rather than to the document, which
+# take less time to match than to time
+CLEANUP_PATTERNS = ('company_prefix_noise', 'company_suffix_noise', 'whitespace')
+
+# Keywords a ``ParsedDocument`` indexes: the anchors of every anchored pattern, lower-cased
+ANCHOR_KEYWORDS: List[str] = sorted({
+    anchor.lower() for pattern in PATTERNS.values() if isinstance(pattern, AnchoredPattern) for anchor in pattern.anchors
+})
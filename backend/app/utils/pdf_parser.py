@@ -1,89 +1,104 @@
 """PDF parsing utilities with regex-based data extraction."""
 
-import re
 import logging
-import io
-from typing import Dict, Any, Optional, List
+import mmap
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, Iterator, Iterable, Union, BinaryIO, Tuple
 import PyPDF2
 from io import BytesIO
 from app.models import ExtractedData, Parties, PartyInfo, AuthorizedRepresentative, AuthorizedRepresentatives
 from app.models import AccountInfo, BillingContact, FinancialDetails, PaymentStructure, LineItem
 from app.models import BankingInfo, RevenueClassification, SLATerms, ResponseTimes, PerformanceMetrics, ServiceCredits, GapAnalysis
+from app.config import settings
+from app.utils.patterns import PATTERNS, CLEANUP_PATTERNS
+from app.utils.document import ParsedDocument
+from app.utils.pattern_budget import PatternBudget, PatternClock, PatternTimeout, timed_patterns
+from app.utils.metrics import StageTimings, stage_timer
 
 logger = logging.getLogger(__name__)
 
+# PDF content as bytes, or a seekable binary stream such as a memory map
+PDFContent = Union[bytes, BinaryIO, mmap.mmap]
+
+
+@contextmanager
+def map_pdf(file_path: str) -> Iterator[mmap.mmap]:
+    """Map a stored PDF read-only; pages are loaded only as the reader touches them."""
+    with open(file_path, "rb") as pdf_file:
+        with mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
 
 class PDFParser:
     """PDF contract parser with regex-based data extraction."""
     
     def __init__(self):
         """Initialize PDF parser with regex patterns."""
+        self.pattern_clock = PatternClock()
         self.patterns = self._initialize_patterns()
     
     def _initialize_patterns(self) -> Dict[str, Any]:
-        """Initialize regex patterns for data extraction."""
-        return {
-            'company_name': re.compile(r'([A-Za-z\s&]+(?:LLC|Inc|Corp|Corporation|Ltd|Limited|Company|Co\.|Partners))', re.IGNORECASE),
-            'consultant_company': re.compile(r'(?:\*\*Consultant:\*\*|Consultant:)\s*\n?([A-Za-z\s&]+(?:LLC|Inc|Corp|Corporation|Ltd|Limited|Company|Co\.|Partners))', re.IGNORECASE),
-            'client_company': re.compile(r'(?:\*\*Client:\*\*|Client:)\s*\n?([A-Za-z\s&]+(?:LLC|Inc|Corp|Corporation|Ltd|Limited|Company|Co\.|Partners))', re.IGNORECASE),
-            'service_provider': re.compile(r'(?:\*\*Service Provider:\*\*|Service Provider:)\s*\n?([A-Za-z\s&]+(?:LLC|Inc|Corp|Corporation|Ltd|Limited|Company|Co\.|Partners))', re.IGNORECASE),
-            'email': re.compile(r'Email:\s*([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,})', re.IGNORECASE),
-            'phone': re.compile(r'Phone:\s*(\([0-9]{3}\)\s*[0-9]{3}-[0-9]{4})', re.IGNORECASE),
-            'address': re.compile(r'(\d+\s+[A-Za-z0-9\s,.-]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Way|Place|Pl)[\s,]*[A-Za-z\s,]*\d{5})', re.IGNORECASE),
-            'tax_id': re.compile(r'(?:Tax ID|EIN|Federal EIN):\s*(\d{2}-\d{7})', re.IGNORECASE),
-            'currency_amount': re.compile(r'\$([0-9,]+\.?[0-9]*)', re.IGNORECASE),
-            'monthly_amount': re.compile(r'Monthly[^$]*\$([0-9,]+\.?[0-9]*)', re.IGNORECASE),
-            'annual_amount': re.compile(r'Annual[^$]*\$([0-9,]+\.?[0-9]*)', re.IGNORECASE),
-            'hourly_rate': re.compile(r'Rate:\s*\$([0-9,]+\.?[0-9]*)/hour', re.IGNORECASE),
-            'fixed_fee': re.compile(r'Fixed fee:\s*\$([0-9,]+\.?[0-9]*)', re.IGNORECASE),
-            'payment_terms': re.compile(r'Net\s+(\d+)\s+days?', re.IGNORECASE),
-            'contract_term': re.compile(r'(?:Term|Duration|Contract Period):\s*(\d+)\s*months?', re.IGNORECASE),
-            'auto_renewal': re.compile(r'(?:Automatic|Auto[- ]?renewal):\s*(\d+)[- ]?month', re.IGNORECASE),
-            'uptime': re.compile(r'(\d+\.?\d*%)\s*(?:uptime|availability)', re.IGNORECASE),
-            'response_time': re.compile(r'(\d+)\s*hours?\s*(?:response|within)', re.IGNORECASE),
-            'account_number': re.compile(r'(?:Account ID|Client Account|Agreement ID):\s*([A-Z0-9-]+)', re.IGNORECASE),
-            'contract_number': re.compile(r'(?:Contract Number|Agreement ID):\s*([A-Z0-9-]+)', re.IGNORECASE),
-            'payment_method': re.compile(r'(?:Payment Method|Payment Options?):\s*([^.\n]+)', re.IGNORECASE)
-        }
+        """Return the shared registry of regex patterns, extraction pattern calls timed into ``pattern_clock``."""
+        return timed_patterns(PATTERNS, self.pattern_clock, untimed=CLEANUP_PATTERNS)
     
-    async def extract_text_from_pdf(self, file_content: bytes) -> str:
-        """Extract text content from PDF file."""
+    def _open_pdf(self, pdf_content: PDFContent) -> PyPDF2.PdfReader:
+        """Open a PDF reader; streams and memory maps are read in place, bytes without copying."""
+        stream = BytesIO(pdf_content) if isinstance(pdf_content, bytes) else pdf_content
+        return PyPDF2.PdfReader(stream)
+    
+    def iter_page_texts(self, pdf_content: PDFContent) -> Iterator[str]:
+        """Yield the text of each PDF page in order, extracting lazily."""
         try:
-            pdf_file = BytesIO(file_content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            
-            text = ""
+            pdf_reader = self._open_pdf(pdf_content)
             for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            
-            return text
+                yield page.extract_text()
+        except Exception as e:
+            logger.error(f"Error extracting text from PDF: {str(e)}")
+            raise ValueError(f"Failed to extract text from PDF: {str(e)}")
+    
+    def extract_page_texts(self, pdf_content: PDFContent, start: int = 0,
+                           stop: Optional[int] = None) -> Tuple[int, List[str]]:
+        """Extract the text of pages ``start`` to ``stop`` and return it with the page count."""
+        try:
+            pdf_reader = self._open_pdf(pdf_content)
+            page_count = len(pdf_reader.pages)
+            stop = page_count if stop is None else min(stop, page_count)
+            return page_count, [pdf_reader.pages[index].extract_text() for index in range(start, stop)]
         except Exception as e:
-            logger.error(f"Error extracting text from PDF: {e}")
+            logger.error(f"Error extracting text from PDF: {str(e)}")
             raise ValueError(f"Failed to extract text from PDF: {str(e)}")
     
-    def _extract_parties(self, text: str) -> Parties:
+    @staticmethod
+    def join_page_texts(page_texts: Iterable[str]) -> str:
+        """Join page texts in order, one line break after each page."""
+        return "".join(f"{page_text}\n" for page_text in page_texts)
+    
+    def extract_text_from_pdf(self, pdf_content: PDFContent) -> str:
+        """Extract text content from PDF bytes, one line break after each page."""
+        return self.join_page_texts(self.iter_page_texts(pdf_content))
+    
+    def _extract_parties(self, document: ParsedDocument) -> Parties:
         """Extract party information from contract text."""
         parties = Parties()
         
         # Extract all contact information first
-        emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-        phones = re.findall(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text)
-        addresses = re.findall(r'\d+\s+[A-Za-z0-9\s,.-]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd|Way|Place|Pl)[\s,]*[A-Za-z\s,]*\d{5}', text, re.IGNORECASE)
-        tax_ids = re.findall(r'(?:Tax ID|EIN|Federal EIN):\s*(\d{2}-\d{7})', text, re.IGNORECASE)
+        emails = self.patterns['any_email'].findall_in(document)
+        phones = self.patterns['any_phone'].findall_in(document)
+        addresses = self.patterns['address'].findall_in(document)
+        tax_ids = self.patterns['tax_id'].findall_in(document)
         
         # Find all company names using multiple patterns
-        company_matches = self.patterns['company_name'].findall(text)
+        company_matches = self.patterns['company_name'].findall_in(document)
         
         # Additional broad patterns for company detection with better boundaries
-        broad_company_pattern = re.compile(r'(?:^|\n|\.\s+)([A-Z][A-Za-z\s&,.-]{3,35}(?:LLC|Inc|Corp|Corporation|Ltd|Limited|Company|Co\.|Partners))(?:\s|$|\n|\.)', re.IGNORECASE | re.MULTILINE)
-        broad_matches = broad_company_pattern.findall(text)
+        broad_matches = self.patterns['broad_company'].findall_in(document)
         
         # Clean up company names - remove newlines and extra spaces
         def clean_company_name(name):
-            cleaned = re.sub(r'\s+', ' ', name.replace('\n', ' ')).strip()
+            cleaned = self.patterns['whitespace'].sub(' ', name.replace('\n', ' ')).strip()
             # Remove common prefixes/suffixes that aren't part of company names
-            cleaned = re.sub(r'^(?:Service Provider|liability|limited to|between|with|and)\s+', '', cleaned, flags=re.IGNORECASE)
-            cleaned = re.sub(r'\s+(?:liability|limited to|shall|will|may).*$', '', cleaned, flags=re.IGNORECASE)
+            cleaned = self.patterns['company_prefix_noise'].sub('', cleaned)
+            cleaned = self.patterns['company_suffix_noise'].sub('', cleaned)
             return cleaned.strip()
         
         # Combine and clean all company matches
@@ -102,9 +117,9 @@ class PDFParser:
                 valid_companies.append(company)
         
         # Try specific patterns first
-        consultant_match = self.patterns['consultant_company'].search(text)
-        service_provider_match = self.patterns['service_provider'].search(text)
-        client_match = self.patterns['client_company'].search(text)
+        consultant_match = self.patterns['consultant_company'].search_in(document)
+        service_provider_match = self.patterns['service_provider'].search_in(document)
+        client_match = self.patterns['client_company'].search_in(document)
         
         # Log for debugging
         logger.info(f"Found valid companies: {valid_companies}")
@@ -133,7 +148,7 @@ class PDFParser:
                 provider_phone = phones[0]
             if addresses:
                 # Clean up address - remove newlines and extra spaces
-                provider_address = re.sub(r'\s+', ' ', addresses[0].replace('\n', ' ')).strip()
+                provider_address = self.patterns['whitespace'].sub(' ', addresses[0].replace('\n', ' ')).strip()
             if tax_ids:
                 provider_tax_id = tax_ids[0]
             
@@ -159,13 +174,13 @@ class PDFParser:
         # If no different company found, look for patterns indicating customer
         if not customer_name:
             customer_patterns = [
-                re.compile(r'(?:Client|Customer|Purchaser):\s*([A-Z][A-Za-z\s&,.-]{3,35}(?:LLC|Inc|Corp|Corporation|Ltd|Limited|Company|Co\.|Partners))', re.IGNORECASE),
-                re.compile(r'(?:Agreement between|Contract between)\s+[^,]+,\s*and\s+([A-Z][A-Za-z\s&,.-]{3,35}(?:LLC|Inc|Corp|Corporation|Ltd|Limited|Company|Co\.|Partners))', re.IGNORECASE),
-                re.compile(r'(?:with|for)\s+([A-Z][A-Za-z\s&,.-]{3,35}(?:LLC|Inc|Corp|Corporation|Ltd|Limited|Company|Co\.|Partners))(?:\s|$|\n|\.)', re.IGNORECASE)
+                self.patterns['customer_labeled'],
+                self.patterns['customer_between'],
+                self.patterns['customer_with']
             ]
             
             for pattern in customer_patterns:
-                match = pattern.search(text)
+                match = pattern.search_in(document)
                 if match:
                     potential_customer = clean_company_name(match.group(1))
                     if (potential_customer != service_provider_name and 
@@ -187,7 +202,7 @@ class PDFParser:
                 customer_phone = phones[1]
             if len(addresses) > 1:
                 # Clean up address - remove newlines and extra spaces
-                customer_address = re.sub(r'\s+', ' ', addresses[1].replace('\n', ' ')).strip()
+                customer_address = self.patterns['whitespace'].sub(' ', addresses[1].replace('\n', ' ')).strip()
             if len(tax_ids) > 1:
                 customer_tax_id = tax_ids[1]
             
@@ -201,29 +216,28 @@ class PDFParser:
         
         return parties
     
-    def _extract_financial_details(self, text: str) -> FinancialDetails:
+    def _extract_financial_details(self, document: ParsedDocument) -> FinancialDetails:
         """Extract financial information from contract text."""
         financial = FinancialDetails()
         
         # Extract all currency amounts
-        currency_amounts = self.patterns['currency_amount'].findall(text)
+        currency_amounts = self.patterns['currency_amount'].findall_in(document)
         amounts = [float(amount.replace(',', '')) for amount in currency_amounts]
         
         # Extract specific amounts from the contract
-        monthly_amounts = self.patterns['monthly_amount'].findall(text)
-        annual_amounts = self.patterns['annual_amount'].findall(text)
-        hourly_rates = self.patterns['hourly_rate'].findall(text)
-        fixed_fees = self.patterns['fixed_fee'].findall(text)
+        monthly_amounts = self.patterns['monthly_amount'].findall_in(document)
+        annual_amounts = self.patterns['annual_amount'].findall_in(document)
+        hourly_rates = self.patterns['hourly_rate'].findall_in(document)
+        fixed_fees = self.patterns['fixed_fee'].findall_in(document)
         
         # Extract line items using dynamic patterns
         line_items = []
         
         # Pattern to match service descriptions with rates
-        service_rate_pattern = re.compile(r'([A-Za-z\s]+(?:Consulting|Assessment|Training|Support|Service|Management))[\s\-:]*\$([0-9,]+\.?[0-9]*)/?(hour|fixed|month)?', re.IGNORECASE)
-        service_matches = service_rate_pattern.findall(text)
+        service_matches = self.patterns['service_rate'].findall_in(document)
         
         for service, rate, unit in service_matches:
-            service_name = re.sub(r'\s+', ' ', service.replace('\n', ' ')).strip()
+            service_name = self.patterns['whitespace'].sub(' ', service.replace('\n', ' ')).strip()
             unit_price = float(rate.replace(',', ''))
             unit_type = unit.lower() if unit else "hour"
             
@@ -236,12 +250,11 @@ class PDFParser:
             ))
         
         # Pattern for hourly rates with quantities
-        hourly_pattern = re.compile(r'([A-Za-z\s]+):\s*([0-9]+)\s*hours?\s*\(\$([0-9,]+\.?[0-9]*)\)', re.IGNORECASE)
-        hourly_matches = hourly_pattern.findall(text)
+        hourly_matches = self.patterns['hourly_line_item'].findall_in(document)
         
         for service, hours, total in hourly_matches:
             line_items.append(LineItem(
-                service=re.sub(r'\s+', ' ', service.replace('\n', ' ')).strip(),
+                service=self.patterns['whitespace'].sub(' ', service.replace('\n', ' ')).strip(),
                 unit_price=float(total.replace(',', '')) / int(hours) if int(hours) > 0 else 0,
                 unit="hour",
                 quantity=int(hours),
@@ -252,16 +265,14 @@ class PDFParser:
         
         # Extract monthly costs using dynamic patterns
         monthly_costs = {}
-        monthly_pattern = re.compile(r'(?:Monthly|Per Month)[\s\w]*Total[\s:]*\$([0-9,]+\.?[0-9]*)', re.IGNORECASE)
-        monthly_matches = monthly_pattern.findall(text)
+        monthly_matches = self.patterns['monthly_total'].findall_in(document)
         
         if monthly_matches:
             monthly_costs["Monthly Total"] = float(monthly_matches[0].replace(',', ''))
         
         # Extract one-time costs using dynamic patterns  
         one_time_costs = {}
-        setup_pattern = re.compile(r'(?:Setup|Initial|Project)[\s\w]*Fee[\s:]*\$([0-9,]+\.?[0-9]*)', re.IGNORECASE)
-        setup_matches = setup_pattern.findall(text)
+        setup_matches = self.patterns['setup_fee'].findall_in(document)
         
         if setup_matches:
             one_time_costs["Setup Fee"] = float(setup_matches[0].replace(',', ''))
@@ -279,14 +290,13 @@ class PDFParser:
         financial.total_one_time = sum(one_time_costs.values()) if one_time_costs else 0
         
         # Extract annual contract value using dynamic patterns
-        annual_pattern = re.compile(r'(?:Annual|Yearly)[\s\w]*(?:Value|Total|Amount)[\s:]*\$([0-9,]+\.?[0-9]*)', re.IGNORECASE)
-        annual_matches = annual_pattern.findall(text)
+        annual_matches = self.patterns['annual_value'].findall_in(document)
         
         if annual_matches:
             financial.annual_contract_value = float(annual_matches[0].replace(',', ''))
         elif financial.total_monthly > 0:
             # Calculate based on contract term
-            term_matches = self.patterns['contract_term'].findall(text)
+            term_matches = document.memo('contract_term', self.patterns['contract_term'].findall_in, document)
             contract_months = int(term_matches[0]) if term_matches else 12
             financial.annual_contract_value = financial.total_monthly * contract_months
         
@@ -294,62 +304,54 @@ class PDFParser:
         
         return financial
     
-    def _extract_payment_structure(self, text: str) -> PaymentStructure:
+    def _extract_payment_structure(self, document: ParsedDocument) -> PaymentStructure:
         """Extract payment structure information."""
         payment = PaymentStructure()
         
         # Extract payment terms
-        payment_terms_matches = self.patterns['payment_terms'].findall(text)
+        payment_terms_matches = self.patterns['payment_terms'].findall_in(document)
         if payment_terms_matches:
             payment.payment_terms = f"Net {payment_terms_matches[0]} days"
         else:
             # Look for other payment term patterns
-            alt_terms_pattern = re.compile(r'(?:payment|due)[\s\w]*(\d+)[\s]*(?:days?|months?)', re.IGNORECASE)
-            alt_matches = alt_terms_pattern.findall(text)
+            alt_matches = self.patterns['alt_payment_terms'].findall_in(document)
             if alt_matches:
                 payment.payment_terms = f"Net {alt_matches[0]} days"
         
         # Extract payment method
-        payment_method_matches = self.patterns['payment_method'].findall(text)
+        payment_method_matches = self.patterns['payment_method'].findall_in(document)
         if payment_method_matches:
             payment.payment_method = payment_method_matches[0].strip()
         
         # Extract payment schedule
-        schedule_pattern = re.compile(r'(?:billed|invoiced|charged)[\s\w]*(?:monthly|quarterly|annually|yearly)', re.IGNORECASE)
-        schedule_matches = schedule_pattern.findall(text)
+        schedule_matches = self.patterns['billing_schedule'].findall_in(document)
         if schedule_matches:
             payment.payment_schedule = schedule_matches[0]
         else:
             # Default based on common patterns
-            if re.search(r'monthly|per month', text, re.IGNORECASE):
+            frequency = document.memo('billing_frequency', self._billing_frequency, document)
+            if frequency == 'monthly':
                 payment.payment_schedule = "Monthly recurring billing"
-            elif re.search(r'quarterly|per quarter', text, re.IGNORECASE):
+            elif frequency == 'quarterly':
                 payment.payment_schedule = "Quarterly billing"
-            elif re.search(r'annually|yearly|per year', text, re.IGNORECASE):
+            elif frequency == 'annual':
                 payment.payment_schedule = "Annual billing"
         
         # Extract late payment terms
-        late_fee_pattern = re.compile(r'(?:late fee|penalty|interest)[\s\w]*([0-9.]+%)', re.IGNORECASE)
-        late_fee_matches = late_fee_pattern.findall(text)
+        late_fee_matches = self.patterns['late_fee'].findall_in(document)
         if late_fee_matches:
             payment.late_payment_fee = f"{late_fee_matches[0]} per month on overdue amounts"
         
         # Extract discount terms
-        discount_pattern = re.compile(r'(?:discount|early payment)[\s\w]*([0-9.]+%)', re.IGNORECASE)
-        discount_matches = discount_pattern.findall(text)
+        discount_matches = self.patterns['discount'].findall_in(document)
         if discount_matches:
             payment.discount_terms = f"{discount_matches[0]} discount for early payment"
         
         # Extract banking information
-        bank_name_pattern = re.compile(r'(?:bank|financial institution)[\s:]*([A-Za-z\s&]+)', re.IGNORECASE)
-        account_pattern = re.compile(r'(?:account|acct)[\s#:]*([A-Za-z0-9-]+)', re.IGNORECASE)
-        routing_pattern = re.compile(r'(?:routing|aba)[\s#:]*([0-9]{9})', re.IGNORECASE)
-        swift_pattern = re.compile(r'(?:swift|bic)[\s:]*([A-Z0-9]{8,11})', re.IGNORECASE)
-        
-        bank_matches = bank_name_pattern.findall(text)
-        account_matches = account_pattern.findall(text)
-        routing_matches = routing_pattern.findall(text)
-        swift_matches = swift_pattern.findall(text)
+        bank_matches = self.patterns['bank_name'].findall_in(document)
+        account_matches = self.patterns['bank_account'].findall_in(document)
+        routing_matches = self.patterns['routing_number'].findall_in(document)
+        swift_matches = self.patterns['swift_code'].findall_in(document)
         
         if bank_matches or account_matches or routing_matches:
             payment.banking_info = BankingInfo(
@@ -361,23 +363,32 @@ class PDFParser:
         
         return payment
     
-    def _extract_account_info(self, text: str) -> AccountInfo:
+    def _billing_frequency(self, document: ParsedDocument) -> Optional[str]:
+        """First billing frequency mentioned by keyword, in order of precedence.
+        
+        Returns ``'monthly'``, ``'quarterly'``, ``'annual'`` or None. Shared by the
+        payment and revenue extractors through ``ParsedDocument.memo``.
+        """
+        for frequency in ('monthly', 'quarterly', 'annual'):
+            if self.patterns[f'{frequency}_keyword'].search_in(document):
+                return frequency
+        return None
+    
+    def _extract_account_info(self, document: ParsedDocument) -> AccountInfo:
         """Extract account information."""
         account = AccountInfo()
         
         # Extract account number
-        account_matches = self.patterns['account_number'].findall(text)
+        account_matches = self.patterns['account_number'].findall_in(document)
         if account_matches:
             account.account_number = account_matches[0]
         
         # Extract billing contact information
-        emails = self.patterns['email'].findall(text)
-        phone_pattern = re.compile(r'(?:billing|accounting|finance)[\s\w]*(?:phone|tel)[\s:]*(\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4})', re.IGNORECASE)
-        billing_phones = phone_pattern.findall(text)
+        emails = self.patterns['email'].findall_in(document)
+        billing_phones = self.patterns['billing_phone'].findall_in(document)
         
         # Extract billing contact name
-        contact_pattern = re.compile(r'(?:billing contact|accounts receivable|finance contact)[\s:]*([A-Za-z\s]+)', re.IGNORECASE)
-        contact_matches = contact_pattern.findall(text)
+        contact_matches = self.patterns['billing_contact'].findall_in(document)
         
         if emails or billing_phones or contact_matches:
             account.billing_contact = BillingContact(
@@ -388,70 +399,64 @@ class PDFParser:
         
         return account
     
-    def _extract_revenue_classification(self, text: str) -> RevenueClassification:
+    def _extract_revenue_classification(self, document: ParsedDocument) -> RevenueClassification:
         """Extract revenue classification information."""
         revenue = RevenueClassification()
         
         # Extract contract term
-        term_matches = self.patterns['contract_term'].findall(text)
+        term_matches = document.memo('contract_term', self.patterns['contract_term'].findall_in, document)
         if term_matches:
             revenue.contract_term = f"{term_matches[0]} months"
         
         # Extract auto-renewal terms
-        renewal_matches = self.patterns['auto_renewal'].findall(text)
+        renewal_matches = self.patterns['auto_renewal'].findall_in(document)
         if renewal_matches:
             revenue.auto_renewal = f"{renewal_matches[0]}-month terms"
         
         # Determine revenue type based on keywords
-        if re.search(r'recurring|subscription|monthly|quarterly|annual', text, re.IGNORECASE):
+        if self.patterns['recurring_keyword'].search_in(document):
             revenue.type = "recurring"
-        elif re.search(r'one.?time|single payment|lump sum', text, re.IGNORECASE):
+        elif self.patterns['one_time_keyword'].search_in(document):
             revenue.type = "one-time"
         else:
             revenue.type = "mixed"
         
         # Extract billing cycle
-        if re.search(r'monthly|per month', text, re.IGNORECASE):
+        frequency = document.memo('billing_frequency', self._billing_frequency, document)
+        if frequency == 'monthly':
             revenue.billing_cycle = "monthly"
-        elif re.search(r'quarterly|per quarter', text, re.IGNORECASE):
+        elif frequency == 'quarterly':
             revenue.billing_cycle = "quarterly"
-        elif re.search(r'annually|yearly|per year', text, re.IGNORECASE):
+        elif frequency == 'annual':
             revenue.billing_cycle = "annual"
         
         # Extract termination notice
-        termination_pattern = re.compile(r'(?:termination|cancellation)[\s\w]*([0-9]+)[\s]*(?:days?|months?)', re.IGNORECASE)
-        termination_matches = termination_pattern.findall(text)
+        termination_matches = self.patterns['termination_notice'].findall_in(document)
         if termination_matches:
             revenue.termination_notice = f"{termination_matches[0]} days written notice"
         
         # Extract pricing adjustments
-        pricing_pattern = re.compile(r'(?:price increase|adjustment)[\s\w]*([0-9.]+%)', re.IGNORECASE)
-        pricing_matches = pricing_pattern.findall(text)
+        pricing_matches = self.patterns['pricing_adjustment'].findall_in(document)
         if pricing_matches:
             revenue.pricing_adjustments = f"Limited to {pricing_matches[0]} annually"
         
         return revenue
     
-    def _extract_sla_terms(self, text: str) -> SLATerms:
+    def _extract_sla_terms(self, document: ParsedDocument) -> SLATerms:
         """Extract SLA terms and performance metrics."""
         sla = SLATerms()
         
         # Extract uptime commitment
-        uptime_matches = self.patterns['uptime'].findall(text)
+        uptime_matches = self.patterns['uptime'].findall_in(document)
         if uptime_matches:
             sla.uptime_commitment = f"{uptime_matches[0]} uptime guarantee"
         
         # Extract response times
-        response_time_matches = self.patterns['response_time'].findall(text)
-        critical_pattern = re.compile(r'(?:critical|emergency)[\s\w]*([0-9]+)[\s]*(?:hours?|minutes?)', re.IGNORECASE)
-        high_pattern = re.compile(r'(?:high priority|urgent)[\s\w]*([0-9]+)[\s]*(?:hours?|minutes?)', re.IGNORECASE)
-        medium_pattern = re.compile(r'(?:medium|normal)[\s\w]*([0-9]+)[\s]*(?:hours?|minutes?)', re.IGNORECASE)
-        low_pattern = re.compile(r'(?:low priority|routine)[\s\w]*([0-9]+)[\s]*(?:hours?|days?)', re.IGNORECASE)
-        
-        critical_matches = critical_pattern.findall(text)
-        high_matches = high_pattern.findall(text)
-        medium_matches = medium_pattern.findall(text)
-        low_matches = low_pattern.findall(text)
+        response_time_matches = self.patterns['response_time'].findall_in(document)
+        critical_matches = self.patterns['critical_response'].findall_in(document)
+        high_matches = self.patterns['high_response'].findall_in(document)
+        medium_matches = self.patterns['medium_response'].findall_in(document)
+        low_matches = self.patterns['low_response'].findall_in(document)
         
         sla.response_times = ResponseTimes(
             critical=f"{critical_matches[0]} hours" if critical_matches else "1 hour",
@@ -462,11 +467,8 @@ class PDFParser:
         
         # Extract performance metrics
         performance_metrics = {}
-        response_time_pattern = re.compile(r'(?:system response|response time)[\s\w]*([0-9.]+)[\s]*(?:seconds?|ms)', re.IGNORECASE)
-        backup_pattern = re.compile(r'(?:backup success|backup rate)[\s\w]*([0-9.]+%)', re.IGNORECASE)
-        
-        response_perf = response_time_pattern.findall(text)
-        backup_perf = backup_pattern.findall(text)
+        response_perf = self.patterns['system_response_time'].findall_in(document)
+        backup_perf = self.patterns['backup_rate'].findall_in(document)
         
         if response_perf:
             performance_metrics["system_response_time"] = f"< {response_perf[0]} seconds"
@@ -477,8 +479,7 @@ class PDFParser:
         
         # Extract service credits
         service_credits = []
-        credit_pattern = re.compile(r'(?:service credit|penalty)[\s\w]*([0-9.]+%)[\s\w]*(?:below|under)[\s]*([0-9.]+%)', re.IGNORECASE)
-        credit_matches = credit_pattern.findall(text)
+        credit_matches = self.patterns['service_credit'].findall_in(document)
         
         for credit_percent, threshold in credit_matches:
             service_credits.append(ServiceCredits(
@@ -491,11 +492,12 @@ class PDFParser:
         
         return sla
     
-    def _analyze_gaps(self, parties: Parties, financial_details: FinancialDetails, payment_structure: PaymentStructure, sla_terms: SLATerms) -> GapAnalysis:
-        """Analyze gaps in contract terms."""
+    def _analyze_gaps(self, parties: Parties, financial_details: FinancialDetails, payment_structure: PaymentStructure, sla_terms: SLATerms,
+                      skipped: Optional[List[str]] = None) -> GapAnalysis:
+        """Analyze gaps in contract terms, noting extractors skipped for exceeding their time budget."""
         missing_fields = []
         incomplete_fields = []
-        notes = []
+        notes = list(skipped or [])
         
         # Check parties completeness
         if not parties.service_provider or not parties.service_provider.name:
@@ -541,20 +543,6 @@ class PDFParser:
             notes="; ".join(notes) if notes else None
         )
     
-    def _extract_text_from_pdf(self, pdf_content: bytes) -> str:
-        """Extract text from PDF bytes."""
-        try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
-            text = ""
-            
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            
-            return text
-        except Exception as e:
-            logger.error(f"Error extracting text from PDF: {str(e)}")
-            raise ValueError(f"Failed to extract text from PDF: {str(e)}")
-    
     def calculate_confidence_score(self, extracted_data: ExtractedData) -> int:
         """Calculate confidence score based on data completeness (0-100)."""
         score = 0
@@ -605,37 +593,106 @@ class PDFParser:
         
         return min(score, 100)  # Cap at 100
     
-    def parse_contract(self, pdf_content: bytes) -> ExtractedData:
-        """Parse contract PDF and extract structured data."""
+    def parse_contract(self, pdf_content: PDFContent, timings: Optional[StageTimings] = None) -> ExtractedData:
+        """Parse contract PDF and extract structured data, timing each stage into ``timings``."""
         try:
             # Extract text from PDF
-            text = self._extract_text_from_pdf(pdf_content)
-            logger.info(f"Extracted text length: {len(text)} characters")
-            
-            # Parse different sections
-            parties = self._extract_parties(text)
-            financial_details = self._extract_financial_details(text)
-            payment_structure = self._extract_payment_structure(text)
-            account_info = self._extract_account_info(text)
-            revenue_classification = self._extract_revenue_classification(text)
-            sla_terms = self._extract_sla_terms(text)
-            
-            # Perform gap analysis
-            gap_analysis = self._analyze_gaps(parties, financial_details, payment_structure, sla_terms)
-            
-            return ExtractedData(
-                parties=parties,
-                financial_details=financial_details,
-                payment_structure=payment_structure,
-                account_info=account_info,
-                revenue_classification=revenue_classification,
-                sla_terms=sla_terms,
-                gap_analysis=gap_analysis
-            )
+            with stage_timer(timings)("extract_text"):
+                text = self.extract_text_from_pdf(pdf_content)
+            return self._extract_fields(text, timings)
             
         except Exception as e:
             logger.error(f"Error parsing contract: {str(e)}")
             raise ValueError(f"Failed to parse contract: {str(e)}")
+    
+    def parse_contract_text(self, text: str, timings: Optional[StageTimings] = None) -> ExtractedData:
+        """Extract structured data from contract text extracted beforehand."""
+        try:
+            return self._extract_fields(text, timings)
+        except Exception as e:
+            logger.error(f"Error parsing contract: {str(e)}")
+            raise ValueError(f"Failed to parse contract: {str(e)}")
+    
+    def _time_budget(self, text: str) -> float:
+        """Pattern time allowed to each extractor over ``text``, 0 if budgets are disabled.
+        
+        ``EXTRACTOR_TIME_BUDGET_SECONDS`` plus ``EXTRACTOR_TIME_BUDGET_PER_MB``
+        for every MB of text, so long contracts get time for the linear work
+        of scanning them and only runaway backtracking is cut short.
+        """
+        floor = settings.extractor_time_budget_seconds
+        if floor <= 0:
+            return 0.0
+        return floor + settings.extractor_time_budget_per_mb * len(text) / (1 << 20)
+    
+    def _run_extractor(self, name: str, extractor, empty, document: ParsedDocument, skipped: List[str],
+                       budget: float):
+        """Run a field extractor whose pattern calls may take ``budget`` seconds.
+        
+        An extractor that runs out of time yields the ``empty`` section, and
+        the pattern that was matching is recorded in ``skipped`` for the gap
+        analysis.
+        """
+        try:
+            with PatternBudget(budget, self.pattern_clock):
+                return extractor(document)
+        except PatternTimeout as e:
+            source = f"pattern {e.pattern}" if e.pattern else "extraction"
+            logger.warning(f"Skipped {name} extraction: {source} exceeded the {budget:.3g}s time budget")
+            skipped.append(f"{name} not extracted: {source} exceeded the {budget:.3g}s time budget")
+            return empty()
+    
+    def _extract_fields(self, text: str, timings: Optional[StageTimings] = None) -> ExtractedData:
+        """Run every field extractor over contract text, timing each pattern into ``timings``."""
+        logger.info(f"Extracted text length: {len(text)} characters")
+        stage = stage_timer(timings)
+        self.pattern_clock.reset()
+        skipped = []
+        
+        # Index the lines of the text once for every extractor
+        with stage("index_text"):
+            document = ParsedDocument(text)
+        
+        # Parse different sections, each within the extractor time budget
+        budget = self._time_budget(text)
+        with stage("parties"):
+            parties = self._run_extractor("parties", self._extract_parties, Parties, document, skipped, budget)
+        with stage("financial_details"):
+            financial_details = self._run_extractor(
+                "financial_details", self._extract_financial_details, FinancialDetails, document, skipped, budget
+            )
+        with stage("payment_structure"):
+            payment_structure = self._run_extractor(
+                "payment_structure", self._extract_payment_structure, PaymentStructure, document, skipped, budget
+            )
+        with stage("account_info"):
+            account_info = self._run_extractor(
+                "account_info", self._extract_account_info, AccountInfo, document, skipped, budget
+            )
+        with stage("revenue_classification"):
+            revenue_classification = self._run_extractor(
+                "revenue_classification", self._extract_revenue_classification, RevenueClassification,
+                document, skipped, budget
+            )
+        with stage("sla_terms"):
+            sla_terms = self._run_extractor("sla_terms", self._extract_sla_terms, SLATerms, document, skipped, budget)
+        
+        # Perform gap analysis
+        with stage("gap_analysis"):
+            gap_analysis = self._analyze_gaps(parties, financial_details, payment_structure, sla_terms, skipped)
+        
+        if timings is not None:
+            timings.add_patterns(self.pattern_clock.reset())
+        
+        return ExtractedData(
+            parties=parties,
+            financial_details=financial_details,
+            payment_structure=payment_structure,
+            account_info=account_info,
+            revenue_classification=revenue_classification,
+            sla_terms=sla_terms,
+            gap_analysis=gap_analysis
+        )
 
 
 # Global parser instance
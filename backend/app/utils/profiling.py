@@ -0,0 +1,131 @@
+"""Opt-in cProfile profiling of request handlers and contract processing.
+
+A request asks for a profile with the ``X-Profile`` header, carrying a token
+from ``PROFILING_ALLOWLIST``; the token is never read from the URL, which ends
+up in access logs. Profiles are
+collected in a ``ProfileCollector``: the API process profiles its own thread,
+and extraction workers profile their tasks and return the raw statistics with
+the task result, so a profile of processing a contract covers both the event
+loop and the parsing in the pool.
+
+cProfile follows a single thread, and while a coroutine is profiled every
+other task the event loop runs in the meantime is recorded too. Only one
+profile runs at a time in a process; requests arriving while another is
+being profiled run unprofiled.
+"""
+
+import cProfile
+import io
+import marshal
+import pstats
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+from starlette.requests import HTTPConnection
+from app.config import settings
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+# Whether a profiler is enabled on this process's main thread
+_active = False
+
+
+def profiling_allowed(token: Optional[str]) -> bool:
+    """Whether a token is on the profiling allowlist; an empty allowlist disables profiling."""
+    if not token:
+        return False
+    allowlist = {entry.strip() for entry in settings.profiling_allowlist.split(",") if entry.strip()}
+    return token in allowlist
+
+
+def profile_token(connection: HTTPConnection) -> Optional[str]:
+    """The profiling token of a request, from its ``X-Profile`` header."""
+    return connection.headers.get(PROFILE_HEADER)
+
+
+def profiling_requested(connection: HTTPConnection) -> bool:
+    """Whether a request asks for profiling with an allowlisted token."""
+    return profiling_allowed(profile_token(connection))
+
+
+class _RawStats:
+    """Statistics of a finished profile, in the shape ``pstats.Stats.add`` loads."""
+
+    def __init__(self, stats: Dict[Tuple, Any]):
+        """Wrap the ``stats`` dictionary of a ``cProfile.Profile``."""
+        self.stats = stats
+
+    def create_stats(self):
+        """The statistics are already final."""
+
+
+class ProfileCollector:
+    """Merges cProfile statistics from this process and extraction workers."""
+
+    def __init__(self):
+        """Initialize an empty profile."""
+        self._stats = pstats.Stats()
+        self.busy = False
+
+    @property
+    def empty(self) -> bool:
+        """Whether nothing has been recorded."""
+        return not self._stats.stats
+
+    def add(self, stats: Optional[Dict[Tuple, Any]]):
+        """Merge the raw statistics of a profile taken elsewhere."""
+        if stats:
+            self._stats.add(_RawStats(stats))
+
+    @contextmanager
+    def profile(self) -> Iterator[None]:
+        """Profile this thread while the block runs.
+
+        Sets ``busy`` and records nothing if another profile is running in
+        this process.
+        """
+        global _active
+        if _active:
+            self.busy = True
+            yield
+            return
+
+        profiler = cProfile.Profile()
+        _active = True
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            _active = False
+            profiler.create_stats()
+            self.add(profiler.stats)
+
+    def dump(self) -> bytes:
+        """The profile in the ``.prof`` format read by ``pstats`` and snakeviz."""
+        return marshal.dumps(self._stats.stats)
+
+    def summary(self, limit: int = None) -> str:
+        """The most expensive functions by cumulative time, as printed by ``pstats``."""
+        return format_profile(self._stats, limit)
+
+
+def format_profile(stats: pstats.Stats, limit: int = None) -> str:
+    """Print statistics sorted by cumulative time to a string."""
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit or settings.profiling_summary_lines)
+    return stream.getvalue()
+
+
+def load_profile(data: bytes) -> pstats.Stats:
+    """Statistics of a profile stored with ``ProfileCollector.dump``."""
+    return pstats.Stats(_RawStats(marshal.loads(data)))
+
+
+def run_profiled(function, *args) -> Tuple[Any, Dict[Tuple, Any]]:
+    """Call a function under cProfile and return its result with the raw statistics."""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(function, *args)
+    profiler.create_stats()
+    return result, profiler.stats
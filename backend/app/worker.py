@@ -0,0 +1,177 @@
+"""Standalone worker that consumes contract processing jobs.
+
+Run with ``python -m app.worker``. Any number of workers can run against the
+same database, on the API host or on separate machines.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+import uuid
+from datetime import timedelta
+from typing import Dict, Any
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from app.config import settings
+from app.database import connect_to_mongo, close_mongo_connection, get_database
+from app.services.contract_service import ContractService
+from app.services.extraction_executor import extraction_executor
+from app.services.job_queue import JobQueue
+from app.utils.metrics import start_metrics_server
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """Claims jobs from the queue and runs contract processing."""
+
+    def __init__(self, database: AsyncIOMotorDatabase, concurrency: int = None):
+        """Initialize worker with database connection."""
+        self.db = database
+        self.queue = JobQueue(database)
+        self.service = ContractService(database)
+        self.concurrency = concurrency or settings.worker_concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """Ask the worker to stop claiming new jobs."""
+        self._stopping.set()
+
+    async def recover(self):
+        """Return abandoned work to the queue."""
+        await self.queue.reclaim_expired()
+        await self.queue.recover_orphaned_contracts()
+
+    async def run(self):
+        """Run job slots until stopped, letting in-flight jobs finish."""
+        logger.info(f"Worker {self.worker_id} started with {self.concurrency} slots")
+        maintenance = [
+            # Requeue jobs of workers that stopped heartbeating
+            asyncio.create_task(self._periodically(settings.job_reclaim_interval, self.queue.reclaim_expired)),
+            # Correct blob references of uploads that never became contracts
+            asyncio.create_task(self._periodically(settings.storage_reconcile_interval, self._reconcile_storage)),
+        ]
+        try:
+            await asyncio.gather(*(self._run_slot() for _ in range(self.concurrency)))
+        finally:
+            for task in maintenance:
+                task.cancel()
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    async def _periodically(self, interval: float, action):
+        """Run ``action`` every ``interval`` seconds until stopped; 0 disables it."""
+        if interval <= 0:
+            return
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                return
+            try:
+                await action()
+            except Exception as e:
+                logger.error(f"Periodic {action.__name__} failed: {e}")
+
+    async def _reconcile_storage(self):
+        """Set blob refcounts to the contracts referencing each stored file."""
+        report = await self.service.storage.reconcile_refcounts(
+            self.db.contracts, timedelta(seconds=settings.storage_reconcile_grace_seconds)
+        )
+        if report["corrected"]:
+            logger.info(f"Reconciled stored files: {report}")
+
+    async def _run_slot(self):
+        """Claim and process jobs one at a time."""
+        while not self._stopping.is_set():
+            try:
+                job = await self.queue.claim(self.worker_id)
+            except Exception as e:
+                logger.error(f"Failed to claim job: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=settings.job_poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._run_job(job)
+            except Exception as e:
+                # The lease expires and the job is reclaimed; keep the slot running
+                logger.error(f"Failed to settle job {job['_id']}: {e}")
+
+    async def _run_job(self, job: Dict[str, Any]):
+        """Process a claimed job while keeping its lease alive.
+
+        A failed attempt is reported only after the queue has decided whether
+        to retry it, so subscribers never see ``failed`` for a contract that
+        will be processed again. Errors recording the outcome propagate to
+        ``_run_slot``, which logs them.
+        """
+        heartbeat = asyncio.create_task(self._heartbeat(job["_id"]))
+        try:
+            await self.service.process_contract(job["contract_id"], profile=job.get("profile", False))
+        except Exception as e:
+            retry = await self.queue.fail(job["_id"], self.worker_id, str(e))
+            if retry is None:
+                logger.warning(f"Job {job['_id']} was reclaimed; not reporting its failure")
+            else:
+                await self.service.fail_contract(job["contract_id"], str(e), retry=retry)
+        else:
+            await self.queue.complete(job["_id"], self.worker_id)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: str):
+        """Periodically extend the lease of a running job."""
+        while True:
+            await asyncio.sleep(settings.job_heartbeat_seconds)
+            try:
+                if not await self.queue.heartbeat(job_id, self.worker_id):
+                    logger.warning(f"Lost lease on job {job_id}")
+                    return
+            except Exception as e:
+                logger.error(f"Heartbeat failed for job {job_id}: {e}")
+
+
+async def main():
+    """Connect to MongoDB and run a worker until interrupted."""
+    await connect_to_mongo()
+    extraction_executor.start()
+
+    worker = Worker(get_database())
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    metrics_server = None
+    try:
+        # Processing metrics are recorded here, not in the API process
+        if settings.worker_metrics_port:
+            try:
+                metrics_server = await start_metrics_server(settings.worker_metrics_port)
+            except OSError as e:
+                logger.error(f"Metrics listener on port {settings.worker_metrics_port} failed, "
+                             f"running without it: {e}")
+
+        await worker.recover()
+        await worker.run()
+    finally:
+        if metrics_server:
+            metrics_server.close()
+        await extraction_executor.shutdown()
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    asyncio.run(main())
@@ -0,0 +1,5 @@
+"""Performance benchmarks for the contract parsing pipeline.
+
+Run individual benchmarks from the ``backend`` directory, e.g.
+``python -m benchmarks.parser_regex``.
+"""
@@ -0,0 +1,181 @@
+"""Deterministic synthetic contract text for benchmarks.
+
+``CONTRACT_PROFILES`` holds the opening sections of a few kinds of contract.
+Between them they reach every branch of the ``PDFParser._extract_*``
+methods: labelled and unlabelled parties, rate, hourly and fixed-fee line
+items, explicit and alternative payment terms, late fees, banking details, each billing
+frequency, recurring and one-time revenue, and every SLA metric.
+"""
+
+import random
+from typing import Dict, List
+
+CONTRACT_SECTIONS: List[List[str]] = [
+    [
+        "MASTER SERVICES AGREEMENT",
+        "Service Provider: Acme Solutions LLC",
+        "123 Main Street, Springfield, IL 62701",
+        "Email: billing@acme.com",
+        "Phone: (555) 123-4567",
+        "Tax ID: 12-3456789",
+        "Client: Globex Corporation",
+        "456 Oak Avenue, Chicago, IL 60601",
+        "Email: ap@globex.com",
+        "Phone: (555) 987-6543",
+    ],
+    [
+        "Account ID: ACC-2024-001",
+        "Payment terms: Net 30 days",
+        "Payment Method: ACH transfer",
+        "Services are billed monthly.",
+        "Monthly Total: $12,500.00",
+        "Setup Fee: $2,000",
+        "Annual Contract Value: $150,000",
+        "Term: 12 months",
+        "Auto-renewal: 12-month",
+        "Cloud Management Service $5,000/month",
+        "Security Assessment: $3,000/fixed",
+        "Developer Training: 10 hours ($1,500)",
+    ],
+    [
+        "Uptime: 99.9% uptime guaranteed",
+        "Critical issues resolved within 2 hours",
+        "High priority response 4 hours",
+        "Late fee 1.5% per month",
+        "Termination notice 30 days",
+        "Price increase limited to 3%",
+        "Backup success rate 99.5%",
+        "System response time 2 seconds",
+        "Billing contact: Jane Doe",
+    ],
+]
+
+CONTRACT_PROFILES: Dict[str, List[List[str]]] = {
+    "managed_services": CONTRACT_SECTIONS,
+    "consulting": [
+        [
+            "CONSULTING AGREEMENT",
+            "This Agreement between Northwind Traders, and Contoso Advisory Group Inc",
+            "Consultant: Contoso Advisory Group Inc",
+            "1200 Market Street, San Francisco, CA 94103",
+            "Email: contracts@contoso.com",
+            "Phone: (415) 555-0100",
+            "Federal EIN: 98-7654321",
+            "Customer: Northwind Traders Corp",
+            "77 Harbor Road, Boston, MA 02110",
+            "Email: legal@northwind.com",
+            "Phone: (617) 555-0142",
+            "EIN: 45-1237890",
+        ],
+        [
+            "Agreement ID: AGR-7781",
+            "Payment is due within 45 days of each invoice",
+            "Payment Options: Wire transfer or check",
+            "Invoices are issued per quarter.",
+            "Strategy Workshop: 24 hours ($7,200)",
+            "Implementation Support: 40 hours ($9,000)",
+            "Rate: $300/hour",
+            "Project Fee: $15,000",
+            "Duration: 6 months",
+            "Interest of 1% accrues on overdue balances",
+            "Bank: First National Bank",
+            "Acct #: 000123456789",
+            "Routing: 021000021",
+            "SWIFT: FNBAUS33XXX",
+        ],
+        [
+            "Finance contact: Maria Lopez",
+            "Accounting phone: (415) 555-0199",
+            "Emergency incidents are answered within 1 hours",
+            "Urgent requests are handled in 8 hours",
+            "Normal requests are resolved in 24 hours",
+            "Routine requests are answered within 3 days",
+            "Cancellation requires 60 days notice",
+            "Rate adjustment is capped at 5%",
+        ],
+    ],
+    "subscription": [
+        [
+            "SOFTWARE SUBSCRIPTION AGREEMENT",
+            "Service Provider: Initech Software Corp",
+            "9 Innovation Drive, Austin, TX 73301",
+            "Email: billing@initech.com",
+            "Phone: (512) 555-0110",
+            "Tax ID: 11-2223334",
+            "Client: Umbrella Holdings LLC",
+            "500 Corporate Blvd, Raleigh, NC 27601",
+            "Email: procurement@umbrella.com",
+            "Phone: (919) 555-0175",
+            "Tax ID: 55-6667778",
+        ],
+        [
+            "Client Account: UMB-5521",
+            "Payment terms: Net 60 days",
+            "Payment Method: Corporate credit card",
+            "Subscription fees are billed annually in advance.",
+            "Platform Subscription Service $4,000/month",
+            "Premium Support Service: $1,200/month",
+            "Annual Total: $62,400",
+            "Contract Period: 36 months",
+            "Auto renewal: 12 month",
+        ],
+        [
+            "99.95% availability",
+            "Service credit of 10% applies when uptime falls below 99.5%",
+            "Response time under 500 ms",
+            "Backup success rate of 99.9%",
+            "Billing contact: Peter Gibbons",
+        ],
+    ],
+    "one_time": [
+        [
+            "STATEMENT OF WORK",
+            "Contract between Stark Industries, and Wayne Enterprises Inc",
+            "Acme Migration Partners LLC will deliver the work described below.",
+            "Email: pm@acme-migration.com",
+        ],
+        [
+            "Data Migration Service: $25,000/fixed",
+            "Fixed fee: $25,000",
+            "Payment due within 15 days of delivery",
+            "Single payment, lump sum on delivery",
+            "Duration: 3 months",
+        ],
+    ],
+}
+
+BOILERPLATE = [
+    "The parties agree that the services shall be performed in a professional manner.",
+    "Confidential information shall not be disclosed to any third party without consent.",
+    "This agreement is governed by the laws of the State of Delaware.",
+    "Either party may terminate for material breach upon written notice.",
+    "All invoices are payable in US dollars unless otherwise agreed in writing.",
+]
+
+
+def contract_pages(pages: int = 100, lines_per_page: int = 40, seed: int = 7,
+                   profile: str = "managed_services") -> List[List[str]]:
+    """Return the lines of each page of a synthetic contract.
+
+    The first pages carry the sections of the profile; later pages are
+    mostly boilerplate with a section repeated every tenth page, which is how
+    long master agreements with schedules tend to look.
+    """
+    sections = CONTRACT_PROFILES[profile]
+    rng = random.Random(seed)
+    result = []
+    for page in range(pages):
+        lines = [rng.choice(BOILERPLATE) for _ in range(lines_per_page)]
+        if page < len(sections):
+            # Shorter documents carry the remaining sections on their last page
+            last = page == pages - 1
+            lines[5:5] = [line for section in sections[page:] if last for line in section] or sections[page]
+        elif page % 10 == 0:
+            lines[10:10] = rng.choice(sections)
+        result.append(lines)
+    return result
+
+
+def contract_text(pages: int = 100, seed: int = 7, profile: str = "managed_services") -> str:
+    """Return the full text of a synthetic contract, one line per row."""
+    return "\n".join("\n".join(lines) for lines in contract_pages(pages, seed=seed, profile=profile)) + "\n"
@@ -0,0 +1,161 @@
+"""Measure the overhead of per-stage timing and the pattern layer on contract parsing.
+
+Parses the synthetic corpus with and without ``StageTimings``, observing the
+timings into the stage histogram as the extraction executor does, in
+alternating rounds so drift affects both equally, and keeps the best time of
+each document. That difference is within run-to-run noise, so the check
+also times the instrumentation alone, every timer and histogram observation
+of one contract with nothing inside, and fails if that exceeds the ceiling
+as a share of the fastest parse in the corpus. Like the parses, the probes
+keep their best of several runs. The pattern layer, the timing of every
+regex call, the extractor time budgets and the per-pattern counter, is
+always on and held to the same ceiling separately.
+
+    python -m benchmarks.metrics_overhead --count 20 --rounds 7
+"""
+
+import argparse
+import json
+import re
+import time
+from typing import Dict, Any, List
+from app.utils.metrics import StageTimings, Counter, Histogram, processing_stage_seconds
+from app.utils.pattern_budget import PatternBudget, PatternClock, TimedPattern
+from app.utils.pdf_parser import pdf_parser
+from benchmarks.pdf import contract_corpus
+
+# Stages timed per contract: parser stages and the confidence score in the
+# worker, the processing stages around them in the API process
+PARSE_STAGES = 10
+PROCESSING_STAGES = 6
+
+# Pattern calls and distinct patterns of a one-page contract, and the field
+# extractors run under a time budget
+PATTERN_CALLS = 51
+PATTERNS_USED = 51
+EXTRACTORS = 6
+
+
+def parse(content: bytes, instrumented: bool, histogram: Histogram) -> float:
+    """Parse a document once and return the elapsed seconds."""
+    start = time.perf_counter()
+    if instrumented:
+        timings = StageTimings()
+        extracted_data = pdf_parser.parse_contract(content, timings)
+        with timings.stage("confidence_score"):
+            pdf_parser.calculate_confidence_score(extracted_data)
+        for stage, seconds in timings.seconds.items():
+            histogram.observe(seconds, stage=stage)
+    else:
+        extracted_data = pdf_parser.parse_contract(content)
+        pdf_parser.calculate_confidence_score(extracted_data)
+    return time.perf_counter() - start
+
+
+def instrumentation_cost(iterations: int) -> float:
+    """Seconds of instrumentation added to one contract, timed without any work inside."""
+    histogram = Histogram("overhead_probe_seconds", "Probe", ["stage"])
+    stages = [f"stage_{index}" for index in range(PARSE_STAGES)]
+    start = time.perf_counter()
+    for _ in range(iterations):
+        timings = StageTimings()
+        for stage in stages:
+            with timings.stage(stage):
+                pass
+        for stage, seconds in timings.seconds.items():
+            histogram.observe(seconds, stage=stage)
+        for _ in range(PROCESSING_STAGES):
+            with processing_stage_seconds.time(stage="probe"):
+                pass
+    return (time.perf_counter() - start) / iterations
+
+
+def pattern_layer_cost(iterations: int) -> float:
+    """Seconds the pattern timing and extractor budgets add to one contract, net of the matching itself."""
+    counter = Counter("overhead_probe_pattern_seconds_total", "Probe", ["pattern"])
+    clock = PatternClock()
+    pattern = re.compile("")
+    timed = [TimedPattern(f"pattern_{index % PATTERNS_USED}", pattern, clock) for index in range(PATTERN_CALLS)]
+    by_extractor = [timed[index::EXTRACTORS] for index in range(EXTRACTORS)]
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for _ in range(PATTERN_CALLS):
+            pattern.search("")
+    bare = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        timings = StageTimings()
+        for extractor_patterns in by_extractor:
+            with PatternBudget(2.0, clock):
+                for timed_pattern in extractor_patterns:
+                    timed_pattern.search("")
+        timings.add_patterns(clock.reset())
+        counter.inc_each(timings.patterns)
+    return (time.perf_counter() - start - bare) / iterations
+
+
+def run(args) -> Dict[str, Any]:
+    """Time the corpus both ways and the instrumentation on its own."""
+    corpus = list(contract_corpus(args.count, args.seed))
+    histogram = Histogram("overhead_parse_stage_seconds", "Benchmark copy of the stage histogram", ["stage"])
+
+    # Warm up the PDF reader and regex caches before timing
+    for document in corpus:
+        parse(document.content, False, histogram)
+
+    best: Dict[bool, List[float]] = {False: [float("inf")] * len(corpus), True: [float("inf")] * len(corpus)}
+    for round_number in range(args.rounds):
+        # Alternate which variant runs first
+        for instrumented in ((False, True) if round_number % 2 == 0 else (True, False)):
+            for index, document in enumerate(corpus):
+                elapsed = parse(document.content, instrumented, histogram)
+                best[instrumented][index] = min(best[instrumented][index], elapsed)
+
+    plain, timed = sum(best[False]), sum(best[True])
+    per_contract = min(instrumentation_cost(args.iterations) for _ in range(args.rounds))
+    pattern_layer = min(pattern_layer_cost(args.iterations) for _ in range(args.rounds))
+    fastest = min(best[False])
+    return {
+        "documents": len(corpus),
+        "pages": sum(document.pages for document in corpus),
+        "rounds": args.rounds,
+        "uninstrumented_seconds": round(plain, 4),
+        "instrumented_seconds": round(timed, 4),
+        "measured_overhead_percent": round((timed - plain) / plain * 100, 3),
+        "instrumentation_per_contract_us": round(per_contract * 1e6, 2),
+        "fastest_parse_ms": round(fastest * 1000, 3),
+        "worst_case_overhead_percent": round(per_contract / fastest * 100, 3),
+        "pattern_layer_per_contract_us": round(pattern_layer * 1e6, 2),
+        "pattern_layer_worst_case_percent": round(pattern_layer / fastest * 100, 3)
+    }
+
+
+def main():
+    """Run the measurement and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20, help="documents in the corpus")
+    parser.add_argument("--seed", type=int, default=7, help="seed of the first document")
+    parser.add_argument("--rounds", type=int, default=7, help="alternating rounds (best is kept)")
+    parser.add_argument("--iterations", type=int, default=20000, help="iterations of the instrumentation probe")
+    parser.add_argument("--max-overhead", type=float, default=1.0, help="fail above this percentage")
+    args = parser.parse_args()
+
+    report = run(args)
+    print(json.dumps(report, indent=2))
+
+    if report["worst_case_overhead_percent"] > args.max_overhead:
+        raise SystemExit(
+            f"Instrumentation adds {report['worst_case_overhead_percent']}% to the fastest parse, "
+            f"above the {args.max_overhead}% ceiling"
+        )
+    if report["pattern_layer_worst_case_percent"] > args.max_overhead:
+        raise SystemExit(
+            f"The pattern layer adds {report['pattern_layer_worst_case_percent']}% to the fastest parse, "
+            f"above the {args.max_overhead}% ceiling"
+        )
+
+
+if __name__ == "__main__":
+    main()
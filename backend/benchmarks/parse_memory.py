@@ -0,0 +1,98 @@
+"""Check the peak memory of extraction workers parsing a large contract PDF.
+
+Parses a synthetic contract carrying a large embedded attachment through the
+extraction pool twice: passing the file content as bytes, and passing its
+path for the worker to memory-map. Reports each worker's peak RSS above its
+idle RSS and fails if the memory-mapped parse grows by more than the
+ceiling, so a change that copies whole files back into the worker path is
+caught.
+
+    python -m benchmarks.parse_memory --size-mb 48
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+from typing import Dict, Any
+from app.services.extraction_executor import ExtractionExecutor
+from app.utils.memory import peak_rss, reset_peak_rss
+from benchmarks.pdf import contract_pdf
+
+MIB = 2 ** 20
+
+
+def idle_rss() -> int:
+    """RSS of a worker between parses."""
+    reset_peak_rss()
+    return peak_rss()
+
+
+async def measure(path: str, mapped: bool) -> Dict[str, Any]:
+    """Parse the file in a fresh single-worker pool and return its memory use."""
+    executor = ExtractionExecutor(max_workers=1)
+    executor.start()
+    try:
+        loop = asyncio.get_running_loop()
+        baseline = await loop.run_in_executor(executor._pool, idle_rss)
+
+        if mapped:
+            extracted_data, confidence_score = await executor.parse_contract_file(path)
+        else:
+            with open(path, "rb") as pdf_file:
+                content = pdf_file.read()
+            extracted_data, confidence_score = await executor.parse_contract(content)
+            del content
+    finally:
+        await executor.shutdown()
+
+    return {
+        "idle_rss_mb": round(baseline / MIB, 1),
+        "peak_rss_mb": round(executor.last_peak_rss / MIB, 1),
+        "growth_mb": round((executor.last_peak_rss - baseline) / MIB, 1),
+        "confidence_score": confidence_score,
+        "extracted": extracted_data.model_dump(mode="json", warnings=False)
+    }
+
+
+async def run(args) -> Dict[str, Any]:
+    """Write the synthetic PDF and measure both parse paths."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "contract.pdf")
+        with open(path, "wb") as pdf_file:
+            pdf_file.write(contract_pdf(args.pages, attachment_bytes=args.size_mb * MIB))
+
+        file_size = os.path.getsize(path)
+        copied = await measure(path, mapped=False)
+        mapped = await measure(path, mapped=True)
+
+    return {"file_mb": round(file_size / MIB, 1), "bytes": copied, "mmap": mapped}
+
+
+def main():
+    """Run the check and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20, help="pages of contract text")
+    parser.add_argument("--size-mb", type=int, default=48, help="size of the embedded attachment")
+    parser.add_argument("--max-growth-mb", type=float, default=16.0,
+                        help="fail if the memory-mapped parse grows the worker by more than this")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if report["bytes"]["extracted"] != report["mmap"]["extracted"]:
+        raise SystemExit("Extraction results differ between bytes and memory-mapped parsing")
+
+    for mode in ("bytes", "mmap"):
+        del report[mode]["extracted"]
+    print(json.dumps(report, indent=2))
+
+    if report["mmap"]["growth_mb"] > args.max_growth_mb:
+        raise SystemExit(
+            f"Memory-mapped parse grew the worker by {report['mmap']['growth_mb']} MiB, "
+            f"above the {args.max_growth_mb} MiB ceiling"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Deterministic synthetic contract PDFs for benchmarks.
+
+Writes minimal PDF 1.4 files by hand, so benchmarks need no PDF library
+beyond the parser under test. The same arguments always produce the same
+bytes.
+
+``contract_corpus`` yields a mixed set of contracts over every text profile
+of ``benchmarks.corpus``, several page layouts and a spread of lengths:
+
+    python -m benchmarks.pdf --count 15 --output /tmp/corpus
+"""
+
+import argparse
+import itertools
+import os
+import random
+from dataclasses import dataclass
+from typing import Dict, Iterator, List
+from benchmarks.corpus import CONTRACT_PROFILES, contract_pages
+
+
+@dataclass(frozen=True)
+class Layout:
+    """Page geometry and typesetting of a synthetic PDF, in points."""
+    width: int = 612
+    height: int = 792
+    font_size: int = 10
+    leading: int = 12
+    lines_per_page: int = 40
+
+
+LAYOUTS: Dict[str, Layout] = {
+    "letter": Layout(),
+    "a4_dense": Layout(width=595, height=842, font_size=8, leading=9, lines_per_page=80),
+    "large_print": Layout(font_size=14, leading=17, lines_per_page=24),
+}
+
+PAGE_COUNTS = [1, 3, 10, 30, 100]
+
+
+@dataclass(frozen=True)
+class SyntheticContract:
+    """One document of a generated corpus."""
+    name: str
+    profile: str
+    layout: str
+    pages: int
+    seed: int
+    content: bytes
+
+
+def _escape(line: str) -> bytes:
+    """Encode a line as the body of a PDF literal string."""
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("latin-1")
+
+
+def _stream(dictionary: bytes, data: bytes) -> bytes:
+    """A stream object body with its length filled in."""
+    return b"<< " + dictionary + b" /Length %d >>\nstream\n" % len(data) + data + b"\nendstream"
+
+
+def build_pdf(pages: List[List[str]], attachment_bytes: int = 0, seed: int = 7,
+              layout: Layout = LAYOUTS["letter"]) -> bytes:
+    """Lay out lines of text one page each, optionally with an embedded file.
+
+    The attachment is ``attachment_bytes`` of incompressible data stored as
+    an embedded file, standing in for the bulk that text extraction never
+    reads: embedded fonts, scanned exhibits, signatures.
+    """
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    # Object numbers are assigned in order; the page tree follows the pages
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = font_id + 2 * len(pages) + 1
+
+    page_ids = []
+    for lines in pages:
+        content = b"BT /F1 %d Tf 50 %d Td %d TL\n" % (
+            layout.font_size, layout.height - layout.leading, layout.leading
+        )
+        content += b"".join(b"(" + _escape(line) + b") Tj T*\n" for line in lines)
+        content += b"ET"
+        content_id = add(_stream(b"", content))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> >> >>"
+            % (pages_id, layout.width, layout.height, content_id, font_id)
+        ))
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    add(b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids)))
+
+    names = b""
+    if attachment_bytes:
+        data = random.Random(seed).randbytes(attachment_bytes)
+        file_id = add(_stream(b"/Type /EmbeddedFile", data))
+        spec_id = add(b"<< /Type /Filespec /F (exhibit.bin) /EF << /F %d 0 R >> >>" % file_id)
+        names = b" /Names << /EmbeddedFiles << /Names [(exhibit.bin) %d 0 R] >> >>" % spec_id
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R%s >>" % (pages_id, names))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, xref_offset
+    )
+    return bytes(output)
+
+
+def contract_pdf(pages: int = 10, attachment_bytes: int = 0, seed: int = 7,
+                 profile: str = "managed_services", layout: str = "letter") -> bytes:
+    """A synthetic contract PDF with the text of ``benchmarks.corpus``."""
+    page_layout = LAYOUTS[layout]
+    lines = contract_pages(pages, lines_per_page=page_layout.lines_per_page, seed=seed, profile=profile)
+    return build_pdf(lines, attachment_bytes=attachment_bytes, seed=seed, layout=page_layout)
+
+
+def contract_corpus(count: int = 15, seed: int = 7) -> Iterator[SyntheticContract]:
+    """Yield ``count`` contracts cycling through profiles, layouts and lengths.
+
+    Profiles and layouts advance together and lengths advance once per full
+    round of profiles, so every profile meets every length within
+    ``len(CONTRACT_PROFILES) * len(PAGE_COUNTS)`` documents.
+    """
+    profiles = list(CONTRACT_PROFILES)
+    layouts = itertools.cycle(LAYOUTS)
+    for index in range(count):
+        profile = profiles[index % len(profiles)]
+        layout = next(layouts)
+        pages = PAGE_COUNTS[(index // len(profiles)) % len(PAGE_COUNTS)]
+        document_seed = seed + index
+        yield SyntheticContract(
+            name=f"{index:03d}-{profile}-{layout}-{pages}p.pdf",
+            profile=profile,
+            layout=layout,
+            pages=pages,
+            seed=document_seed,
+            content=contract_pdf(pages, seed=document_seed, profile=profile, layout=layout)
+        )
+
+
+def main():
+    """Write a synthetic corpus to a directory."""
+    parser = argparse.ArgumentParser(description="Write a synthetic contract PDF corpus")
+    parser.add_argument("--count", type=int, default=len(CONTRACT_PROFILES) * len(PAGE_COUNTS),
+                        help="number of documents")
+    parser.add_argument("--seed", type=int, default=7, help="seed of the first document")
+    parser.add_argument("--output", required=True, help="directory to write the PDFs to")
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    for document in contract_corpus(args.count, args.seed):
+        with open(os.path.join(args.output, document.name), "wb") as pdf_file:
+            pdf_file.write(document.content)
+        print(f"{document.name} {len(document.content)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Measure document bytes read per request by each ContractService access path.
+
+Seeds a dataset of contracts and extractions and compares the BSON size of
+what each access path returns with and without its declared projection from
+``ContractService.PROJECTIONS``.
+
+    python -m benchmarks.query_bytes --contracts 500
+
+Uses mongomock by default; pass ``--mongodb-url`` to seed a scratch database
+on a real server instead (the database is dropped afterwards).
+"""
+
+import argparse
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+import bson
+from app.models import ExtractedData
+from app.services.contract_service import ContractService
+from app.utils.document import ParsedDocument
+from app.utils.pdf_parser import PDFParser
+from benchmarks.corpus import contract_text
+
+PAGE_SIZE = 20
+
+
+def connect(mongodb_url: Optional[str]):
+    """Return a synchronous client for the benchmark database."""
+    if mongodb_url:
+        from pymongo import MongoClient
+        return MongoClient(mongodb_url)
+
+    try:
+        import mongomock
+    except ImportError:
+        raise SystemExit("mongomock is not installed; pass --mongodb-url to use a MongoDB server")
+    return mongomock.MongoClient()
+
+
+def seed(database, contracts: int, pages: int) -> List[str]:
+    """Insert contracts with extractions parsed from synthetic contract text."""
+    extracted_data = extracted_data_for(contract_text(pages))
+    extracted_data_json = json.dumps(extracted_data, separators=(",", ":"))
+
+    now = datetime.utcnow()
+    contract_ids, contract_docs, data_docs = [], [], []
+    for index in range(contracts):
+        contract_id = str(uuid.uuid4())
+        content_hash = uuid.uuid4().hex * 2
+        contract_ids.append(contract_id)
+        contract_docs.append({
+            "_id": contract_id,
+            "filename": f"contract-{index:05d}.pdf",
+            "storage_key": content_hash,
+            "file_size": 250000 + index,
+            "content_hash": content_hash,
+            "upload_date": now - timedelta(minutes=index),
+            "status": "completed",
+            "progress": 100,
+            "error_message": None,
+            "data_contract_id": None,
+            "batch_id": None
+        })
+        data_docs.append({
+            "_id": str(uuid.uuid4()),
+            "contract_id": contract_id,
+            "content_hash": contract_docs[-1]["content_hash"],
+            "extracted_data": extracted_data,
+            "extracted_data_json": extracted_data_json,
+            "confidence_score": 95.0,
+            "processing_date": now,
+            "gap_analysis": None
+        })
+
+    database.contracts.insert_many(contract_docs)
+    database.contract_data.insert_many(data_docs)
+    return contract_ids
+
+
+def extracted_data_for(text: str) -> Dict[str, Any]:
+    """Run the field extractors over text and return the stored form."""
+    parser = PDFParser()
+    document = ParsedDocument(text)
+    return ExtractedData(
+        parties=parser._extract_parties(document),
+        financial_details=parser._extract_financial_details(document),
+        payment_structure=parser._extract_payment_structure(document),
+        account_info=parser._extract_account_info(document),
+        revenue_classification=parser._extract_revenue_classification(document),
+        sla_terms=parser._extract_sla_terms(document)
+    ).model_dump(mode="json", warnings=False)
+
+
+def size(documents: List[Dict[str, Any]]) -> int:
+    """Total BSON size of documents."""
+    return sum(len(bson.encode(document)) for document in documents)
+
+
+def measure(database, contract_ids: List[str]) -> Dict[str, Dict[str, int]]:
+    """Bytes returned per request by each access path, before and after projection."""
+    projections = ContractService.PROJECTIONS
+    sample_id = contract_ids[len(contract_ids) // 2]
+    list_fields = {field: 1 for field in ("filename", "status", "upload_date", "file_size")}
+
+    paths = {
+        "status": (database.contracts, {"_id": sample_id}, projections["status"]),
+        "state": (database.contracts, {"_id": sample_id}, projections["state"]),
+        "file": (database.contracts, {"_id": sample_id}, projections["file"]),
+        "data_owner": (database.contracts, {"_id": sample_id}, projections["data_owner"]),
+        "data_response": (database.contract_data, {"contract_id": sample_id}, projections["data_response"]),
+    }
+
+    report = {}
+    for name, (collection, query, projection) in paths.items():
+        report[name] = {
+            "full_bytes": size([collection.find_one(query)]),
+            "projected_bytes": size([collection.find_one(query, projection)])
+        }
+
+    # A listing page reads contracts plus the score of each extraction
+    page = list(database.contracts.find({}).sort([("upload_date", -1), ("_id", -1)]).limit(PAGE_SIZE))
+    page_ids = [contract["_id"] for contract in page]
+    page_data = list(database.contract_data.find({"contract_id": {"$in": page_ids}}))
+    projected_page = list(database.contracts.find({}, list_fields).sort([("upload_date", -1), ("_id", -1)]).limit(PAGE_SIZE))
+    projected_data = list(database.contract_data.find({"contract_id": {"$in": page_ids}}, projections["list_score"]))
+    report["list_page"] = {
+        "full_bytes": size(page) + size(page_data),
+        "projected_bytes": size(projected_page) + size(projected_data)
+    }
+
+    for entry in report.values():
+        entry["reduction"] = round(1 - entry["projected_bytes"] / entry["full_bytes"], 4)
+    return report
+
+
+def main():
+    """Seed the dataset, measure each access path and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contracts", type=int, default=500, help="contracts to seed")
+    parser.add_argument("--pages", type=int, default=10, help="pages of contract text per extraction")
+    parser.add_argument("--mongodb-url", default=None, help="use a MongoDB server instead of mongomock")
+    args = parser.parse_args()
+
+    client = connect(args.mongodb_url)
+    database_name = f"benchmark_{uuid.uuid4().hex[:8]}"
+    database = client[database_name]
+    try:
+        contract_ids = seed(database, args.contracts, args.pages)
+        report = measure(database, contract_ids)
+    finally:
+        client.drop_database(database_name)
+
+    print(json.dumps({"contracts": args.contracts, "paths": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
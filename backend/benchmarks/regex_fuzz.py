@@ -0,0 +1,215 @@
+"""Fuzz the extraction patterns with adversarial text and check the time budget holds.
+
+Builds texts shaped to make backtracking patterns work hardest: long runs of
+one character class, extraction keywords repeated without the terms that
+complete a match, keywords followed by long digit runs, random OCR-like
+garbage and synthetic contracts with their whitespace or delimiters removed.
+
+Every pattern of the registry is timed on every text, each call capped at
+``--cap`` seconds, and the slowest are reported. Then each text is parsed
+with the extractor time budget in force, and the check fails if any
+extractor stage ran longer than its budget plus ``--tolerance``.
+
+Budgets must not cost legitimate documents their fields either: a benign
+synthetic contract of ``--large-pages`` pages is parsed with and without
+budgets, and the check fails if any extractor was skipped or any field
+differs.
+
+    python -m benchmarks.regex_fuzz --size 10000 --budget 0.5
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Tuple
+from app.config import settings
+from app.utils.metrics import StageTimings
+from app.utils.pattern_budget import PatternTimeout, TimeBudget, budgets_supported
+from app.utils.patterns import PATTERNS
+from app.utils.pdf_parser import PDFParser
+from benchmarks.corpus import contract_text
+
+# Leading keywords of the patterns, repeated without what must follow them
+KEYWORDS = [
+    "Monthly", "Per Month", "Annual", "Yearly", "Setup", "Rate:", "Fixed fee:", "Net", "payment", "due",
+    "billed", "late fee", "discount", "bank", "account", "routing", "swift", "billing phone",
+    "billing contact", "Term:", "termination", "price increase", "critical", "high priority", "medium",
+    "low priority", "system response", "backup success", "service credit", "uptime", "Email:", "Phone:",
+    "Consultant:", "Client:", "Service Provider:", "Agreement between", "with", "Street", "LLC",
+]
+
+# Characters of OCR garbage: letters, digits and the punctuation the patterns key on
+GARBAGE_ALPHABET = "aAzZ019 .,-$%:@&#()/\n"
+
+# Gap note of an extractor skipped for running out of time
+SKIPPED_NOTE = re.compile(r"(\w+) not extracted: (?:pattern )?(\w+) exceeded")
+
+EXTRACTOR_STAGES = [
+    "parties", "financial_details", "payment_structure", "account_info", "revenue_classification", "sla_terms",
+]
+
+
+def repeat_to(unit: str, size: int) -> str:
+    """Repeat ``unit`` to exactly ``size`` characters."""
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def adversarial_texts(size: int, seed: int) -> Iterator[Tuple[str, str]]:
+    """Yield named adversarial texts of about ``size`` characters."""
+    yield "letters", "a" * size
+    yield "words", repeat_to("word ", size)
+    yield "digits", "1" * size
+    yield "spaced_digits", repeat_to("1 ", size)
+    yield "decimals", repeat_to("1.", size)
+    yield "addresses_without_zip", repeat_to("1 Main Street ", size)
+    yield "company_fragments", repeat_to("Abc Def, ", size)
+    yield "sentences", repeat_to("a. ", size)
+    yield "email_fragments", repeat_to("a.b", size)
+    yield "at_signs", repeat_to("a@b", size)
+    for keyword in KEYWORDS:
+        yield f"repeated:{keyword}", repeat_to(f"{keyword} ", size)
+        yield f"numbered:{keyword}", repeat_to(f"{keyword} 1 ", size)
+        yield f"digit_run:{keyword}", f"{keyword} " + "1" * size
+
+    rng = random.Random(seed)
+    yield "garbage", "".join(rng.choice(GARBAGE_ALPHABET) for _ in range(size))
+
+    # Contracts mangled the way bad OCR mangles them
+    contract = contract_text(pages=max(1, size // 2000), seed=seed)
+    yield "contract_without_spaces", contract.replace(" ", "")
+    yield "contract_without_delimiters", contract.translate(str.maketrans("", "", ":$%()@#/"))
+    yield "contract_one_line", contract.replace("\n", " ")
+
+
+def pattern_sweep(texts: List[Tuple[str, str]], cap: float) -> Dict[str, Dict[str, Any]]:
+    """Slowest text of each pattern, each call stopped after ``cap`` seconds."""
+    worst: Dict[str, Dict[str, Any]] = {}
+    for name, pattern in PATTERNS.items():
+        for text_name, text in texts:
+            start = time.perf_counter()
+            capped = False
+            try:
+                with TimeBudget(cap):
+                    pattern.findall(text)
+            except PatternTimeout:
+                capped = True
+            elapsed = time.perf_counter() - start
+            if name not in worst or elapsed > worst[name]["ms"] / 1000:
+                worst[name] = {"ms": round(elapsed * 1000, 2), "text": text_name, "capped": capped}
+    return worst
+
+
+def budget_check(texts: List[Tuple[str, str]], budget: float) -> List[Dict[str, Any]]:
+    """Parse every text under the extractor budget and report the slowest stage of each."""
+    parser = PDFParser()
+    settings.extractor_time_budget_seconds = budget
+    results = []
+    for text_name, text in texts:
+        text_budget = parser._time_budget(text)
+        timings = StageTimings()
+        notes, error = "", None
+        start = time.perf_counter()
+        try:
+            notes = parser.parse_contract_text(text, timings).gap_analysis.notes or ""
+        except ValueError as e:
+            # Garbage can break the extractors outright; only the time taken matters here
+            error = str(e)
+        elapsed = time.perf_counter() - start
+
+        stage, seconds = max(
+            ((stage, timings.seconds.get(stage, 0.0)) for stage in EXTRACTOR_STAGES), key=lambda item: item[1]
+        )
+        results.append({
+            "text": text_name,
+            "budget_ms": round(text_budget * 1000, 2),
+            "parse_ms": round(elapsed * 1000, 2),
+            "slowest_stage": stage,
+            "slowest_stage_ms": round(seconds * 1000, 2),
+            "skipped": [SKIPPED_NOTE.match(note).expand(r"\1/\2") for note in notes.split("; ") if SKIPPED_NOTE.match(note)],
+            "error": error
+        })
+    return results
+
+
+def large_document_check(pages: int, seed: int, budget: float) -> Dict[str, Any]:
+    """Parse a long benign contract with and without budgets and compare the fields."""
+    parser = PDFParser()
+    text = contract_text(pages=pages, seed=seed)
+
+    settings.extractor_time_budget_seconds = 0
+    unbounded = parser.parse_contract_text(text)
+    settings.extractor_time_budget_seconds = budget
+    timings = StageTimings()
+    bounded = parser.parse_contract_text(text, timings)
+
+    notes = bounded.gap_analysis.notes or ""
+    fields = ("parties", "financial_details", "payment_structure", "account_info",
+              "revenue_classification", "sla_terms")
+    return {
+        "pages": pages,
+        "characters": len(text),
+        "budget_seconds": round(parser._time_budget(text), 3),
+        "slowest_stage_ms": round(max(timings.seconds.get(stage, 0.0) for stage in EXTRACTOR_STAGES) * 1000, 2),
+        "skipped": [note for note in notes.split("; ") if SKIPPED_NOTE.match(note)],
+        "differing_fields": [field for field in fields if getattr(bounded, field) != getattr(unbounded, field)],
+        "confidence_score": parser.calculate_confidence_score(bounded)
+    }
+
+
+def main():
+    """Run the fuzz benchmark and print a JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=10000, help="characters per adversarial text")
+    parser.add_argument("--seed", type=int, default=7, help="seed of the random texts")
+    parser.add_argument("--budget", type=float, default=settings.extractor_time_budget_seconds,
+                        help="extractor time budget in seconds, before the per-MB allowance")
+    parser.add_argument("--cap", type=float, default=2.0, help="seconds after which a single pattern call is stopped")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="seconds an extractor may overrun its budget")
+    parser.add_argument("--top", type=int, default=15, help="slowest patterns to report")
+    parser.add_argument("--skip-sweep", action="store_true", help="only check the budget")
+    parser.add_argument("--large-pages", type=int, default=1000,
+                        help="pages of the benign contract that must keep every field (0 skips)")
+    args = parser.parse_args()
+
+    if args.budget <= 0 or not budgets_supported():
+        raise SystemExit("Extractor time budgets are disabled or unsupported on this platform")
+
+    logging.disable(logging.ERROR)
+    texts = list(adversarial_texts(args.size, args.seed))
+
+    sweep = {} if args.skip_sweep else pattern_sweep(texts, args.cap)
+    slowest = sorted(sweep.items(), key=lambda item: item[1]["ms"], reverse=True)[:args.top]
+
+    parses = budget_check(texts, args.budget)
+    over = [
+        result for result in parses
+        if result["slowest_stage_ms"] > result["budget_ms"] + args.tolerance * 1000
+    ]
+    large = large_document_check(args.large_pages, args.seed, args.budget) if args.large_pages else None
+
+    report = {
+        "texts": len(texts),
+        "size": args.size,
+        "budget_seconds": args.budget,
+        "slowest_patterns": dict(slowest),
+        "slowest_parse_ms": max(result["parse_ms"] for result in parses),
+        "slowest_stage_ms": max(result["slowest_stage_ms"] for result in parses),
+        "texts_skipping": dict(Counter(skipped for result in parses for skipped in result["skipped"])),
+        "parse_errors": {result["text"]: result["error"] for result in parses if result["error"]},
+        "over_budget": over,
+        "large_document": large
+    }
+    print(json.dumps(report, indent=2))
+
+    if over:
+        raise SystemExit(f"{len(over)} texts ran an extractor past its budget")
+    if large and (large["skipped"] or large["differing_fields"]):
+        raise SystemExit(f"The {args.large_pages}-page benign contract lost fields under the budget")
+
+
+if __name__ == "__main__":
+    main()
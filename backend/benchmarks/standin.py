@@ -0,0 +1,179 @@
+"""In-process MongoDB stand-in for benchmarks that run without a server.
+
+Wraps a ``mongomock`` database in the subset of the motor API the application
+uses, so the FastAPI app, the embedded worker and every service run unchanged
+against in-memory collections. Limitations worth knowing when reading results:
+
+- Every operation runs synchronously on the event loop, so there is no network
+  round trip and no concurrency between queries; absolute latencies are lower
+  and contention is different from a real server.
+- Sessions report the error of a standalone server, so contracts complete
+  with two writes instead of a transaction.
+- ``$lookup`` stages with ``let``/``pipeline`` are rewritten to an equality
+  join, which ``mongomock`` supports.
+- Change streams, ``explain`` and index hints are not available.
+
+Use ``--mongodb-url`` of the benchmark suite to measure against a real server.
+"""
+
+from typing import Any, Dict, List
+import mongomock
+from pymongo.errors import OperationFailure
+
+ILLEGAL_OPERATION = 20
+
+
+class StandInCursor:
+    """Async cursor over a ``mongomock`` cursor or aggregation result."""
+
+    def __init__(self, cursor):
+        """Wrap a synchronous cursor."""
+        self._cursor = cursor
+        self._iterator = None
+
+    def sort(self, *args, **kwargs) -> "StandInCursor":
+        """Sort the results."""
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    def skip(self, count: int) -> "StandInCursor":
+        """Skip the first results."""
+        self._cursor = self._cursor.skip(count)
+        return self
+
+    def limit(self, count: int) -> "StandInCursor":
+        """Limit the number of results."""
+        self._cursor = self._cursor.limit(count)
+        return self
+
+    def hint(self, index) -> "StandInCursor":
+        """Ignore index hints; the stand-in has no query planner."""
+        return self
+
+    async def to_list(self, length: int = None) -> List[Dict[str, Any]]:
+        """Return up to ``length`` results."""
+        documents = list(self._cursor)
+        return documents[:length] if length else documents
+
+    def __aiter__(self):
+        """Iterate the results asynchronously."""
+        self._iterator = iter(self._cursor)
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        """Return the next result."""
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class StandInCollection:
+    """Async facade over a ``mongomock`` collection."""
+
+    CURSOR_METHODS = ("find", "list_indexes")
+
+    def __init__(self, collection):
+        """Wrap a synchronous collection."""
+        self._collection = collection
+
+    def aggregate(self, pipeline: List[Dict[str, Any]], *args, **kwargs) -> StandInCursor:
+        """Run an aggregation after rewriting unsupported stages."""
+        kwargs.pop("session", None)
+        return StandInCursor(self._collection.aggregate(_rewrite_pipeline(pipeline), *args, **kwargs))
+
+    def watch(self, *args, **kwargs):
+        """Change streams need a replica set."""
+        raise OperationFailure("The $changeStream stage is only supported on replica sets", code=40573)
+
+    def __getattr__(self, name: str):
+        """Expose collection methods as coroutines and cursors."""
+        attribute = getattr(self._collection, name)
+        if not callable(attribute):
+            return attribute
+        if name in self.CURSOR_METHODS:
+            return lambda *args, **kwargs: StandInCursor(attribute(*args, **kwargs))
+
+        async def method(*args, **kwargs):
+            kwargs.pop("session", None)
+            return attribute(*args, **kwargs)
+        return method
+
+
+class StandInClient:
+    """Client of the stand-in, behaving like a standalone server."""
+
+    def __init__(self, database: "StandInDatabase"):
+        """Remember the database served by this client."""
+        self._database = database
+
+    def __getitem__(self, name: str) -> "StandInDatabase":
+        """Return the stand-in database whatever its name."""
+        return self._database
+
+    async def start_session(self):
+        """Sessions with transactions need a replica set."""
+        raise OperationFailure(
+            "Transaction numbers are only allowed on a replica set member or mongos",
+            code=ILLEGAL_OPERATION
+        )
+
+    def close(self):
+        """Nothing to release."""
+
+
+class StandInDatabase:
+    """Async facade over a ``mongomock`` database."""
+
+    def __init__(self, name: str = "contract_intelligence"):
+        """Create an empty in-memory database."""
+        self._database = mongomock.MongoClient()[name]
+        self.client = StandInClient(self)
+        self.admin = self
+
+    def __getattr__(self, name: str) -> StandInCollection:
+        """Return a collection by attribute."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return StandInCollection(self._database[name])
+
+    def __getitem__(self, name: str) -> StandInCollection:
+        """Return a collection by name."""
+        return StandInCollection(self._database[name])
+
+    async def command(self, *args, **kwargs) -> Dict[str, Any]:
+        """Acknowledge commands such as ``ping``."""
+        return {"ok": 1}
+
+
+def _rewrite_pipeline(pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rewrite ``let``/``pipeline`` lookups into equality joins.
+
+    Only the shape used by ``ContractService.list_contracts`` is supported:
+    the join key comes from ``let.data_contract_id`` and matches are kept for
+    completed contracts only, at most one each.
+    """
+    rewritten = []
+    for stage in pipeline:
+        if "$facet" in stage:
+            stage = {"$facet": {name: _rewrite_pipeline(stages) for name, stages in stage["$facet"].items()}}
+        lookup = stage.get("$lookup")
+        if lookup and "let" in lookup:
+            output = lookup["as"]
+            rewritten.extend([
+                {"$addFields": {"_join_key": lookup["let"]["data_contract_id"]}},
+                {"$lookup": {
+                    "from": lookup["from"],
+                    "localField": "_join_key",
+                    "foreignField": "contract_id",
+                    "as": output
+                }},
+                {"$addFields": {output: {"$cond": [
+                    {"$eq": ["$status", "completed"]},
+                    {"$slice": [f"${output}", 1]},
+                    []
+                ]}}}
+            ])
+            continue
+        rewritten.append(stage)
+    return rewritten
@@ -0,0 +1,457 @@
+"""End-to-end benchmark suite over a synthetic contract corpus.
+
+Generates the corpus of ``benchmarks.pdf.contract_corpus`` and measures:
+
+- ``coverage``: fields populated per extraction section; the run fails if a
+  section is never populated, which means the corpus no longer reaches it.
+- ``parse``: ``PDFParser.parse_contract`` time per page, split into text
+  extraction and field extraction, by document length and by layout.
+- ``throughput``: documents and pages per second parsed in process and
+  through the extraction pool.
+- ``end_to_end``: upload to completed latency against the FastAPI app,
+  driven in process over ASGI with the embedded worker.
+- ``endpoints``: p50/p99 latency of the list, status and metrics endpoints
+  over the contracts uploaded by ``end_to_end``.
+
+The app runs against the in-process stand-in of ``benchmarks.standin`` unless
+``--mongodb-url`` points at a server, where a throwaway database is created
+and dropped. Results are written as JSON; ``--compare`` reports the change of
+every latency (``*_ms``) and rate (``*_per_second``) against an earlier run:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --output after.json --compare results.json --max-regression 20
+
+Settings are read from the environment when ``app`` is imported, so the suite
+configures the environment first and imports the application lazily.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+TERMINAL = ("completed", "failed")
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of the samples."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, Any]:
+    """Count, mean, p50, p99 and maximum of latencies in milliseconds."""
+    return {
+        "count": len(samples_ms),
+        "mean_ms": round(statistics.fmean(samples_ms), 3),
+        "p50_ms": round(percentile(samples_ms, 0.50), 3),
+        "p99_ms": round(percentile(samples_ms, 0.99), 3),
+        "max_ms": round(max(samples_ms), 3)
+    }
+
+
+def best_of(repeat: int, function: Callable, *args) -> Tuple[float, Any]:
+    """Best wall time in milliseconds of ``repeat`` calls, and the last result."""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def populated_fields(value: Any, prefix: str = "") -> Iterator[str]:
+    """Dotted paths of the non-empty leaves of a dumped model."""
+    if isinstance(value, dict) and value:
+        for key, item in value.items():
+            yield from populated_fields(item, f"{prefix}.{key}" if prefix else key)
+    elif value not in (None, "", [], {}):
+        yield prefix
+
+
+def run_coverage(corpus) -> Dict[str, Any]:
+    """Parse every document and record which fields each section populated."""
+    from app.utils.pdf_parser import pdf_parser
+
+    sections: Dict[str, Dict[str, set]] = {}
+    failures = {}
+    for document in corpus:
+        try:
+            extracted = pdf_parser.parse_contract(document.content)
+        except ValueError as e:
+            failures[document.name] = str(e)
+            continue
+        dumped = extracted.model_dump(mode="json", warnings=False)
+        for section, value in dumped.items():
+            fields = sections.setdefault(section, {})
+            for field in populated_fields(value):
+                fields.setdefault(field, set()).add(document.profile)
+
+    return {
+        "sections": {
+            section: {field: sorted(profiles) for field, profiles in sorted(fields.items())}
+            for section, fields in sections.items()
+        },
+        "unpopulated_sections": sorted(section for section, fields in sections.items() if not fields),
+        "failures": failures
+    }
+
+
+def run_parse(corpus, repeat: int) -> Dict[str, Any]:
+    """Time text and field extraction of every document, per page."""
+    from app.utils.pdf_parser import pdf_parser
+
+    documents = []
+    for document in corpus:
+        extract_ms, (_, texts) = best_of(repeat, pdf_parser.extract_page_texts, document.content)
+        text = pdf_parser.join_page_texts(texts)
+        fields_ms, _ = best_of(repeat, pdf_parser.parse_contract_text, text)
+        documents.append({
+            "name": document.name,
+            "profile": document.profile,
+            "layout": document.layout,
+            "pages": document.pages,
+            "bytes": len(document.content),
+            "extract_ms": round(extract_ms, 3),
+            "fields_ms": round(fields_ms, 3),
+            "per_page_ms": round((extract_ms + fields_ms) / document.pages, 3)
+        })
+
+    def group(key: str) -> Dict[str, Any]:
+        """Median per-page times of the documents sharing a key."""
+        groups: Dict[str, List[Dict[str, Any]]] = {}
+        for row in documents:
+            groups.setdefault(str(row[key]), []).append(row)
+        return {
+            name: {
+                "documents": len(rows),
+                "per_page_ms": round(statistics.median(row["per_page_ms"] for row in rows), 3),
+                "extract_per_page_ms": round(statistics.median(row["extract_ms"] / row["pages"] for row in rows), 3),
+                "fields_per_page_ms": round(statistics.median(row["fields_ms"] / row["pages"] for row in rows), 3)
+            }
+            for name, rows in groups.items()
+        }
+
+    return {"by_pages": group("pages"), "by_layout": group("layout"), "documents": documents}
+
+
+async def run_throughput(corpus, directory: str, rounds: int) -> Dict[str, Any]:
+    """Parse the corpus in process and through the extraction pool."""
+    from app.config import settings
+    from app.services.extraction_executor import ExtractionExecutor
+    from app.utils.pdf_parser import pdf_parser
+
+    pages = sum(document.pages for document in corpus) * rounds
+    size = sum(len(document.content) for document in corpus) * rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for document in corpus:
+            pdf_parser.parse_contract(document.content)
+    in_process = time.perf_counter() - start
+
+    paths = []
+    for document in corpus:
+        path = os.path.join(directory, document.name)
+        with open(path, "wb") as pdf_file:
+            pdf_file.write(document.content)
+        paths.append(path)
+
+    executor = ExtractionExecutor(max_workers=settings.extraction_workers)
+    executor.start()
+    try:
+        # The first parse starts the worker processes
+        await executor.parse_contract_file(paths[0])
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(executor.parse_contract_file(path) for path in paths))
+        pooled = time.perf_counter() - start
+    finally:
+        await executor.shutdown()
+
+    def rates(seconds: float) -> Dict[str, Any]:
+        """Rates of a run over the whole corpus."""
+        return {
+            "seconds": round(seconds, 4),
+            "documents_per_second": round(len(corpus) * rounds / seconds, 2),
+            "pages_per_second": round(pages / seconds, 2),
+            "mib_per_second": round(size / seconds / 2 ** 20, 2)
+        }
+
+    return {
+        "rounds": rounds,
+        "workers": settings.extraction_workers,
+        "in_process": rates(in_process),
+        "pool": rates(pooled)
+    }
+
+
+async def upload_and_wait(client, document, poll_seconds: float, timeout: float) -> Tuple[str, str, float, float]:
+    """Upload a document and poll its status until processing ends.
+
+    Returns the contract id, final status, upload request time and upload to
+    terminal status time, both in milliseconds.
+    """
+    start = time.perf_counter()
+    response = await client.post(
+        "/contracts/upload",
+        files={"file": (document.name, document.content, "application/pdf")}
+    )
+    response.raise_for_status()
+    uploaded = time.perf_counter()
+    contract_id = response.json()["contract_id"]
+
+    while True:
+        status = (await client.get(f"/contracts/{contract_id}/status")).json()["status"]
+        if status in TERMINAL:
+            break
+        if time.perf_counter() - start > timeout:
+            raise TimeoutError(f"Contract {document.name} still {status} after {timeout} seconds")
+        await asyncio.sleep(poll_seconds)
+
+    return contract_id, status, (uploaded - start) * 1000, (time.perf_counter() - start) * 1000
+
+
+async def run_application(corpus, args) -> Dict[str, Any]:
+    """Measure upload to completed latency, then list and status latency."""
+    import httpx
+    import app.main as main_module
+    from app.database import db
+    from benchmarks.standin import StandInDatabase
+
+    async def connect_standin(ensure_indexes: bool = True):
+        """Serve the application from the in-process stand-in."""
+        db.database = StandInDatabase()
+        db.client = db.database.client
+
+    if not args.mongodb_url:
+        main_module.connect_to_mongo = connect_standin
+
+    app = main_module.app
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                end_to_end = await measure_end_to_end(client, corpus, args)
+                endpoints = await measure_endpoints(client, end_to_end.pop("contract_ids"), args)
+    finally:
+        if args.mongodb_url:
+            from motor.motor_asyncio import AsyncIOMotorClient
+            await AsyncIOMotorClient(args.mongodb_url).drop_database(os.environ["DATABASE_NAME"])
+
+    return {"end_to_end": end_to_end, "endpoints": endpoints}
+
+
+async def measure_end_to_end(client, corpus, args) -> Dict[str, Any]:
+    """Upload the corpus with bounded concurrency and time each contract."""
+    from benchmarks.pdf import contract_corpus
+
+    # Start the extraction pool with a document outside the corpus, so
+    # deduplication does not skip a timed one
+    await upload_and_wait(client, next(contract_corpus(1, args.seed + args.count)), args.poll_ms / 1000, args.timeout)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(document):
+        """Upload a single document once a slot is free."""
+        async with semaphore:
+            return await upload_and_wait(client, document, args.poll_ms / 1000, args.timeout)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(document) for document in corpus))
+    elapsed = time.perf_counter() - start
+
+    failed = [document.name for document, result in zip(corpus, results) if result[1] != "completed"]
+    latencies = [result[3] for result in results]
+    by_pages: Dict[int, List[float]] = {}
+    for document, latency in zip(corpus, latencies):
+        by_pages.setdefault(document.pages, []).append(latency)
+
+    return {
+        "contracts": len(results),
+        "concurrency": args.concurrency,
+        "failed": failed,
+        "contracts_per_second": round(len(results) / elapsed, 2),
+        "upload": summarize([result[2] for result in results]),
+        "completed": summarize(latencies),
+        "completed_by_pages": {str(pages): summarize(samples) for pages, samples in sorted(by_pages.items())},
+        "contract_ids": [result[0] for result in results]
+    }
+
+
+async def measure_endpoints(client, contract_ids: List[str], args) -> Dict[str, Any]:
+    """Time the list, status and metrics endpoints with sequential requests."""
+    requests = {
+        "list": lambda index: "/contracts?page=1&page_size=20",
+        "list_completed": lambda index: "/contracts?status=completed&page=1&page_size=20",
+        "status": lambda index: f"/contracts/{contract_ids[index % len(contract_ids)]}/status",
+        "metrics": lambda index: "/metrics"
+    }
+
+    results = {}
+    for name, url in requests.items():
+        samples = []
+        for index in range(args.requests):
+            start = time.perf_counter()
+            response = await client.get(url(index))
+            samples.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+        results[name] = summarize(samples)
+    return results
+
+
+def git_revision() -> str:
+    """Commit of the working tree, if it is a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparable_metrics(value: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """Dotted paths and values of the latency and rate leaves of a report."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from comparable_metrics(item, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(value, (int, float)) and prefix.endswith(("_ms", "_per_second")):
+        yield prefix, value
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """Percent change of each metric present in both runs; positive is worse."""
+    before = dict(comparable_metrics(baseline["results"]))
+    changes = {}
+    for path, value in comparable_metrics(current["results"]):
+        previous = before.get(path)
+        if not previous:
+            continue
+        change = (value - previous) / previous * 100
+        changes[path] = round(-change if path.endswith("_per_second") else change, 1)
+    return changes
+
+
+def configure_environment(args, directory: str):
+    """Point the application settings at the benchmark before importing it."""
+    os.environ["UPLOAD_DIR"] = os.path.join(directory, "uploads")
+    os.environ["EMBEDDED_WORKER"] = "true"
+    os.environ["JOB_POLL_INTERVAL"] = str(args.job_poll_interval)
+    if args.mongodb_url:
+        os.environ["MONGODB_URL"] = args.mongodb_url
+        os.environ["DATABASE_NAME"] = f"benchmark_{uuid.uuid4().hex[:12]}"
+    else:
+        os.environ.setdefault("MONGODB_URL", "mongodb://standin")
+    if args.workers:
+        os.environ["EXTRACTION_WORKERS"] = str(args.workers)
+
+
+async def run(args, directory: str) -> Dict[str, Any]:
+    """Run the selected sections over the corpus."""
+    from benchmarks.pdf import contract_corpus
+
+    corpus = list(contract_corpus(args.count, args.seed))
+    results: Dict[str, Any] = {
+        "corpus": {
+            "documents": len(corpus),
+            "pages": sum(document.pages for document in corpus),
+            "bytes": sum(len(document.content) for document in corpus)
+        }
+    }
+    sections = set(args.sections)
+    if "coverage" in sections:
+        results["coverage"] = run_coverage(corpus)
+    if "parse" in sections:
+        results["parse"] = run_parse(corpus, args.repeat)
+    if "throughput" in sections:
+        results["throughput"] = await run_throughput(corpus, directory, args.rounds)
+    if sections & {"end_to_end", "endpoints"}:
+        results.update(await run_application(corpus, args))
+    return results
+
+
+SECTIONS = ["coverage", "parse", "throughput", "end_to_end", "endpoints"]
+
+
+def main():
+    """Run the suite, write the JSON report and compare with a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20, help="documents in the corpus")
+    parser.add_argument("--seed", type=int, default=7, help="seed of the first document")
+    parser.add_argument("--sections", nargs="+", choices=SECTIONS, default=SECTIONS, help="sections to run")
+    parser.add_argument("--repeat", type=int, default=3, help="timed parses per document (best is kept)")
+    parser.add_argument("--rounds", type=int, default=2, help="passes over the corpus for throughput")
+    parser.add_argument("--workers", type=int, help="extraction pool size (default: EXTRACTION_WORKERS)")
+    parser.add_argument("--concurrency", type=int, default=1, help="uploads in flight at once")
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--poll-ms", type=float, default=5.0, help="status polling interval of uploads")
+    parser.add_argument("--job-poll-interval", type=float, default=0.01,
+                        help="idle polling interval of the embedded worker, in seconds")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds to wait for each contract")
+    parser.add_argument("--mongodb-url", help="run against this server instead of the in-process stand-in")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="JSON report of an earlier run to compare with")
+    parser.add_argument("--max-regression", type=float,
+                        help="fail if any metric is worse than the earlier run by more than this percent")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure_environment(args, directory)
+        started = datetime.now(timezone.utc)
+        results = asyncio.run(run(args, directory))
+
+    report = {
+        "meta": {
+            "started": started.isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "database": "mongodb" if args.mongodb_url else "standin",
+            "arguments": {key: value for key, value in vars(args).items()
+                          if key not in ("mongodb_url", "output", "compare")}
+        },
+        "results": results
+    }
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            report["comparison"] = compare(report, json.load(baseline_file))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output + "\n")
+    else:
+        print(output)
+
+    coverage = results.get("coverage", {})
+    if coverage.get("unpopulated_sections"):
+        raise SystemExit(f"Corpus never populates: {', '.join(coverage['unpopulated_sections'])}")
+    if coverage.get("failures"):
+        raise SystemExit(f"Corpus documents failed to parse: {', '.join(coverage['failures'])}")
+    if results.get("end_to_end", {}).get("failed"):
+        raise SystemExit(f"Contracts failed processing: {', '.join(results['end_to_end']['failed'])}")
+    if args.max_regression is not None and "comparison" in report:
+        regressions = {path: change for path, change in report["comparison"].items() if change > args.max_regression}
+        if regressions:
+            raise SystemExit("Regressions: " + ", ".join(f"{path} +{change}%" for path, change in regressions.items()))
+    if args.output:
+        print(f"Wrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
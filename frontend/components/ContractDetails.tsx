@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from "react"
 import { FileText, Info, Download } from "lucide-react"
-import { getContractStatus, getContractData, getDownloadUrl, ContractStatus, ContractData } from '../src/lib/api'
+import { getContractStatus, getContractData, getDownloadUrl, subscribeToContractStatus, ContractStatus, ContractData } from '../src/lib/api'
 
 type Props = {
   contractId: string | null
@@ -15,15 +15,56 @@ export default function ContractDetails({ contractId }: Props) {
   const [error, setError] = useState<string | null>(null)
 
   useEffect(() => {
-    if (contractId) {
-      fetchContractDetails()
-      const interval = setInterval(fetchContractDetails, 2000)
-      return () => clearInterval(interval)
+    if (!contractId) return
+
+    let interval: ReturnType<typeof setInterval> | null = null
+
+    // Fall back to polling when the event stream is unavailable
+    const startPolling = () => {
+      const poll = async () => {
+        const statusResponse = await fetchContractDetails()
+        if (interval && statusResponse && isFinished(statusResponse)) {
+          clearInterval(interval)
+        }
+      }
+      poll()
+      interval = setInterval(poll, 2000)
+    }
+
+    if (typeof EventSource === 'undefined') {
+      startPolling()
+      return () => { if (interval) clearInterval(interval) }
+    }
+
+    const unsubscribe = subscribeToContractStatus(contractId, handleStatus, startPolling)
+    return () => {
+      unsubscribe()
+      if (interval) clearInterval(interval)
     }
   }, [contractId])
 
-  const fetchContractDetails = async () => {
-    if (!contractId) return
+  const isFinished = (statusResponse: ContractStatus) =>
+    statusResponse.status === 'completed' || statusResponse.status === 'failed'
+
+  const handleStatus = async (statusResponse: ContractStatus) => {
+    // Events without progress (e.g. failures) keep the last known value
+    setStatus((previous) => ({
+      ...statusResponse,
+      progress: statusResponse.progress ?? previous?.progress ?? 0,
+    }))
+    setError(null)
+
+    if (statusResponse.status === 'completed') {
+      try {
+        setData(await getContractData(statusResponse.contract_id))
+      } catch (err) {
+        setError(err instanceof Error ? err.message : 'Failed to fetch contract details')
+      }
+    }
+  }
+
+  const fetchContractDetails = async (): Promise<ContractStatus | null> => {
+    if (!contractId) return null
 
     try {
       setLoading(true)
@@ -36,8 +77,10 @@ export default function ContractDetails({ contractId }: Props) {
       }
 
       setError(null)
+      return statusResponse
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to fetch contract details')
+      return null
     } finally {
       setLoading(false)
     }
@@ -469,7 +512,7 @@ export default function ContractDetails({ contractId }: Props) {
                   <div>
                     <h5 className="font-medium text-foreground text-base mb-2">Notes</h5>
                     <div className="space-y-1">
-                      {data.extracted_data.gap_analysis.notes.map((note, idx) => (
+                      {data.extracted_data.gap_analysis.notes.split("; ").map((note, idx) => (
                         <p key={idx} className="text-sm text-muted-foreground">• {note}</p>
                       ))}
                     </div>
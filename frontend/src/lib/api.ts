@@ -111,7 +111,7 @@ export interface ExtractedData {
   gap_analysis?: {
     missing_fields?: string[]
     incomplete_fields?: string[]
-    notes?: string[]
+    notes?: string
   }
 }
 
@@ -119,11 +119,6 @@ export interface ContractData {
   contract_id: string
   confidence_score: number
   processing_date: string
-  gap_analysis?: {
-    missing_fields: string[]
-    incomplete_fields: string[]
-    notes: string
-  }
   extracted_data: ExtractedData
 }
 
@@ -178,6 +173,29 @@ export async function getContractData(contractId: string): Promise<ContractData>
   return response.json()
 }
 
+export function subscribeToContractStatus(
+  contractId: string,
+  onStatus: (status: ContractStatus) => void,
+  onError: () => void
+): () => void {
+  const source = new EventSource(`${API_BASE_URL}/contracts/${contractId}/events`)
+
+  source.addEventListener('status', (event) => {
+    const status: ContractStatus = JSON.parse((event as MessageEvent).data)
+    onStatus(status)
+    if (status.status === 'completed' || status.status === 'failed') {
+      source.close()
+    }
+  })
+
+  source.onerror = () => {
+    source.close()
+    onError()
+  }
+
+  return () => source.close()
+}
+
 export function getDownloadUrl(contractId: string): string {
   return `${API_BASE_URL}/contracts/${contractId}/download`
 }